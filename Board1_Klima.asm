@@ -30,6 +30,39 @@ DESIRED_TEMP_DEC:   DS 1    ; Istenen Sicaklik (Ondalik)
 AMBIENT_TEMP_INT:   DS 1    ; Ortam Sicakligi (Tam Sayi)
 AMBIENT_TEMP_DEC:   DS 1    ; Ortam Sicakligi (Ondalik)
 FAN_SPEED_RPS:      DS 1    ; Fan Hizi
+TX_CHECKSUM:        DS 1    ; Toplu cevap cercevesinin kontrol toplami (XOR)
+BAUD_INDEX:         DS 1    ; Hiz pazarligi: istenen hiz sirasi (0-4)
+
+;====================================================================
+; TOPLU OKUMA (GET ALL) PROTOKOLU
+;====================================================================
+; PC 0x06 gonderir, kart tek bir cerceve ile cevap verir:
+; [SYNC][LEN][AMB_INT][AMB_DEC][DES_INT][DES_DEC][FAN][CHK]
+; CHK = LEN XOR (tum veri byte'lari). Eski firmware 0x06'yi yok sayar;
+; PC cevap alamazsa tek tek sorgu komutlarina (0x01-0x05) geri doner.
+CMD_GET_ALL     EQU 0x06
+FRAME_SYNC      EQU 0xA5
+FRAME_LEN_AC    EQU 5
+
+;====================================================================
+; HIZ (BAUD RATE) PAZARLIGI
+;====================================================================
+; Kart her zaman 9600 ile baslar. PC 0x07 ile desteklenen hizlari sorar,
+; kart bit maskesi ile cevap verir (bit i -> BAUD_RATES[i] Python tarafinda):
+;   bit0: 9600, bit1: 19200, bit2: 38400, bit3: 57600, bit4: 115200
+; PC 00010iii gonderir: kart ayni byte'i ESKI hizda geri yollar (onay),
+; gonderim bitince SPBRG'yi degistirir. Cerceve hatasi (FERR) gelirse
+; PC baska hizda konusuyor demektir; kart 9600'e geri doner.
+; SPBRG = 20 MHz / (16 x Baud) - 1  (BRGH = 1), hata en fazla %1.7
+CMD_GET_BAUDS       EQU 0x07
+CMD_SET_BAUD        EQU 0x10
+BAUD_SUPPORT_MASK   EQU 0x1F
+BAUD_INDEX_MAX      EQU 4
+SPBRG_9600          EQU 129
+SPBRG_19200         EQU 64
+SPBRG_38400         EQU 32
+SPBRG_57600         EQU 21
+SPBRG_115200        EQU 10
 
 ;====================================================================
 ; PROGRAM BASLANGICI
@@ -68,8 +101,8 @@ SETUP:
     MOVLW 0x00          ; PORTD Cikis (Motorlar icin)
     MOVWF BANKMASK(TRISD)
     
-    ; UART Ayarlari (9600 Baud @ 20MHz)
-    MOVLW 129           ; SPBRG degeri
+    ; UART Ayarlari (9600 Baud @ 20MHz) - Pazarlik ile sonradan degisebilir
+    MOVLW SPBRG_9600    ; SPBRG degeri
     MOVWF BANKMASK(SPBRG)
     BSF BANKMASK(TXSTA), TXSTA_BRGH_POSN     ; Yuksek hiz modu
     BCF BANKMASK(TXSTA), TXSTA_SYNC_POSN     ; Asenkron mod
@@ -126,6 +159,11 @@ ISR_HANDLER:
     BTFSS BANKMASK(PIR1), PIR1_RCIF_POSN
     GOTO ISR_EXIT
 
+    ; Cerceve hatasi (FERR): PC farkli hizda konusuyor, 9600'e don
+    BANKSEL RCSTA
+    BTFSC BANKMASK(RCSTA), RCSTA_FERR_POSN
+    GOTO BAUD_RESET
+
     ; Gelen veriyi oku
     BANKSEL RCREG
     MOVF BANKMASK(RCREG), W
@@ -163,6 +201,25 @@ ISR_HANDLER:
     BTFSC STATUS, STATUS_Z_POSN
     GOTO SEND_FAN
 
+    ; 6. Tum Degerleri Iste (0x06) - Cerceveli toplu cevap
+    MOVLW CMD_GET_ALL
+    SUBWF BANKMASK(RX_TEMP), W
+    BTFSC STATUS, STATUS_Z_POSN
+    GOTO SEND_ALL
+
+    ; 7. Desteklenen Hizlar Iste (0x07)
+    MOVLW CMD_GET_BAUDS
+    SUBWF BANKMASK(RX_TEMP), W
+    BTFSC STATUS, STATUS_Z_POSN
+    GOTO SEND_BAUDS
+
+    ; 8. Hiz Degistir (00010iii)
+    MOVF BANKMASK(RX_TEMP), W
+    ANDLW 0xF8
+    XORLW CMD_SET_BAUD
+    BTFSC STATUS, STATUS_Z_POSN
+    GOTO SET_BAUD
+
     ; --- SET (AYARLAMA) ISLEMLERI ---
     ; Header kontrolu: 11xxxxxx (Tam Sayi Ayarla)
     MOVF BANKMASK(RX_TEMP), W
@@ -206,6 +263,79 @@ SEND_FAN:
     CALL SEND_BYTE
     GOTO ISR_EXIT
 
+SEND_ALL:
+    ; Cerceve basi (SYNC) - kontrol toplamina katilmaz
+    MOVLW FRAME_SYNC
+    CALL SEND_BYTE
+
+    ; Uzunluk (LEN) - kontrol toplami bununla baslar
+    BANKSEL TX_CHECKSUM
+    MOVLW FRAME_LEN_AC
+    MOVWF BANKMASK(TX_CHECKSUM)
+    CALL SEND_BYTE
+
+    ; Veri byte'lari (sira: Python tarafindaki AC_POLL_SEQUENCE ile ayni)
+    BANKSEL AMBIENT_TEMP_INT
+    MOVF BANKMASK(AMBIENT_TEMP_INT), W
+    CALL SEND_FRAME_BYTE
+    BANKSEL AMBIENT_TEMP_DEC
+    MOVF BANKMASK(AMBIENT_TEMP_DEC), W
+    CALL SEND_FRAME_BYTE
+    BANKSEL DESIRED_TEMP_INT
+    MOVF BANKMASK(DESIRED_TEMP_INT), W
+    CALL SEND_FRAME_BYTE
+    BANKSEL DESIRED_TEMP_DEC
+    MOVF BANKMASK(DESIRED_TEMP_DEC), W
+    CALL SEND_FRAME_BYTE
+    BANKSEL FAN_SPEED_RPS
+    MOVF BANKMASK(FAN_SPEED_RPS), W
+    CALL SEND_FRAME_BYTE
+
+    ; Kontrol toplami (CHK)
+    BANKSEL TX_CHECKSUM
+    MOVF BANKMASK(TX_CHECKSUM), W
+    CALL SEND_BYTE
+    GOTO ISR_EXIT
+
+SEND_BAUDS:
+    MOVLW BAUD_SUPPORT_MASK
+    CALL SEND_BYTE
+    GOTO ISR_EXIT
+
+; --- HIZ KOMUTLARI ---
+SET_BAUD:
+    ; Hiz sirasi (iii) 0-4 olmali, digerleri yok sayilir
+    MOVF BANKMASK(RX_TEMP), W
+    ANDLW 0x07
+    MOVWF BANKMASK(BAUD_INDEX)
+    SUBLW BAUD_INDEX_MAX        ; W = 4 - iii (borc yoksa C=1)
+    BTFSS STATUS, STATUS_C_POSN
+    GOTO ISR_EXIT
+
+    ; Onay: komut byte'i ESKI hizda geri gonderilir
+    MOVF BANKMASK(RX_TEMP), W
+    CALL SEND_BYTE
+    NOP                         ; TXREG -> TSR aktarimi icin bir cevrim
+    BANKSEL TXSTA
+WAIT_BAUD_TX:
+    BTFSS BANKMASK(TXSTA), TXSTA_TRMT_POSN   ; Onay hattan tamamen cikmadan
+    GOTO WAIT_BAUD_TX                         ; SPBRG degismemeli
+
+    BANKSEL BAUD_INDEX
+    MOVF BANKMASK(BAUD_INDEX), W
+    CALL BAUD_TO_SPBRG
+    BANKSEL SPBRG
+    MOVWF BANKMASK(SPBRG)
+    GOTO ISR_EXIT
+
+BAUD_RESET:
+    BANKSEL RCREG
+    MOVF BANKMASK(RCREG), W     ; Hatali byte'i at (FERR temizlenir)
+    BANKSEL SPBRG
+    MOVLW SPBRG_9600
+    MOVWF BANKMASK(SPBRG)
+    GOTO ISR_EXIT
+
 ; --- AYARLAMA KOMUTLARI ---
 SET_DES_INT:
     MOVF BANKMASK(RX_TEMP), W
@@ -236,9 +366,17 @@ SEND_BYTE:
 WAIT_TX:
     BTFSS BANKMASK(TXSTA), TXSTA_TRMT_POSN   ; Gonderim bitti mi?
     GOTO WAIT_TX
+    BANKSEL TXREG                             ; TXREG Bank 0'da (TXSTA Bank 1'de)
     MOVWF BANKMASK(TXREG)                     ; Veriyi gonder
     RETURN
 
+SEND_FRAME_BYTE:
+    ; W'deki byte'i kontrol toplamina katar ve gonderir (W degismez)
+    BANKSEL TX_CHECKSUM
+    XORWF BANKMASK(TX_CHECKSUM), F
+    CALL SEND_BYTE
+    RETURN
+
 READ_SENSOR:
     ; ADC Okuma (LM35)
     BANKSEL ADCON0
@@ -279,4 +417,22 @@ COOL_MODE:
     BSF BANKMASK(PORTD), 1        ; Sogutucu ACIK
     RETURN
 
+BAUD_TO_SPBRG:
+    ; W'deki hiz sirasini (0-4) SPBRG degerine cevirir (W'de doner)
+    BANKSEL BAUD_INDEX
+    MOVWF BANKMASK(BAUD_INDEX)
+    MOVF BANKMASK(BAUD_INDEX), F    ; Z bayragini guncelle
+    BTFSC STATUS, STATUS_Z_POSN
+    RETLW SPBRG_9600
+    DECF BANKMASK(BAUD_INDEX), F
+    BTFSC STATUS, STATUS_Z_POSN
+    RETLW SPBRG_19200
+    DECF BANKMASK(BAUD_INDEX), F
+    BTFSC STATUS, STATUS_Z_POSN
+    RETLW SPBRG_38400
+    DECF BANKMASK(BAUD_INDEX), F
+    BTFSC STATUS, STATUS_Z_POSN
+    RETLW SPBRG_57600
+    RETLW SPBRG_115200
+
 END resetVec
\ No newline at end of file
@@ -0,0 +1,227 @@
+import asyncio
+import os
+import time
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ASYNCIO SÜRÜCÜSÜ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: automation_api içindeki kart sınıflarını tek bir asyncio olay
+#           döngüsü üzerinden sürer. Seri portun dosya tanımlayıcısı (fd)
+#           doğrudan bloklamasız okunur/yazılır; her komutun bir son tarihi
+#           (deadline) vardır. Tüm kartlar AYNI ANDA sorgulanır, böylece bir
+#           tur süresi kartların toplamı değil, en yavaş kart kadar olur.
+# ==============================================================================
+
+# Bir sorgu byte'ının cevabı için tanınan süre (saniye).
+# 9600 baud'da bir byte ~1 ms sürer; PIC cevabı hemen üretir.
+COMMAND_TIMEOUT = 0.1
+
+# Bir sorgu turunun hedef periyodu (saniye)
+POLL_INTERVAL = 0.5
+
+
+class AsyncHomeAutomationSystemConnection:
+    """
+    Bir kart nesnesini (AirConditionerSystemConnection / CurtainControlSystemConnection)
+    asyncio ile süren bağlantı sınıfı.
+    Protokol (sorgu dizisi, cevapların alanlara dönüşümü, ayar byte'ları) ve
+    veriler kart nesnesinde kalır; bu sınıf sadece byte taşımayı bloklamadan yapar.
+    Böylece arayüz, veriyi yine board.getAmbientTemp() gibi okumaya devam eder.
+    """
+    def __init__(self, board, command_timeout=COMMAND_TIMEOUT):
+        self.board = board
+        self.command_timeout = command_timeout
+        self._waiter = None
+
+    def open(self):
+        """Kartın portunu açar (zaten açıksa mevcut bağlantıyı kullanır)."""
+        port = self.board.serial_port
+        if port and port.is_open:
+            return True
+        return self.board.open()
+
+    def close(self):
+        return self.board.close()
+
+    def _fd(self):
+        """Port açıksa ve dosya tanımlayıcısı varsa döner, yoksa None."""
+        port = self.board.serial_port
+        if not (port and port.is_open) or not hasattr(port, "fileno"):
+            return None
+        return port.fileno()
+
+    async def query(self, commands):
+        """
+        Sorgu komutlarını tek seferde yazar ve cevapları sırayla toplar.
+        i. cevabın son tarihi: başlangıç + (i + 1) * command_timeout; tüm tur
+        ayrıca kartın 'pollDeadline' sınırını aşamaz.
+        Cevabı alınamayan alanlar None olur (senkron API ile aynı davranış).
+        """
+        if self._fd() is None:
+            # fd'si olmayan taşıma (örn. MemoryTransport): senkron sorguyu
+            # olay döngüsünü bloklamadan yürüt.
+            return await self._in_executor(self.board._query, commands)
+        data = await self._exchange(commands, len(commands), self.board.queryPacing)
+        return self.board._align_replies(data, len(commands))
+
+    async def query_bulk(self):
+        """Toplu okuma: tek istek byte'ı, tek çerçeve (bkz. board._query_bulk)."""
+        if self._fd() is None:
+            return await self._in_executor(self.board._query_bulk)
+        data = await self._exchange([self.board.BULK_COMMAND], self.board.bulkFrameLength,
+                                    self.board.queryPacing)
+        return self.board._decode_bulk(data)
+
+    async def _in_executor(self, query, *args):
+        """Senkron sorguyu kartın son tarihiyle varsayılan yürütücüde çalıştırır."""
+        deadline = None
+        if self.board.pollDeadline is not None:
+            deadline = time.monotonic() + self.board.pollDeadline
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, query, *args, deadline)
+
+    async def _exchange(self, commands, reply_len, pacing=0.0):
+        """Komutları yazar ve en fazla 'reply_len' byte cevabı son tarihler içinde okur."""
+        port = self.board.serial_port
+        if not (port and port.is_open):
+            return b""
+        fd = self._fd()
+        stats = self.board.linkStats
+        started = time.perf_counter()
+        port.reset_input_buffer()  # Geç kalmış eski cevaplar sırayı kaydırmasın
+        if pacing:
+            for cmd in commands:
+                await self._write(fd, bytes([cmd]))
+                await asyncio.sleep(pacing)
+        else:
+            await self._write(fd, bytes(commands))
+        data = await self._read(fd, reply_len)
+        if stats is not None:
+            stats.received(reply_len, data)
+            if len(data) == reply_len:
+                stats.round_trip(commands, time.perf_counter() - started)
+        return data
+
+    async def send(self, commands):
+        """Ayar (SET) byte'larını kartın ölçülmüş byte aralığıyla (bytePacing) gönderir."""
+        pacing = self.board.bytePacing
+        fd = self._fd()
+        for cmd in commands:
+            if fd is None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.board._send_byte, cmd)
+                continue
+            await self._write(fd, bytes([cmd]))
+            if pacing:
+                await asyncio.sleep(pacing)
+
+    async def set(self, field, value):
+        """
+        Kartın ayarlanabilir bir alanını (örn. "desiredTemperature") değiştirir.
+        Byte'lar gönderildikten sonra alan yerelde de güncellenir.
+        """
+        await self.send(self.board._encode_setpoint(field, value))
+        changed = getattr(self.board, field) != value
+        setattr(self.board, field, value)
+        # Yazılan değer bilinir; sorgulanmayan alan (perde konumu) bayat görünmesin
+        self.board._mark_fresh(field)
+        self.board._commit_state()
+        if changed:
+            self.board._publish({field})
+
+    async def update(self):
+        """
+        Kartın tüm alanlarını bloklamadan günceller.
+        Tüm alanlar geldiyse True döner (bkz. board.update()).
+        """
+        if self.board.supportsBulk:
+            replies = await self.query_bulk()
+        else:
+            replies = await self.query(self.board.POLL_SEQUENCE)
+        return self.board._finish_poll(replies)
+
+    async def _write(self, fd, data):
+        loop = asyncio.get_running_loop()
+        stats = self.board.linkStats
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(fd, view)
+                view = view[written:]
+                if stats is not None:
+                    stats.wrote(written)
+            except BlockingIOError:
+                # Çıkış tamponu dolu: fd yazılabilir olana kadar bekle
+                ready = loop.create_future()
+                loop.add_writer(fd, ready.set_result, None)
+                try:
+                    await asyncio.wait_for(ready, self.command_timeout)
+                except asyncio.TimeoutError:
+                    if stats is not None:
+                        stats.write_failed(f"{len(view)} byte yazılamadı (zaman aşımı)")
+                    return
+                finally:
+                    loop.remove_writer(fd)
+
+    async def _read(self, fd, size):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        total_deadline = None
+        if self.board.pollDeadline is not None:
+            total_deadline = start + self.board.pollDeadline
+        buf = bytearray()
+        loop.add_reader(fd, self._on_readable)
+        try:
+            while len(buf) < size:
+                try:
+                    # Termios VMIN=0 iken boş tampon EAGAIN yerine b"" döner
+                    chunk = os.read(fd, size - len(buf))
+                    if chunk:
+                        buf += chunk
+                        continue
+                except BlockingIOError:
+                    pass
+
+                deadline = start + self.command_timeout * (len(buf) + 1)
+                if total_deadline is not None:
+                    deadline = min(deadline, total_deadline)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break  # Bu komutun son tarihi geçti
+                self._waiter = loop.create_future()
+                try:
+                    await asyncio.wait_for(self._waiter, remaining)
+                except asyncio.TimeoutError:
+                    break
+        finally:
+            loop.remove_reader(fd)
+            self._waiter = None
+        return bytes(buf)
+
+    def _on_readable(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+async def poll_boards(connections):
+    """
+    Verilen tüm bağlantıları eşzamanlı günceller.
+    Bir kartın hatası diğerlerini durdurmaz (return_exceptions=True).
+    """
+    return await asyncio.gather(*(c.update() for c in connections), return_exceptions=True)
+
+
+async def run_poll_loop(get_connections, interval=POLL_INTERVAL, is_running=lambda: True):
+    """
+    Tek olay döngüsünde sonsuz sorgu döngüsü.
+    get_connections: her turda o an bağlı olan bağlantıların listesini döner.
+    Tur periyodu 'interval' kadardır; sorgu süresi bu süreden düşülür.
+    """
+    loop = asyncio.get_running_loop()
+    while is_running():
+        started = loop.time()
+        connections = get_connections()
+        if connections:
+            await poll_boards(connections)
+        await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
@@ -1,6 +1,10 @@
-import serial
+import logging
 import time
 
+from link_stats import LinkStats
+from timeseries import History
+from transport import make_transport
+
 # ==============================================================================
 # PROJE: NEXUS CONTROL HUB - API KATMANI (BACKEND)
 # YAZAR: Suude Kaynak - 152120211110
@@ -10,6 +14,9 @@ import time
 #           Ödev PDF'indeki bit manipülasyonu ve komut setleri burada uygulanır.
 # ==============================================================================
 
+# Kayıtlar logger.get_logger() ile yapılandırılan "HomeAutomation" hattına gider
+log = logging.getLogger("HomeAutomation.api")
+
 # --- KOMUT SETİ (PROTOKOL TANIMLARI) ---
 # PIC yazılımında tanımlanan "Command" byte'ları ile buradakiler birebir aynı olmalıdır.
 # Bu kodlar, PIC'e "Bana şu veriyi gönder" demek için kullanılır.
@@ -20,6 +27,9 @@ CMD_AC_GET_DESIRED_TEMP_INT  = 0b00000010  # İstenen Sıcaklık (Tam Sayı Kıs
 CMD_AC_GET_AMBIENT_TEMP_FRAC = 0b00000011  # Ortam Sıcaklığı (Ondalık Kısım)
 CMD_AC_GET_AMBIENT_TEMP_INT  = 0b00000100  # Ortam Sıcaklığı (Tam Sayı Kısım)
 CMD_AC_GET_FAN_SPEED         = 0b00000101  # Fan Hızı (RPS)
+CMD_AC_GET_ALL               = 0b00000110  # Tüm Değerler (Çerçeveli toplu cevap, yeni firmware)
+CMD_AC_GET_BAUDS             = 0b00000111  # Desteklenen hızlar (BAUD_RATES bit maskesi, yeni firmware)
+CMD_AC_SET_BAUD              = 0b00010000  # Hız değiştir: 00010iii (iii = BAUD_RATES sırası)
 
 # BOARD #2: PERDE VE SENSÖR ÜNİTESİ (CURTAIN & SENSORS)
 CMD_CUR_GET_DESIRED_FRAC      = 0b00000001 # Perde Hedef (Ondalık - Opsiyonel)
@@ -39,6 +49,147 @@ MASK_SET_FRAC_HEADER = 0b10000000  # Header: 10xxxxxx (Ondalık ayarlama komutu)
 MASK_SET_INT_HEADER  = 0b11000000  # Header: 11xxxxxx (Tam sayı ayarlama komutu)
 MASK_DATA_6BIT       = 0x3F        # 00111111 (Son 6 biti almak için filtre)
 
+# --- TOPLU CEVAP ÇERÇEVESİ (GET ALL) ---
+# [SYNC][LEN][VERİ x LEN][CHK]  ->  CHK = LEN XOR (tüm veri byte'ları)
+# Board1_Klima.asm içindeki SEND_ALL rutini ile birebir aynı olmalıdır.
+FRAME_SYNC     = 0xA5
+FRAME_OVERHEAD = 3  # SYNC + LEN + CHK
+
+# --- HIZ (BAUD RATE) PAZARLIĞI ---
+# Bağlantı her zaman BAUD_DEFAULT ile açılır. Kart desteklediği hızları bit
+# maskesi olarak bildirir (bit i -> BAUD_RATES[i]). Ortak en yüksek hıza geçmek
+# için 00010iii gönderilir; kart komutu ESKİ hızda aynen geri yollar (onay) ve
+# sonra kendi hızını değiştirir. PC de geçer ve bir test sorgusuyla doğrular.
+# Kart çerçeve hatası (FERR) görürse BAUD_DEFAULT'a döner (Board1_Klima.asm).
+BAUD_DEFAULT = 9600
+BAUD_RATES = (9600, 19200, 38400, 57600, 115200)
+MASK_BAUD_INDEX = 0x07        # 00000111 (Hız sırasını almak için filtre)
+MASK_SET_BAUD_HEADER = 0xF8   # 11111000 (Hız komutunun sabit kısmı)
+BAUD_VERIFY_PROBES = 4        # Yeni hızda doğrulama için gönderilen sorgu sayısı
+WAKE_TIMEOUT = 0.05           # Pazarlık öncesi uyandırma sorgusunun bekleme süresi (sn)
+
+# --- SORGU SIRALARI (PIPELINED POLLING) ---
+# update() içinde tek seferde gönderilen komut dizileri. Cevaplar PIC'ten aynı
+# sırayla döner (ISR her sorgu byte'ına tek bir byte ile cevap verir).
+AC_POLL_SEQUENCE = (
+    CMD_AC_GET_AMBIENT_TEMP_INT,
+    CMD_AC_GET_AMBIENT_TEMP_FRAC,
+    CMD_AC_GET_DESIRED_TEMP_INT,
+    CMD_AC_GET_DESIRED_TEMP_FRAC,
+    CMD_AC_GET_FAN_SPEED,
+)
+CUR_POLL_SEQUENCE = (
+    CMD_CUR_GET_OUTDOOR_TEMP_INT,
+    CMD_CUR_GET_OUTDOOR_TEMP_FRAC,
+    CMD_CUR_GET_PRESSURE_INT,
+    CMD_CUR_GET_PRESSURE_FRAC,
+    CMD_CUR_GET_LIGHT_INT,
+)
+
+
+def encode_frame(payload):
+    """Veri byte'larını toplu cevap çerçevesine paketler (emülatör ve testler için)."""
+    checksum = len(payload)
+    for b in payload:
+        checksum ^= b
+    return bytes([FRAME_SYNC, len(payload)]) + bytes(payload) + bytes([checksum])
+
+
+def decode_frame(data, length):
+    """
+    Toplu cevap çerçevesini çözer. Başlık, uzunluk ve kontrol toplamı doğruysa
+    veri byte'larını liste olarak, değilse None döner.
+    """
+    if len(data) != length + FRAME_OVERHEAD or data[0] != FRAME_SYNC or data[1] != length:
+        return None
+    payload = data[2:-1]
+    checksum = length
+    for b in payload:
+        checksum ^= b
+    if checksum != data[-1]:
+        return None
+    return list(payload)
+
+
+# --- ZAMANLAMA AYARLARI ---
+READ_TIMEOUT = 1.0   # Son tarih verilmeyen okumalar için port zaman aşımı (saniye)
+# Port zaman aşımı sadece bu kadardan fazla değişince yeniden ayarlanır (saniye).
+# Her ayar pyserial'da termios (POSIX) / SetCommTimeouts (Windows) çağrısıdır.
+TIMEOUT_SLACK = 0.005
+POLL_DEADLINE = 0.5  # Bir update() turunun toplam süre sınırı (saniye)
+STALE_AFTER = 2.0    # Bu süreden eski alan değerleri "bayat" (stale) sayılır (saniye)
+
+
+class BoardState:
+    """
+    Bir kartın belirli bir andaki DEĞİŞMEZ durum kaydı.
+    Her sorgu turunun sonunda yenisi oluşturulur ve kartın 'state' niteliğine
+    TEK atamayla konur. Okuyucu önce referansı alır (st = board.state), sonra
+    alanları ondan okur: kilit gerekmez, yarısı eski yarısı yeni değer görülmez.
+    Alt sınıflar alanlarını hem __slots__ hem FIELDS olarak tanımlar.
+
+    seq        : Kartın kaçıncı kaydı (her yayında bir artar)
+    time       : Kaydın oluşturulduğu an (time.time)
+    lastPollOk : Son sorgu turunda tüm cevaplar geldi mi
+    fieldTimes : FIELDS sırasıyla her alanın son geçerli değer anı (time.monotonic, yoksa None)
+    """
+    __slots__ = ("seq", "time", "lastPollOk", "fieldTimes")
+    FIELDS = ()
+
+    def __init__(self, seq, stamp, lastPollOk, fieldTimes, values):
+        init = object.__setattr__
+        init(self, "seq", seq)
+        init(self, "time", stamp)
+        init(self, "lastPollOk", lastPollOk)
+        init(self, "fieldTimes", fieldTimes)
+        for field, value in zip(self.FIELDS, values):
+            init(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} değiştirilemez")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} değiştirilemez")
+
+    def __repr__(self):
+        values = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS)
+        return f"{type(self).__name__}(seq={self.seq}, {values})"
+
+    def getFieldAge(self, field):
+        """Alanın kayıttaki değerinin şu anki yaşı (saniye). Hiç alınmadıysa None."""
+        stamp = self.fieldTimes[self.FIELDS.index(field)]
+        return None if stamp is None else time.monotonic() - stamp
+
+    def isStale(self, field, maxAge=STALE_AFTER):
+        age = self.getFieldAge(field)
+        return age is None or age > maxAge
+
+    def asdict(self):
+        """JSON'a çevrilebilir sözlük (bkz. http_api)."""
+        state = {field: getattr(self, field) for field in self.FIELDS}
+        state["stale"] = [field for field in self.FIELDS if self.isStale(field)]
+        state["lastPollOk"] = self.lastPollOk
+        state["seq"] = self.seq
+        state["time"] = self.time
+        return state
+
+
+class AirConditionerState(BoardState):
+    __slots__ = FIELDS = ("ambientTemperature", "desiredTemperature", "fanSpeed")
+
+
+class CurtainState(BoardState):
+    __slots__ = FIELDS = ("curtainStatus", "outdoorTemp", "outdoorPress", "lightIntensity")
+
+
+# --- BYTE ARALIĞI (PACING) AYARLARI ---
+# Eskiden her byte'tan sonra sabit 20 ms beklenirdi. Artık bağlantı açılırken
+# kartın art arda kaç byte'ı kaçırmadan alabildiği ölçülür (calibratePacing).
+PACING_DEFAULT = 0.02                                   # Ölçüm yapılamazsa (eski değer)
+PACING_CANDIDATES = (0.0, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02)  # Hızlıdan yavaşa
+PACING_PROBES = 8         # Her adayda gönderilen sorgu byte'ı sayısı
+PACING_RECOVER_AFTER = 50  # Bu kadar temiz turdan sonra aralık tekrar kısaltılır
+
 
 class HomeAutomationSystemConnection:
     """
@@ -46,19 +197,90 @@ class HomeAutomationSystemConnection:
     Seri portu açma, kapama, byte gönderme ve okuma gibi
     düşük seviyeli işlemleri yönetir.
     """
-    def __init__(self, comPort="COM1", baudRate=9600):
+    # Alt sınıflar doldurur: ayarlanabilir alan adı -> ayar byte'larını üreten metot
+    SETPOINTS = {}
+    # Toplu okuma komutu (firmware destekliyorsa). None: kartta böyle bir komut yok
+    BULK_COMMAND = None
+    # Desteklenen hızları soran komut. None: kart hız pazarlığı bilmiyor (sabit hız)
+    BAUD_QUERY_COMMAND = None
+    # Sorgu turu sonunda yayınlanan değişmez durum kaydının sınıfı
+    STATE_CLASS = BoardState
+
+    def __init__(self, comPort="COM1", baudRate=BAUD_DEFAULT, pipelined=True, transport=None):
         self.comPort = comPort
+        # baudRate: hattın şu anki hızı. maxBaudRate: izin verilen en yüksek hız
+        # (config.py). Pazarlık yapılan kartlarda hat BAUD_DEFAULT ile açılır.
         self.baudRate = baudRate
+        self.maxBaudRate = baudRate
+        self.autoNegotiateBaud = True
+        self.supportedBauds = None  # Kartın bildirdiği hızlar. None: henüz sorulmadı
         self.serial_port = None
+        # Hazır bir taşıma nesnesi (örn. emülatörlü MemoryTransport) verilebilir.
+        # Verilmezse comPort adına göre seçilir (bkz. transport.make_transport).
+        self.transport = transport
+        # True: sorgular tek write + tek read ile gönderilir (hızlı mod)
+        # False: eski usul byte-byte gönder/bekle/oku (yavaş ama klasik mod)
+        self.pipelined = pipelined
+        # update() turunun toplam süre sınırı. None: eski davranış (okuma başına 1 sn)
+        self.pollDeadline = POLL_DEADLINE
+        # Alan adı -> son GEÇERLİ değerin alındığı an (time.monotonic)
+        self.fieldTimestamps = {}
+        # Alan adı -> geçmiş değerler (zaman: time.time, bkz. timeseries.History)
+        self.history = History()
+        # Her yeni değerde çağrılan fonksiyonlar: f(alan, zaman, değer)
+        # Örn. kalıcı kayıt için TelemetryStore.recorder("ac")
+        self.recorders = []
+        # Durum değişince (tur sonunda) çağrılan fonksiyonlar: f(kart, değişen alanlar)
+        # Örn. arayüzün yeniden çizim kuyruğu (bkz. gui_render.UpdateQueue)
+        self.listeners = []
+        self._changed = set()
+        self.lastPollOk = False
+        # Son turda HİÇ cevap gelmedi mi (hat kopmuş olabilir; bkz. command_queue.PortArbiter)
+        self.lastPollSilent = False
+        # Son yayınlanan değişmez durum (bkz. BoardState). Alt sınıf alanlarını
+        # tanımladıktan sonra ilk kaydı yayınlar.
+        self.state = None
+        self._state_seq = 0
+        # Her yeni durum kaydında (değişiklik olmasa da) çağrılan fonksiyonlar: f(kayıt)
+        # Örn. ayrı süreçte çalışırken paylaşılan belleğe yazma (bkz. io_worker)
+        self.stateSinks = []
+        # Byte'lar arası bekleme: açılışta ölçülür, cevap kaçarsa otomatik uzatılır
+        self.autoCalibrate = True
+        self.calibratedPacing = None  # Ölçüm yapılmadıysa None
+        self.bytePacing = PACING_DEFAULT
+        self.pacingBackoffs = 0  # Kaç kez geri çekilme (yavaşlama) yapıldı
+        self._clean_polls = 0
+        # Firmware toplu okumayı (BULK_COMMAND) destekliyor mu? None: henüz bilinmiyor
+        self.autoDetectBulk = True
+        self.supportsBulk = None
+        # Hat sayaçları ve gidiş-dönüş histogramları (bkz. enableLinkStats). None: kapalı
+        self.linkStats = None
 
     def open(self):
         """Seri port bağlantısını açar."""
         try:
-            self.serial_port = serial.Serial(self.comPort, self.baudRate, timeout=1)
-            print(f"Bağlantı Açıldı: {self.comPort}")
+            if self._negotiates_baud():
+                self.baudRate = BAUD_DEFAULT  # Pazarlık her zaman varsayılan hızda başlar
+            port = self.transport or make_transport(self.comPort, self.baudRate, timeout=READ_TIMEOUT)
+            port.baudrate = self.baudRate
+            port.open()
+            self.serial_port = port
+            log.info("Bağlantı Açıldı: %s", self.comPort)
+            # Açılış denemeleri (bilerek kaçırılan cevaplar) hat sayaçlarına yazılmaz
+            stats, self.linkStats = self.linkStats, None
+            try:
+                if self._negotiates_baud():
+                    self.negotiateBaud()
+                # Byte aralığı hıza bağlıdır; ölçüm son hızda yapılır
+                if self.autoCalibrate:
+                    self.calibratePacing()
+                if self.autoDetectBulk and self.BULK_COMMAND is not None:
+                    self.probeBulkSupport()
+            finally:
+                self.linkStats = stats
             return True
         except Exception as e:
-            print(f"Hata ({self.comPort}): {e}")
+            log.error("Hata (%s): %s", self.comPort, e)
             return False
 
     def close(self):
@@ -72,67 +294,517 @@ class HomeAutomationSystemConnection:
         """
         PIC'e tek bir byte gönderir.
         ÖNEMLİ: PIC işlemcileri PC kadar hızlı değildir. Veriyi işleyebilmesi için
-        her gönderimden sonra çok kısa (0.02sn) bir bekleme eklenmiştir.
+        her gönderimden sonra kısa bir bekleme (bytePacing) eklenmiştir.
+        Bu süre açılışta karta göre ölçülür (bkz. calibratePacing).
         """
         if self.serial_port and self.serial_port.is_open:
+            stats = self.linkStats
             try:
                 self.serial_port.write(bytes([byte_data]))
-                time.sleep(0.02)  # Buffer taşmasını önlemek için bekleme
-            except:
-                pass
+                if stats is not None:
+                    stats.wrote(1)
+                if self.bytePacing:
+                    time.sleep(self.bytePacing)  # Buffer taşmasını önlemek için bekleme
+            except Exception as e:
+                if stats is not None:
+                    stats.write_failed(e)
+
+    def _write_commands(self, commands, pacing):
+        """Komutları yazar; pacing > 0 ise her byte'tan sonra o kadar bekler."""
+        if not pacing:
+            self.serial_port.write(bytes(commands))
+        else:
+            for cmd in commands:
+                self.serial_port.write(bytes([cmd]))
+                time.sleep(pacing)
+        if self.linkStats is not None:
+            self.linkStats.wrote(len(commands))
 
     def _read_byte(self):
         """PIC'ten gelen tek bir byte veriyi okur."""
         if self.serial_port and self.serial_port.is_open:
+            stats = self.linkStats
             try:
                 data = self.serial_port.read(1)
-                if data:
-                    return int.from_bytes(data, byteorder='big')
-            except:
-                pass
+            except Exception as e:
+                if stats is not None:
+                    stats.read_failed(e)
+                return 0
+            if stats is not None:
+                stats.received(1, data)
+            if data:
+                return int.from_bytes(data, byteorder='big')
         return 0  # Veri gelmezse veya hata olursa 0 dön
 
+    def _read_until(self, size, deadline=None):
+        """
+        En fazla 'size' byte okur; son tarih (deadline, time.monotonic) geçince
+        eldeki byte'larla döner. Hata olursa b"" döner.
+        """
+        if not (self.serial_port and self.serial_port.is_open):
+            return b""
+        stats = self.linkStats
+        try:
+            if deadline is None:
+                self._set_read_timeout(READ_TIMEOUT)
+                data = self.serial_port.read(size)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    data = b""  # Turun süresi okumaya sıra gelmeden doldu
+                else:
+                    self._set_read_timeout(remaining)
+                    data = self.serial_port.read(size)
+        except Exception as e:
+            if stats is not None:
+                stats.read_failed(e)
+            return b""
+        if stats is not None:
+            stats.received(size, data)
+        return data
+
+    def _set_read_timeout(self, timeout):
+        """
+        Port zaman aşımını sadece TIMEOUT_SLACK'ten fazla değiştiyse ayarlar.
+        Aynı son tarihli turlarda kalan süre hemen hemen aynıdır; okuma son
+        tarihi en fazla TIMEOUT_SLACK kadar kaçırır veya erken biter.
+        """
+        current = self.serial_port.timeout
+        if current is None or abs(current - timeout) > TIMEOUT_SLACK:
+            self.serial_port.timeout = timeout
+
+    def _query(self, commands, deadline=None):
+        """
+        Sorgu komutlarını gönderir ve cevapları aynı sırada liste olarak döner.
+        Cevabı alınamayan alanlar None olur (0 yazılıp gerçek veri sanılmasın).
+        """
+        if self.pipelined:
+            return self._query_pipelined(commands, deadline)
+        return self._query_paced(commands, deadline)
+
+    def _query_paced(self, commands, deadline=None):
+        """Klasik mod: her komut için gönder -> 20 ms bekle -> oku."""
+        replies = [None] * len(commands)
+        stats = self.linkStats
+        for i, cmd in enumerate(commands):
+            started = time.perf_counter()
+            self._send_byte(cmd)
+            data = self._read_until(1, deadline)
+            if not data:
+                break  # İlk kaçan cevapta turu bırak, kalan sorgularla vakit kaybetme
+            if stats is not None:
+                stats.round_trip((cmd,), time.perf_counter() - started)
+            replies[i] = data[0]
+        return replies
+
+    def _query_pipelined(self, commands, deadline=None):
+        """
+        Hızlı mod: tüm sorgu komutları TEK bir write() ile gönderilir,
+        cevaplar TEK bir read() ile toplu okunur.
+        NOT: Sorgu komutlarında 20 ms beklemeye gerek yoktur. ISR her byte'a
+        SEND_BYTE ile hemen cevap verir ve cevap, bir sonraki sorgu byte'ı ile
+        aynı hızda (baud rate) hattan çıkar; yani RX tamponu taşmaz.
+        Bekleme sadece ayarlama (SET) komutlarında korunur (_send_byte).
+        """
+        if self.serial_port and self.serial_port.is_open:
+            stats = self.linkStats
+            started = time.perf_counter()
+            try:
+                # Önceki döngüden kalan geç cevaplar sırayı kaydırmasın
+                self.serial_port.reset_input_buffer()
+                self._write_commands(commands, self.queryPacing)
+            except Exception as e:
+                if stats is not None:
+                    stats.write_failed(e)
+                return [None] * len(commands)
+            data = self._read_until(len(commands), deadline)
+            if stats is not None and len(data) == len(commands):
+                stats.round_trip(commands, time.perf_counter() - started)
+            return self._align_replies(data, len(commands))
+        return [None] * len(commands)
+
+    @staticmethod
+    def _align_replies(data, count):
+        """
+        Toplu okunan cevapları komutlarla eşler.
+        Cevaplarda numara yoktur; eksik bir byte hangi komuta ait olduğunu
+        belirsizleştirir. Bu yüzden eksik okumada TÜM tur geçersiz sayılır.
+        """
+        if len(data) == count:
+            return list(data)
+        return [None] * count
+
+    def _poll(self):
+        """POLL_SEQUENCE'ı son tarih içinde sorgular ve alanlara uygular."""
+        deadline = None
+        if self.pollDeadline is not None:
+            deadline = time.monotonic() + self.pollDeadline
+        if self.supportsBulk:
+            replies = self._query_bulk(deadline)
+        else:
+            replies = self._query(self.POLL_SEQUENCE, deadline)
+        return self._finish_poll(replies)
+
+    @property
+    def bulkFrameLength(self):
+        """Toplu cevap çerçevesinin toplam uzunluğu (byte)."""
+        return len(self.POLL_SEQUENCE) + FRAME_OVERHEAD
+
+    def _query_bulk(self, deadline=None):
+        """
+        Tek istek / tek cevap: BULK_COMMAND gönderilir, çerçeve okunup çözülür.
+        Cevaplar POLL_SEQUENCE sırasındadır; çerçeve bozuksa hepsi None olur.
+        """
+        if not (self.serial_port and self.serial_port.is_open):
+            return [None] * len(self.POLL_SEQUENCE)
+        stats = self.linkStats
+        started = time.perf_counter()
+        try:
+            self.serial_port.reset_input_buffer()
+            # Bekleme, bir sonraki isteğin de ISR'a çok erken gelmesini önler
+            self._write_commands([self.BULK_COMMAND], self.queryPacing)
+        except Exception as e:
+            if stats is not None:
+                stats.write_failed(e)
+            return [None] * len(self.POLL_SEQUENCE)
+        data = self._read_until(self.bulkFrameLength, deadline)
+        if stats is not None and len(data) == self.bulkFrameLength:
+            stats.round_trip((self.BULK_COMMAND,), time.perf_counter() - started)
+        return self._decode_bulk(data)
+
+    def _decode_bulk(self, data):
+        payload = decode_frame(data, len(self.POLL_SEQUENCE))
+        if payload is None:
+            if self.linkStats is not None and len(data) == self.bulkFrameLength:
+                self.linkStats.bad_frame()  # Tam boy ama başlık / kontrol toplamı hatalı
+            return [None] * len(self.POLL_SEQUENCE)
+        return payload
+
+    def probeBulkSupport(self):
+        """
+        Yetenek sorgusu: Firmware toplu okumayı destekliyor mu?
+        Eski firmware bilinmeyen komutu yok sayar (ISR_EXIT); geçerli bir çerçeve
+        gelmezse tek tek sorgu komutlarına (POLL_SEQUENCE) devam edilir.
+        """
+        if self.BULK_COMMAND is None:
+            self.supportsBulk = False
+            return False
+        deadline = time.monotonic() + (self.pollDeadline or READ_TIMEOUT)
+        self.supportsBulk = None not in self._query_bulk(deadline)
+        try:
+            self.serial_port.reset_input_buffer()  # Yarım kalmış çerçeve artığı kalmasın
+        except:
+            pass
+        return self.supportsBulk
+
+    def _negotiates_baud(self):
+        return self.autoNegotiateBaud and self.BAUD_QUERY_COMMAND is not None and self.maxBaudRate > BAUD_DEFAULT
+
+    def negotiateBaud(self):
+        """
+        Hız pazarlığı (bkz. BAUD_RATES): Kartın desteklediği hızları sorar,
+        maxBaudRate'i aşmayan ortak hızları yüksekten düşüğe dener.
+        Her denemede: hız komutu -> eski hızda onay -> iki uç da geçer -> doğrulama.
+        Doğrulama tutmazsa BAUD_DEFAULT'a dönülüp bir alttaki hız denenir.
+        Eski firmware soruya cevap vermez; hat BAUD_DEFAULT'ta kalır.
+        Sonuçta kullanılan hızı döner.
+        """
+        # Kart önceki oturumdan yüksek hızda kalmış olabilir: ilk byte onu
+        # varsayılan hıza döndürür (FERR), soru byte'ı kaybolmaz.
+        self._wake_line()
+        deadline = time.monotonic() + (self.pollDeadline or READ_TIMEOUT)
+        mask = self._query([self.BAUD_QUERY_COMMAND], deadline)[0]
+        if mask is None:
+            self.supportedBauds = (BAUD_DEFAULT,)
+            return self.baudRate
+        self.supportedBauds = tuple(b for i, b in enumerate(BAUD_RATES) if mask & (1 << i))
+        for rate in sorted(self.supportedBauds, reverse=True):
+            if rate <= BAUD_DEFAULT or rate > self.maxBaudRate:
+                continue
+            if self._switch_baud(rate):
+                break
+        return self.baudRate
+
+    def _switch_baud(self, rate):
+        """Tek bir hız denemesi. Başarılıysa True; değilse hat BAUD_DEFAULT'a döner."""
+        command = CMD_AC_SET_BAUD | BAUD_RATES.index(rate)
+        deadline = time.monotonic() + (self.pollDeadline or READ_TIMEOUT)
+        if self._query([command], deadline)[0] != command:
+            return False  # Onay yok: kart hızını değiştirmedi
+        self._set_line_baud(rate)
+        deadline = time.monotonic() + (self.pollDeadline or READ_TIMEOUT)
+        if None not in self._query([self.PROBE_COMMAND] * BAUD_VERIFY_PROBES, deadline):
+            return True
+        # Yeni hızda konuşulamıyor. PC varsayılan hıza döner; bu hızda gelen byte
+        # kartta çerçeve hatası (FERR) üretir ve kart da varsayılan hıza döner.
+        self._set_line_baud(BAUD_DEFAULT)
+        try:
+            self.serial_port.write(bytes([self.PROBE_COMMAND]))  # Cevap beklenmez (FERR)
+            time.sleep(10.0 / BAUD_DEFAULT)
+            self.serial_port.reset_input_buffer()
+        except:
+            pass
+        return False
+
+    def _wake_line(self):
+        """
+        Varsayılan hızda tek bir sorgu gönderir (cevabı kullanılmaz). Kart aynı
+        hızdaysa hemen cevap verir; başka hızdaysa byte çerçeve hatası (FERR)
+        üretir, kart varsayılan hıza döner ve en fazla WAKE_TIMEOUT beklenir.
+        """
+        self._query([self.PROBE_COMMAND], time.monotonic() + WAKE_TIMEOUT)
+
+    def _set_line_baud(self, rate):
+        self.serial_port.baudrate = rate
+        self.baudRate = rate
+
+    @property
+    def pollWireTime(self):
+        """
+        Bir sorgu turunun hatta geçirdiği süre (saniye): istek + cevap byte'ları,
+        byte başına 10 bit. Hız arttıkça aynı oranda kısalır.
+        """
+        if self.supportsBulk:
+            size = 1 + self.bulkFrameLength
+        else:
+            size = 2 * len(self.POLL_SEQUENCE)
+        return size * 10.0 / self.baudRate
+
+    def _finish_poll(self, replies):
+        """
+        Cevapları alanlara uygular, tur sonucuna göre byte aralığını ayarlar.
+        Bir değer değiştiyse veya tur eksik kaldıysa (bayatlık değişebilir)
+        dinleyicilere (listeners) haber verir; durum aynıysa kimse uyanmaz.
+        """
+        self._apply_poll(replies)
+        was_ok = self.lastPollOk
+        self.lastPollOk = None not in replies
+        self.lastPollSilent = replies.count(None) == len(replies)
+        self._adapt_pacing(self.lastPollOk)
+        if was_ok != self.lastPollOk:
+            if self.lastPollOk:
+                log.info("%s: tüm cevaplar alınıyor", self.comPort)
+            else:
+                log.warning("%s: %d/%d cevap eksik", self.comPort, replies.count(None), len(replies))
+        self._commit_state()
+        changed, self._changed = self._changed, set()
+        if changed or not self.lastPollOk or was_ok != self.lastPollOk:
+            self._publish(changed)
+        return self.lastPollOk
+
+    def _commit_state(self):
+        """Alanlardan yeni bir değişmez durum kaydı oluşturur ve TEK atamayla yayınlar."""
+        self._state_seq += 1
+        fields = self.STATE_CLASS.FIELDS
+        self.state = state = self.STATE_CLASS(self._state_seq, time.time(), self.lastPollOk,
+                                              tuple(self.fieldTimestamps.get(f) for f in fields),
+                                              tuple(getattr(self, f) for f in fields))
+        for sink in self.stateSinks:
+            sink(state)
+
+    def _publish(self, fields):
+        """Dinleyicilere değişen alanları bildirir. Bir dinleyicinin hatası turu bozmaz."""
+        for listener in self.listeners:
+            try:
+                listener(self, fields)
+            except Exception:
+                pass
+
+    @property
+    def queryPacing(self):
+        """
+        Toplu sorgularda byte'lar arası bekleme. Ölçüm yapılmadıysa 0'dır:
+        ISR sorgu byte'larına hat hızında cevap verir (bkz. _query_pipelined).
+        Ölçüm yapıldıysa ölçülen (ve gerekirse geri çekilmiş) değer kullanılır.
+        """
+        return 0.0 if self.calibratedPacing is None else self.bytePacing
+
+    def calibratePacing(self):
+        """
+        Kartın art arda gelen byte'ları kaçırmadan alabildiği en kısa aralığı ölçer.
+        Zararsız bir sorgu komutu (PROBE_COMMAND) aday aralıklarla PACING_PROBES kez
+        gönderilir; tüm cevapların geldiği en kısa aralık seçilir.
+        Sorgu yolu ISR'da ayar yolundan daha uzundur (SEND_BYTE bekler), bu yüzden
+        sorguyla bulunan aralık ayar komutları için de güvenlidir.
+        Kart hiç cevap vermezse eski sabit değer (PACING_DEFAULT) korunur.
+        """
+        safe_time = self._probe_pacing(PACING_CANDIDATES[-1], self.pollDeadline or READ_TIMEOUT)
+        if safe_time is None:
+            return self.bytePacing  # Kart cevap vermiyor; ölçüm anlamsız
+        # Hızlı adaylar en fazla güvenli aralıktaki süre (+pay) kadar beklenir;
+        # böylece taşan adaylarda uzun zaman aşımı beklenmez.
+        budget = safe_time + 0.05
+        for pacing in PACING_CANDIDATES:
+            # Tesadüfen geçmesin diye her aday iki kez denenir
+            if self._probe_pacing(pacing, budget) is not None and self._probe_pacing(pacing, budget) is not None:
+                self.calibratedPacing = pacing
+                self.bytePacing = pacing
+                break
+        return self.bytePacing
+
+    def _probe_pacing(self, pacing, timeout):
+        """
+        Verilen aralıkla PACING_PROBES sorgu gönderir.
+        Hepsi 'timeout' içinde cevaplandıysa geçen süreyi, yoksa None döner.
+        """
+        if not (self.serial_port and self.serial_port.is_open):
+            return None
+        commands = [self.PROBE_COMMAND] * PACING_PROBES
+        started = time.monotonic()
+        try:
+            self.serial_port.reset_input_buffer()
+            self._write_commands(commands, pacing)
+        except:
+            return None
+        data = self._read_until(len(commands), started + timeout)
+        elapsed = time.monotonic() - started
+        self.serial_port.reset_input_buffer()  # Geç gelen cevaplar sonraki denemeye karışmasın
+        return elapsed if len(data) == len(commands) else None
+
+    def _adapt_pacing(self, poll_ok):
+        """
+        Cevap kaçtıysa aralığı iki katına çıkarır (en fazla PACING_DEFAULT).
+        PACING_RECOVER_AFTER temiz turdan sonra ölçülen değere doğru yarıya indirir.
+        """
+        if self.calibratedPacing is None:
+            return  # Ölçüm yoksa sabit (eski) aralık kullanılır
+        if not poll_ok:
+            self._clean_polls = 0
+            if self.bytePacing < PACING_DEFAULT:
+                self.bytePacing = min(PACING_DEFAULT, max(self.bytePacing * 2, PACING_CANDIDATES[1]))
+                self.pacingBackoffs += 1
+            return
+        self._clean_polls += 1
+        if self._clean_polls >= PACING_RECOVER_AFTER and self.bytePacing > self.calibratedPacing:
+            self._clean_polls = 0
+            halved = self.bytePacing / 2
+            self.bytePacing = self.calibratedPacing if halved < PACING_CANDIDATES[1] else max(halved, self.calibratedPacing)
+
+    def _mark_fresh(self, field, *parts):
+        """
+        Alanın tüm parçaları geldiyse zaman damgasını yeniler ve True döner.
+        Eksik parça varsa False döner; alanın son geçerli değeri korunur.
+        """
+        if None in parts:
+            return False
+        self.fieldTimestamps[field] = time.monotonic()
+        return True
+
+    def _store(self, field, value):
+        """Yeni değeri alana yazar, geçmişe (history) ve kayıt fonksiyonlarına iletir."""
+        if getattr(self, field, None) != value:
+            self._changed.add(field)
+        setattr(self, field, value)
+        stamp = time.time()
+        self.history.record(field, stamp, value)
+        for record in self.recorders:
+            record(field, stamp, value)
+
+    def getFieldAge(self, field):
+        """Alanın son geçerli değerinin yaşı (saniye). Hiç alınmadıysa None."""
+        stamp = self.fieldTimestamps.get(field)
+        if stamp is None:
+            return None
+        return time.monotonic() - stamp
+
+    def isStale(self, field, maxAge=STALE_AFTER):
+        """Alan hiç alınmadıysa veya 'maxAge' saniyeden eskiyse True döner."""
+        age = self.getFieldAge(field)
+        return age is None or age > maxAge
+
+    def _encode_setpoint(self, field, value):
+        """
+        Ayarlanabilir bir alanın (bkz. SETPOINTS) yeni değerini ayar byte'larına çevirir.
+        Komut kuyruğu gibi kart tipini bilmeyen katmanlar bunu kullanır.
+        """
+        return self.SETPOINTS[field](self, value)
+
+    def snapshot(self):
+        """Son yayınlanan durum kaydının sözlük hali (bkz. BoardState.asdict)."""
+        return self.state.asdict()
+
+    def enableLinkStats(self, enabled=True):
+        """
+        Hat sayaçlarını ve komut başına gidiş-dönüş histogramlarını açar / kapatır
+        (bkz. link_stats.LinkStats). Kapalıyken G/Ç yoluna tek bir 'None' kontrolü eklenir.
+        Tekrar açmak sayaçları sıfırlamaz.
+        """
+        if not enabled:
+            self.linkStats = None
+        elif self.linkStats is None:
+            self.linkStats = LinkStats()
+        return self.linkStats
+
+    def getLinkStats(self):
+        """Hat sayaçlarının kopyası (sözlük). Sayaçlar kapalıysa None."""
+        stats = self.linkStats
+        return None if stats is None else stats.snapshot()
+
 
 class AirConditionerSystemConnection(HomeAutomationSystemConnection):
     """
     BOARD #1 (Klima Sistemi) için özel kontrol sınıfı.
     Ana sınıftan miras alır (Inheritance).
     """
-    def __init__(self, com_port):
-        super().__init__(comPort=com_port)
+    def __init__(self, com_port, transport=None, baud_rate=BAUD_DEFAULT):
+        super().__init__(comPort=com_port, baudRate=baud_rate, transport=transport)
         self.desiredTemperature = 25.0
         self.ambientTemperature = 0.0
         self.fanSpeed = 0
+        self._commit_state()
+
+    # update() içinde sorgulanan komut dizisi
+    POLL_SEQUENCE = AC_POLL_SEQUENCE
+    # Byte aralığı ölçümünde kullanılan zararsız sorgu
+    PROBE_COMMAND = CMD_AC_GET_FAN_SPEED
+    # Tüm alanları tek çerçevede isteyen komut (cevap sırası: AC_POLL_SEQUENCE)
+    BULK_COMMAND = CMD_AC_GET_ALL
+    # Hız pazarlığı (bkz. negotiateBaud)
+    BAUD_QUERY_COMMAND = CMD_AC_GET_BAUDS
 
     def update(self):
         """
         PIC'ten güncel verileri (Sıcaklık, Fan vb.) çeker.
         Sorgu-Cevap (Polling) mantığıyla çalışır.
+        Tur en fazla 'pollDeadline' saniye sürer. Tüm alanlar geldiyse True döner;
+        gelmeyen alanlar son geçerli değerini korur (bkz. isStale / getFieldAge).
         """
-        # 1. Ortam Sıcaklığını İste (Önce Tam sayı, Sonra Ondalık)
-        self._send_byte(CMD_AC_GET_AMBIENT_TEMP_INT)
-        amb_int = self._read_byte()
-        self._send_byte(CMD_AC_GET_AMBIENT_TEMP_FRAC)
-        amb_frac = self._read_byte()
+        # Tüm alanlar tek sorgu dizisiyle istenir (bkz. AC_POLL_SEQUENCE)
+        return self._poll()
+
+    def _apply_poll(self, replies):
+        """
+        POLL_SEQUENCE cevaplarını (aynı sırada) alanlara dönüştürür.
+        Cevabı eksik (None) olan alanlara dokunulmaz.
+        """
+        amb_int, amb_frac, des_int, des_frac, fan = replies
+
+        # 1. Ortam Sıcaklığı
         # Birleştirme: Tam + (Ondalık / 10) -> Örn: 22 + 0.5 = 22.5
-        self.ambientTemperature = amb_int + (amb_frac / 10.0)
+        if self._mark_fresh("ambientTemperature", amb_int, amb_frac):
+            self._store("ambientTemperature", amb_int + (amb_frac / 10.0))
 
-        # 2. İstenen Sıcaklığı İste (Senkronizasyon amacıyla)
-        self._send_byte(CMD_AC_GET_DESIRED_TEMP_INT)
-        des_int = self._read_byte()
-        self._send_byte(CMD_AC_GET_DESIRED_TEMP_FRAC)
-        des_frac = self._read_byte()
-        self.desiredTemperature = des_int + (des_frac / 10.0)
+        # 2. İstenen Sıcaklık (Senkronizasyon amacıyla)
+        if self._mark_fresh("desiredTemperature", des_int, des_frac):
+            self._store("desiredTemperature", des_int + (des_frac / 10.0))
 
-        # 3. Fan Hızını İste
-        self._send_byte(CMD_AC_GET_FAN_SPEED)
-        self.fanSpeed = self._read_byte()
+        # 3. Fan Hızı
+        if self._mark_fresh("fanSpeed", fan):
+            self._store("fanSpeed", fan)
 
     def setDesiredTemp(self, temp):
         """
         Kullanıcının girdiği hedef sıcaklığı PIC'e gönderir.
         Burada 'Bit Masking' ve 'Bitwise OR' işlemleri kullanılır.
         """
+        for cmd in self._encode_desired_temp(temp):
+            self._send_byte(cmd)
+
+        self.desiredTemperature = temp
+        self._commit_state()
+
+    def _encode_desired_temp(self, temp):
+        """Hedef sıcaklığı PIC'e gidecek ayar byte'larına çevirir (gönderim sırasıyla)."""
         # Sayıyı parçala: 25.5 -> Tam: 25, Ondalık: 5
         val_int = int(temp)
         val_frac = int((temp - val_int) * 10)
@@ -140,66 +812,99 @@ class AirConditionerSystemConnection(HomeAutomationSystemConnection):
         # ADIM 1: Ondalık Kısmı Paketle (Header: 10xxxxxx)
         # Örnek: Header(10000000) OR Data(00000101) = 10000101
         cmd_frac = MASK_SET_FRAC_HEADER | (val_frac & MASK_DATA_6BIT)
-        self._send_byte(cmd_frac)
 
         # ADIM 2: Tam Sayı Kısmı Paketle (Header: 11xxxxxx)
         cmd_int = MASK_SET_INT_HEADER | (val_int & MASK_DATA_6BIT)
-        self._send_byte(cmd_int)
 
-        self.desiredTemperature = temp
+        return [cmd_frac, cmd_int]
 
-    # Getter Metotları (Arayüzün veriye ulaşması için)
-    def getAmbientTemp(self): return self.ambientTemperature
-    def getFanSpeed(self): return self.fanSpeed
-    def getDesiredTemp(self): return self.desiredTemperature
+    # Ayarlanabilir alanlar -> ayar byte'larını üreten metot
+    SETPOINTS = {"desiredTemperature": _encode_desired_temp}
+    # Ayarlanabilir alanların geçerli aralığı (arayüz ve HTTP API aynı sınırı kullanır)
+    SETPOINT_RANGES = {"desiredTemperature": (10.0, 50.0)}
+    # Sorgu turu sonunda yayınlanan durum kaydı ve alanları
+    STATE_CLASS = AirConditionerState
+    STATE_FIELDS = AirConditionerState.FIELDS
+
+    # Getter Metotları (Arayüzün veriye ulaşması için). Son yayınlanan kayıttan
+    # okunur; birden fazla alan birlikte okunacaksa 'state' kullanılmalıdır.
+    def getAmbientTemp(self): return self.state.ambientTemperature
+    def getFanSpeed(self): return self.state.fanSpeed
+    def getDesiredTemp(self): return self.state.desiredTemperature
 
 
 class CurtainControlSystemConnection(HomeAutomationSystemConnection):
     """
     BOARD #2 (Perde ve Sensör Sistemi) için özel kontrol sınıfı.
     """
-    def __init__(self, com_port):
-        super().__init__(comPort=com_port)
+    def __init__(self, com_port, transport=None, baud_rate=BAUD_DEFAULT):
+        super().__init__(comPort=com_port, baudRate=baud_rate, transport=transport)
         self.curtainStatus = 0.0
         self.outdoorTemp = 0.0
         self.outdoorPress = 0.0
         self.lightIntensity = 0.0
+        self._commit_state()
+
+    # update() içinde sorgulanan komut dizisi
+    POLL_SEQUENCE = CUR_POLL_SEQUENCE
+    # Byte aralığı ölçümünde kullanılan zararsız sorgu
+    PROBE_COMMAND = CMD_CUR_GET_LIGHT_INT
 
     def update(self):
-        """PIC'ten sensör verilerini çeker."""
-        # 1. Dış Sıcaklık Okuma
-        self._send_byte(CMD_CUR_GET_OUTDOOR_TEMP_INT)
-        t_int = self._read_byte()
-        self._send_byte(CMD_CUR_GET_OUTDOOR_TEMP_FRAC)
-        t_frac = self._read_byte()
-        self.outdoorTemp = t_int + (t_frac / 10.0)
-
-        # 2. Hava Basıncı Okuma (Basitleştirilmiş birleştirme)
-        self._send_byte(CMD_CUR_GET_PRESSURE_INT)
-        p_int = self._read_byte()
-        self._send_byte(CMD_CUR_GET_PRESSURE_FRAC)
-        p_frac = self._read_byte()
-        self.outdoorPress = (p_int * 10) + p_frac
-
-        # 3. Işık Şiddeti Okuma
-        self._send_byte(CMD_CUR_GET_LIGHT_INT)
-        l_int = self._read_byte()
-        self.lightIntensity = l_int * 10  # Ham veriyi Lux cinsine benzetmek için çarpan
+        """
+        PIC'ten sensör verilerini çeker.
+        Tur en fazla 'pollDeadline' saniye sürer; tüm alanlar geldiyse True döner.
+        """
+        # Tüm alanlar tek sorgu dizisiyle istenir (bkz. CUR_POLL_SEQUENCE)
+        return self._poll()
+
+    def _apply_poll(self, replies):
+        """
+        POLL_SEQUENCE cevaplarını (aynı sırada) alanlara dönüştürür.
+        Cevabı eksik (None) olan alanlara dokunulmaz.
+        """
+        t_int, t_frac, p_int, p_frac, l_int = replies
+
+        # 1. Dış Sıcaklık
+        if self._mark_fresh("outdoorTemp", t_int, t_frac):
+            self._store("outdoorTemp", t_int + (t_frac / 10.0))
+
+        # 2. Hava Basıncı (Basitleştirilmiş birleştirme)
+        if self._mark_fresh("outdoorPress", p_int, p_frac):
+            self._store("outdoorPress", (p_int * 10) + p_frac)
+
+        # 3. Işık Şiddeti
+        if self._mark_fresh("lightIntensity", l_int):
+            self._store("lightIntensity", l_int * 10)  # Ham veriyi Lux cinsine benzetmek için çarpan
 
     def setCurtainStatus(self, status):
         """
         Perde açıklığını (%) ayarlar.
         Bit manipülasyonu klima ile benzer mantıktadır.
         """
+        for cmd in self._encode_curtain_status(status):
+            self._send_byte(cmd)
+
+        self.curtainStatus = status
+        # Perde konumu sorgulanmaz: tazeliği yazılan değerden gelir (yoksa hep bayat görünür)
+        self._mark_fresh("curtainStatus")
+        self._commit_state()
+
+    def _encode_curtain_status(self, status):
+        """Perde açıklığını PIC'e gidecek ayar byte'larına çevirir."""
         val_int = int(status)  # Perde %0-100 (Tam sayı yeterli)
 
         # Paketleme: Header(11xxxxxx) | Data(xxxxxx)
         cmd_int = MASK_SET_INT_HEADER | (val_int & MASK_DATA_6BIT)
-        self._send_byte(cmd_int)
+        return [cmd_int]
 
-        self.curtainStatus = status
+    # Ayarlanabilir alanlar -> ayar byte'larını üreten metot
+    SETPOINTS = {"curtainStatus": _encode_curtain_status}
+    SETPOINT_RANGES = {"curtainStatus": (0.0, 100.0)}
+    STATE_CLASS = CurtainState
+    STATE_FIELDS = CurtainState.FIELDS
 
-    # Getter Metotları
-    def getOutdoorTemp(self): return self.outdoorTemp
-    def getOutdoorPress(self): return self.outdoorPress
-    def getLightIntensity(self): return self.lightIntensity
\ No newline at end of file
+    # Getter Metotları (son yayınlanan kayıttan)
+    def getOutdoorTemp(self): return self.state.outdoorTemp
+    def getOutdoorPress(self): return self.state.outdoorPress
+    def getLightIntensity(self): return self.state.lightIntensity
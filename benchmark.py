@@ -0,0 +1,422 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PERFORMANS ÖLÇÜM PAKETİ (BENCHMARK)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Sorgu (update) ve komut (setDesiredTemp, setCurtainStatus, komut
+#           kuyruğu) yollarının süresini tekrarlanabilir şekilde ölçer.
+#           Kartların yerine Linux pty çiftinin ucunda çalışan emülatörler
+#           kullanılır (gerçek pyserial kod yolu); emülatör değerleri her turdan
+#           önce sabit tohumlu bir senaryoyla değiştirilir.
+#             python benchmark.py run --out once.json
+#             python benchmark.py run --out sonra.json
+#             python benchmark.py compare once.json sonra.json
+#           compare, eşik değerinden fazla kötüleşen ölçümleri listeler ve
+#           1 çıkış koduyla döner (CI'da gerileme kontrolü için).
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection, MASK_DATA_6BIT
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from command_queue import SerialIOService
+from transport import MemoryTransport, PtyTransport
+
+RESULT_VERSION = 1        # Sonuç dosyası biçimi
+SEED = 2025               # Senaryo tohumu: iki koşu aynı değer dizisini görür
+COUNT = 300               # Ölçüm başına işlem sayısı
+WARMUP = 20               # Ölçülmeyen ısınma işlemleri
+REPEAT = 3                # Her ölçüm bu kadar tekrarlanır, metriklerin medyanı alınır
+DRAIN_TIMEOUT = 5.0       # Komutların karta ulaşmasını bekleme süresi (sn)
+REGRESSION_THRESHOLD = 0.10  # compare: %10'dan fazla kötüleşme gerileme sayılır
+TRANSPORTS = ("pty", "mem")
+SCHED_BOARDS = 50         # Zamanlayıcı ölçümü: tek serviste bu kadar emülatörlü kart
+SCHED_DURATION = 3.0      # Zamanlayıcı ölçümünün süresi (sn)
+SCHED_INTERVAL = 0.25     # Zamanlayıcı ölçümünde kart başına sorgu aralığı (sn)
+
+# Metrik -> daha iyi yön. cpu_ms: ölçüm yapan thread'in işlem başına CPU süresi
+# (emülatör thread'i hariç). Kuyruk ölçümünde iş başka thread'de yapıldığı için yoktur.
+LOWER, HIGHER = "lower", "higher"
+METRICS = {
+    "p50_ms": LOWER,
+    "p99_ms": LOWER,
+    "mean_ms": LOWER,
+    "cpu_ms": LOWER,
+    "ops_per_sec": HIGHER,
+}
+
+
+# --- KART SENARYOLARI ---
+def _drive_ac(emu, rng):
+    """Ortam sıcaklığı ve fan hızı her turda biraz değişir (değişiklik yolu da ölçülsün)."""
+    emu.step(rng.randint(18, 30))
+    with emu._lock:
+        emu.ambient_temp_dec = rng.randint(0, 9)
+        emu.fan_speed_rps = rng.randint(10, 20)
+
+
+def _drive_curtain(emu, rng):
+    with emu._lock:
+        emu.outdoor_temp_int = rng.randint(5, 30)
+        emu.pressure_frac = rng.randint(0, 9)
+        emu.light_int = rng.randint(0, 63)
+
+
+def _open_board(kind, transport):
+    """Emülatörlü kartı açar. Dönüş: (kart, emülatör, açılış süresi ms)."""
+    if kind == "ac":
+        emu, board_class = AirConditionerBoardEmulator(), AirConditionerSystemConnection
+    else:
+        emu, board_class = CurtainBoardEmulator(), CurtainControlSystemConnection
+    transport_class = PtyTransport if transport == "pty" else MemoryTransport
+    board = board_class(f"{transport}://{kind}", transport=transport_class(emu))
+    started = time.perf_counter()
+    if not board.open():
+        raise RuntimeError(f"{kind} kartı açılamadı ({transport})")
+    return board, emu, (time.perf_counter() - started) * 1000
+
+
+def _wait_for(condition, timeout=None):
+    deadline = time.monotonic() + (DRAIN_TIMEOUT if timeout is None else timeout)
+    while not condition():
+        if time.monotonic() > deadline:
+            raise RuntimeError("Komutlar zamanında karta ulaşmadı")
+        time.sleep(0.0005)
+
+
+# --- ÖLÇÜM ---
+def percentile(samples, q):
+    """En yakın sıra yöntemiyle yüzdelik (q: 0-1). Sıralı liste beklenir."""
+    return samples[max(0, min(len(samples) - 1, math.ceil(q * len(samples)) - 1))]
+
+
+def _measure(op, count, warmup, before=None, drain=None, cpu=True):
+    """
+    op(i) işlemini 'count' kez çalıştırır. before(i) ölçüm dışında çalışır
+    (senaryo adımı); drain(i) son işlemin (i) karta ulaşmasını bekler ve
+    ölçülen toplam süreye dahildir. Dönüş: metrik sözlüğü.
+    """
+    for i in range(warmup):
+        if before:
+            before(i)
+        op(i)
+    if drain and warmup:
+        drain(warmup - 1)
+    latencies = []
+    errors = 0
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    for i in range(count):
+        if before:
+            before(i)
+        t = time.perf_counter()
+        if op(i) is False:
+            errors += 1
+        latencies.append(time.perf_counter() - t)
+    if drain:
+        drain(count - 1)
+    wall = time.perf_counter() - wall_start
+    cpu_time = time.thread_time() - cpu_start
+    latencies.sort()
+    return {
+        "n": count,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "cpu_ms": cpu_time / count * 1000 if cpu else None,
+        "ops_per_sec": count / wall,
+    }
+
+
+def _bench_poll(kind, transport, count, warmup, rng):
+    board, emu, open_ms = _open_board(kind, transport)
+    drive = _drive_ac if kind == "ac" else _drive_curtain
+    try:
+        result = _measure(lambda i: board.update(), count, warmup, before=lambda i: drive(emu, rng))
+    finally:
+        board.close()
+    return result, open_ms, board
+
+
+def _bench_set_ac(transport, count, warmup):
+    board, emu, _ = _open_board("ac", transport)
+    values = [10.0 + (i % 400) / 10 for i in range(max(warmup, count))]  # Her komut farklı değer
+
+    def drain(i):
+        cmd_frac, cmd_int = board._encode_desired_temp(values[i])
+        expected = (cmd_int & MASK_DATA_6BIT, cmd_frac & MASK_DATA_6BIT)  # Kartın göreceği değer
+        _wait_for(lambda: (emu.desired_temp_int, emu.desired_temp_dec) == expected)
+
+    try:
+        return _measure(lambda i: board.setDesiredTemp(values[i]), count, warmup, drain=drain)
+    finally:
+        board.close()
+
+
+def _bench_set_curtain(transport, count, warmup):
+    board, emu, _ = _open_board("curtain", transport)
+    values = [i % 64 for i in range(max(warmup, count))]  # 6 bitlik veri alanı
+    try:
+        return _measure(lambda i: board.setCurtainStatus(values[i]), count, warmup,
+                        drain=lambda i: _wait_for(lambda: emu.desired_int == values[i]))
+    finally:
+        board.close()
+
+
+def _bench_queue_set(transport, count, warmup):
+    """Komut kuyruğu (PortArbiter) üzerinden ayar: arka planda sorgular sürerken uçtan uca."""
+    board, _, _ = _open_board("ac", transport)
+    service = SerialIOService()
+    port = service.attach(board)
+    values = [10.0 + (i % 400) / 10 for i in range(max(warmup, count))]
+    try:
+        return _measure(lambda i: port.submit_set("desiredTemperature", values[i]).result(DRAIN_TIMEOUT),
+                        count, warmup, cpu=False)
+    finally:
+        service.stop()
+        board.close()
+
+
+def _thread_cpu(thread):
+    """Başka bir thread'in CPU süresi (sn). Platform desteklemiyorsa None."""
+    if not hasattr(time, "pthread_getcpuclockid"):
+        return None
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+    except (OSError, ValueError):
+        return None
+
+
+def _bench_scheduler(transport, boards, duration):
+    """
+    Tek SerialIOService'e 'boards' kadar kart (ac / curtain sırayla) bağlanır ve
+    'duration' saniye sorgulanır. Metrikler: slot kayması (jitter), toplam
+    tur/sn ve olay döngüsü thread'inin tur başına CPU süresi. Ek alanlar: kart
+    başına en az / en çok tur (adillik) ve servisin eklediği thread sayısı.
+    """
+    opened = [_open_board("ac" if i % 2 == 0 else "curtain", transport)[0] for i in range(boards)]
+    threads_before = threading.active_count()
+    service = SerialIOService(SCHED_INTERVAL)
+    try:
+        for board in opened:
+            service.attach(board)
+        cpu_start = _thread_cpu(service._thread)
+        first = service.schedule_stats()["polls"]
+        wall_start = time.perf_counter()
+        time.sleep(duration)
+        stats = service.schedule_stats()
+        wall = time.perf_counter() - wall_start
+        cpu_end = _thread_cpu(service._thread)
+        # Olay döngüsü + (fd'siz portlarda) sınırlı bloklayan G/Ç havuzu
+        threads_added = threading.active_count() - threads_before
+    finally:
+        service.stop()
+        for board in opened:
+            board.close()
+    polls = stats["polls"] - first
+    jitter = stats["jitter"]
+    return {
+        "n": polls,
+        "errors": sum(board.lastPollOk is False for board in opened),
+        "p50_ms": jitter["p50_ms"],
+        "p99_ms": jitter["p99_ms"],
+        "mean_ms": jitter["mean_ms"],
+        "cpu_ms": None if cpu_start is None or not polls else (cpu_end - cpu_start) / polls * 1000,
+        "ops_per_sec": polls / wall,
+        "boards": boards,
+        "min_polls": stats["min_polls"],
+        "max_polls": stats["max_polls"],
+        "threads_added": threads_added,
+    }
+
+
+def _median_result(runs):
+    """Tekrarların metrik bazında medyanı (gürültüyü azaltır)."""
+    out = dict(runs[0])
+    for key in METRICS:
+        values = [run[key] for run in runs if run[key] is not None]
+        out[key] = statistics.median(values) if values else None
+    out["errors"] = sum(run["errors"] for run in runs)
+    out["repeat"] = len(runs)
+    return out
+
+
+def run_suite(transport="pty", count=COUNT, warmup=WARMUP, repeat=REPEAT, seed=SEED,
+              sched_boards=SCHED_BOARDS, sched_duration=SCHED_DURATION):
+    """
+    Tüm ölçümleri çalıştırır. Dönüş: sonuç dosyasına yazılan sözlük.
+    Her tekrarda senaryo aynı tohumla baştan başlar.
+    sched_boards / sched_duration: zamanlayıcı ölçümünün kart sayısı ve süresi.
+    """
+    results = {}
+    boards = {}
+    runs = {}
+    for _ in range(repeat):
+        for kind in ("ac", "curtain"):
+            result, open_ms, board = _bench_poll(kind, transport, count, warmup, random.Random(seed))
+            runs.setdefault(f"{kind}.update", []).append(result)
+            boards.setdefault(kind, {"open_ms": [], "baudRate": board.baudRate,
+                                     "bytePacing": board.bytePacing, "supportsBulk": board.supportsBulk})
+            boards[kind]["open_ms"].append(open_ms)
+        runs.setdefault("ac.setDesiredTemp", []).append(_bench_set_ac(transport, count, warmup))
+        runs.setdefault("curtain.setCurtainStatus", []).append(_bench_set_curtain(transport, count, warmup))
+        runs.setdefault("queue.submit_set", []).append(_bench_queue_set(transport, count, warmup))
+        runs.setdefault("scheduler.poll", []).append(_bench_scheduler(transport, sched_boards, sched_duration))
+    for name, name_runs in runs.items():
+        results[name] = _median_result(name_runs)
+    for info in boards.values():
+        info["open_ms"] = statistics.median(info["open_ms"])
+    return {
+        "version": RESULT_VERSION,
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "transport": transport,
+            "count": count,
+            "warmup": warmup,
+            "repeat": repeat,
+            "seed": seed,
+            "sched_boards": sched_boards,
+            "sched_interval": SCHED_INTERVAL,
+            "boards": boards,
+        },
+        "results": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# --- KARŞILAŞTIRMA ---
+def compare(base, new, threshold=REGRESSION_THRESHOLD):
+    """
+    İki sonucu karşılaştırır. Dönüş: (satırlar, gerilemeler).
+    Satır: (ölçüm, metrik, eski, yeni, değişim oranı, gerileme mi).
+    Değişim oranı 'daha iyi' yöne göre işaretlenir: pozitif = kötüleşme.
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(base["results"]) & set(new["results"])):
+        old_result, new_result = base["results"][name], new["results"][name]
+        for metric, better in METRICS.items():
+            old, cur = old_result.get(metric), new_result.get(metric)
+            if old is None or cur is None or old == 0:
+                continue
+            change = (cur - old) / old
+            worse = change if better == LOWER else -change
+            row = (name, metric, old, cur, worse, worse > threshold)
+            rows.append(row)
+            if row[-1]:
+                regressions.append(row)
+    return rows, regressions
+
+
+def _meta_warnings(base, new):
+    """Karşılaştırmayı anlamsız kılabilecek ortam farkları."""
+    warnings = []
+    for key in ("transport", "count", "sched_boards", "python", "platform", "cpus"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            warnings.append(f"{key}: {base['meta'].get(key)} -> {new['meta'].get(key)}")
+    return warnings
+
+
+def format_results(data):
+    lines = [f"{'ölçüm':<26}{'p50 ms':>9}{'p99 ms':>9}{'işlem/sn':>11}{'cpu ms':>9}{'hata':>6}"]
+    for name, r in data["results"].items():
+        cpu = "-" if r["cpu_ms"] is None else f"{r['cpu_ms']:.3f}"
+        lines.append(f"{name:<26}{r['p50_ms']:>9.3f}{r['p99_ms']:>9.3f}{r['ops_per_sec']:>11.0f}"
+                     f"{cpu:>9}{r['errors']:>6}")
+    sched = data["results"].get("scheduler.poll")
+    if sched:
+        lines.append(f"scheduler.poll: {sched['boards']} kart, p50/p99 = slot kayması, "
+                     f"kart başına tur {sched['min_polls']}-{sched['max_polls']}, "
+                     f"+{sched['threads_added']} thread")
+    return "\n".join(lines)
+
+
+def format_comparison(rows):
+    lines = [f"{'ölçüm':<26}{'metrik':<13}{'önce':>11}{'sonra':>11}{'kötüleşme':>11}"]
+    for name, metric, old, cur, worse, regressed in rows:
+        lines.append(f"{name:<26}{metric:<13}{old:>11.3f}{cur:>11.3f}{worse:>+10.1%}"
+                     + ("  << GERİLEME" if regressed else ""))
+    return "\n".join(lines)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RESULT_VERSION:
+        raise ValueError(f"Desteklenmeyen sonuç dosyası sürümü: {path}")
+    return data
+
+
+def save(data, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NEXUS CONTROL HUB performans ölçümleri")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ölçümleri çalıştır ve JSON dosyasına yaz")
+    run_parser.add_argument("--out", default="benchmark.json", help="Sonuç dosyası")
+    run_parser.add_argument("--transport", choices=TRANSPORTS,
+                            default="pty" if sys.platform.startswith("linux") else "mem",
+                            help="pty: gerçek pyserial yolu (Linux), mem: bellek içi")
+    run_parser.add_argument("--count", type=int, default=COUNT)
+    run_parser.add_argument("--warmup", type=int, default=WARMUP)
+    run_parser.add_argument("--repeat", type=int, default=REPEAT)
+    run_parser.add_argument("--seed", type=int, default=SEED)
+    run_parser.add_argument("--boards", type=int, default=SCHED_BOARDS, help="Zamanlayıcı ölçümündeki kart sayısı")
+    run_parser.add_argument("--duration", type=float, default=SCHED_DURATION,
+                            help="Zamanlayıcı ölçümünün süresi (sn)")
+
+    compare_parser = commands.add_parser("compare", help="İki sonuç dosyasını karşılaştır")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                                help="Gerileme eşiği (oran, örn. 0.10 = %%10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        data = run_suite(args.transport, args.count, args.warmup, args.repeat, args.seed,
+                         args.boards, args.duration)
+        save(data, args.out)
+        print(format_results(data))
+        print(f"Sonuçlar: {args.out}")
+        return 0
+
+    base, new = load(args.base), load(args.new)
+    for warning in _meta_warnings(base, new):
+        print(f"UYARI: ortam farklı ({warning})")
+    rows, regressions = compare(base, new, args.threshold)
+    print(format_comparison(rows))
+    if regressions:
+        print(f"{len(regressions)} metrikte %{args.threshold * 100:g}'dan fazla gerileme")
+        return 1
+    print("Gerileme yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
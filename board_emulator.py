@@ -0,0 +1,262 @@
+import random
+import threading
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PIC KART EMÜLATÖRÜ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: PICSimLab ve sanal COM port sürücüsü olmadan API katmanını
+#           çalıştırabilmek için Board #1 ve Board #2'nin Python taklidi.
+#           Board #1, Board1_Klima.asm içindeki ISR'ın komut işleyişini
+#           birebir uygular. Cevap gecikmesi ve byte kaybı ayarlanabilir.
+# ==============================================================================
+
+from automation_api import (
+    CMD_AC_GET_DESIRED_TEMP_FRAC, CMD_AC_GET_DESIRED_TEMP_INT,
+    CMD_AC_GET_AMBIENT_TEMP_FRAC, CMD_AC_GET_AMBIENT_TEMP_INT,
+    CMD_AC_GET_FAN_SPEED, CMD_AC_GET_ALL, CMD_AC_GET_BAUDS, CMD_AC_SET_BAUD,
+    BAUD_DEFAULT, BAUD_RATES, MASK_BAUD_INDEX, MASK_SET_BAUD_HEADER,
+    CMD_CUR_GET_DESIRED_FRAC, CMD_CUR_GET_DESIRED_INT,
+    CMD_CUR_GET_OUTDOOR_TEMP_FRAC, CMD_CUR_GET_OUTDOOR_TEMP_INT,
+    CMD_CUR_GET_PRESSURE_FRAC, CMD_CUR_GET_PRESSURE_INT,
+    CMD_CUR_GET_LIGHT_FRAC, CMD_CUR_GET_LIGHT_INT,
+    MASK_SET_FRAC_HEADER, MASK_SET_INT_HEADER, MASK_DATA_6BIT,
+    encode_frame,
+)
+
+MASK_HEADER = 0xC0  # 11000000 (ISR'daki "ANDLW 0xC0" ile aynı)
+
+
+class BoardEmulator:
+    """
+    Emülatörlerin ortak temel sınıfı.
+    Gelen her byte'ı, PIC'teki RX kesmesi gibi TEK TEK işler ve
+    gönderilecek cevap byte'larını döner.
+
+    latency          : Her cevap byte'ı için gecikme (saniye). Taşıma katmanı uygular.
+    drop_rate        : Cevap byte'ının kaybolma olasılığı (0.0 - 1.0).
+    seed             : Byte kaybını tekrarlanabilir yapmak için rastgele tohum.
+    overrun_interval : İki byte arasında ISR'ın ihtiyaç duyduğu en kısa süre (saniye).
+                       Daha sık gelen byte, UART taşması (OERR) gibi kaybolur. 0: kapalı.
+    baudrate         : Kartın UART hızı. Byte süresi (10 bit / baud) buna göre hesaplanır;
+                       farklı hızda gelen byte çerçeve hatası (FERR) ile kaybolur.
+    """
+    def __init__(self, latency=0.0, drop_rate=0.0, seed=None, overrun_interval=0.0, baudrate=BAUD_DEFAULT):
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.overrun_interval = overrun_interval
+        self.baudrate = baudrate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()  # pty sunucu thread'i ile test kodu aynı anda erişebilir
+        self._last_rx_time = None
+
+        # İstatistikler
+        self.rx_count = 0
+        self.tx_count = 0
+        self.dropped_count = 0
+        self.overrun_count = 0
+        self.framing_error_count = 0
+
+    @property
+    def byte_time(self):
+        """Bir byte'ın hatta geçirdiği süre (1 start + 8 veri + 1 stop biti)."""
+        return 10.0 / self.baudrate
+
+    def handle_byte(self, rx, now=None, baudrate=None):
+        """
+        Tek bir byte'ı işler. Cevap yoksa (veya kaybolduysa) b"" döner.
+        now: byte'ın karta ulaştığı an (time.monotonic). Taşma kontrolü için kullanılır.
+        baudrate: byte'ın gönderildiği hız (PC ucu). Kartınkinden farklıysa byte kaybolur.
+        """
+        with self._lock:
+            if baudrate is not None and baudrate != self.baudrate:
+                self.framing_error_count += 1
+                self._on_framing_error()
+                return b""
+            if self.overrun_interval and now is not None:
+                if self._last_rx_time is not None and now - self._last_rx_time < self.overrun_interval:
+                    self.overrun_count += 1
+                    return b""  # ISR önceki byte ile meşgulken gelen byte kayboldu
+                self._last_rx_time = now
+            self.rx_count += 1
+            reply = self._isr(rx & 0xFF)
+        if reply is None:
+            return b""
+        if isinstance(reply, int):
+            reply = bytes([reply & 0xFF])
+        # Kayıp her cevap byte'ı için ayrı ayrı uygulanır (çok byte'lı çerçevelerde de)
+        out = bytearray()
+        for b in reply:
+            if self.drop_rate and self._rng.random() < self.drop_rate:
+                self.dropped_count += 1
+                continue
+            out.append(b)
+        self.tx_count += len(out)
+        return bytes(out)
+
+    def feed(self, data, now=None):
+        """
+        Birden fazla byte'ı sırayla işler, tüm cevapları birleştirip döner.
+        now verilirse byte'lar hat hızında (byte_time aralıkla) ulaşmış sayılır.
+        """
+        if now is None:
+            return b"".join(self.handle_byte(b) for b in data)
+        return b"".join(self.handle_byte(b, now + i * self.byte_time) for i, b in enumerate(data))
+
+    def _isr(self, rx):
+        """Alt sınıflar doldurur: cevap byte'ı (int), byte dizisi (bytes) veya None döner."""
+        raise NotImplementedError
+
+    def _on_framing_error(self):
+        """Çerçeve hatasında firmware'in tepkisi. Varsayılan: byte sessizce kaybolur."""
+
+
+class AirConditionerBoardEmulator(BoardEmulator):
+    """
+    BOARD #1 (Klima) emülatörü.
+    Komut kontrol sırası Board1_Klima.asm ISR_HANDLER ile aynıdır:
+    önce sorgu komutları (0x04, 0x03, 0x02, 0x01, 0x05), sonra
+    11xxxxxx (tam sayı ayarla) ve 10xxxxxx (ondalık ayarla) başlıkları.
+    Tanınmayan byte'lar sessizce yok sayılır (GOTO ISR_EXIT).
+
+    bulk: True ise yeni firmware gibi 0x06 (CMD_AC_GET_ALL) komutuna SEND_ALL
+          çerçevesiyle cevap verir; False ise eski firmware gibi yok sayar.
+    bauds: Hız pazarlığında bildirilen hızlar (BAUD_RATES alt kümesi).
+           Boş ise eski firmware gibi 0x07 ve 00010iii komutlarını yok sayar.
+    """
+    def __init__(self, bulk=True, bauds=BAUD_RATES, **kwargs):
+        super().__init__(**kwargs)
+        self.bulk = bulk
+        self.bauds = tuple(bauds)
+        self.baud_switches = 0
+        # SETUP içindeki başlangıç değerleri
+        self.desired_temp_int = 25
+        self.desired_temp_dec = 0
+        self.ambient_temp_int = 22
+        self.ambient_temp_dec = 5
+        self.fan_speed_rps = 15
+
+        # PORTD çıkışları (CONTROL_SYS)
+        self.heater_on = False
+        self.cooler_on = False
+
+    def _isr(self, rx):
+        if rx == CMD_AC_GET_AMBIENT_TEMP_INT:
+            return self.ambient_temp_int
+        if rx == CMD_AC_GET_AMBIENT_TEMP_FRAC:
+            return self.ambient_temp_dec
+        if rx == CMD_AC_GET_DESIRED_TEMP_INT:
+            return self.desired_temp_int
+        if rx == CMD_AC_GET_DESIRED_TEMP_FRAC:
+            return self.desired_temp_dec
+        if rx == CMD_AC_GET_FAN_SPEED:
+            return self.fan_speed_rps
+        if rx == CMD_AC_GET_ALL and self.bulk:
+            # SEND_ALL: sıra AC_POLL_SEQUENCE ile aynı
+            return encode_frame([self.ambient_temp_int, self.ambient_temp_dec,
+                                 self.desired_temp_int, self.desired_temp_dec,
+                                 self.fan_speed_rps])
+        if self.bauds:
+            if rx == CMD_AC_GET_BAUDS:
+                # SEND_BAUDS: bit i -> BAUD_RATES[i]
+                return sum(1 << i for i, rate in enumerate(BAUD_RATES) if rate in self.bauds)
+            if rx & MASK_SET_BAUD_HEADER == CMD_AC_SET_BAUD:
+                return self._set_baud(rx)
+
+        if rx & MASK_HEADER == MASK_SET_INT_HEADER:
+            self.desired_temp_int = rx & MASK_DATA_6BIT
+        elif rx & MASK_HEADER == MASK_SET_FRAC_HEADER:
+            self.desired_temp_dec = rx & MASK_DATA_6BIT
+        return None
+
+    def _set_baud(self, rx):
+        """
+        SET_BAUD: komut byte'ı ESKİ hızda onay olarak geri gönderilir, sonra SPBRG
+        değişir. (Cevap byte'ı bu çağrıdan önce hatta çıkmış sayılır.)
+        """
+        index = rx & MASK_BAUD_INDEX
+        if index >= len(BAUD_RATES) or BAUD_RATES[index] not in self.bauds:
+            return None  # Desteklenmeyen hız: firmware ISR_EXIT ile yok sayar
+        self.baudrate = BAUD_RATES[index]
+        self.baud_switches += 1
+        return rx
+
+    def _on_framing_error(self):
+        # ISR başındaki FERR kontrolü: hat uyuşmuyor, varsayılan hıza dön
+        if self.bauds:
+            self.baudrate = BAUD_DEFAULT
+
+    def read_sensor(self, adc_value):
+        """
+        READ_SENSOR rutininin karşılığı: ADRESH değerini ortam sıcaklığına yazar.
+        Firmware'deki gibi 0 okunursa 1'e çekilir (INCF).
+        """
+        with self._lock:
+            self.ambient_temp_int = (adc_value & 0xFF) or 1
+
+    def control_sys(self):
+        """CONTROL_SYS rutininin karşılığı: Isıtıcı/Soğutucu çıkışlarını ayarlar."""
+        with self._lock:
+            # SUBWF: DESIRED - AMBIENT, borç yoksa (C=1) ısıt
+            heat = self.desired_temp_int >= self.ambient_temp_int
+            self.heater_on = heat
+            self.cooler_on = not heat
+
+    def step(self, adc_value=None):
+        """Ana döngünün (LOOP) bir turu: sensör oku + klimayı kontrol et."""
+        if adc_value is not None:
+            self.read_sensor(adc_value)
+        self.control_sys()
+
+
+class CurtainBoardEmulator(BoardEmulator):
+    """
+    BOARD #2 (Perde ve Sensörler) emülatörü.
+    CMD_CUR_* sorgu komutlarına ilgili register ile cevap verir;
+    ayarlama başlıkları (11xxxxxx / 10xxxxxx) perde hedefini yazar.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.desired_frac = 0
+        self.desired_int = 0
+        self.outdoor_temp_frac = 0
+        self.outdoor_temp_int = 18
+        self.pressure_frac = 3
+        self.pressure_int = 101
+        self.light_frac = 0
+        self.light_int = 45
+
+    def _isr(self, rx):
+        registers = {
+            CMD_CUR_GET_DESIRED_FRAC: self.desired_frac,
+            CMD_CUR_GET_DESIRED_INT: self.desired_int,
+            CMD_CUR_GET_OUTDOOR_TEMP_FRAC: self.outdoor_temp_frac,
+            CMD_CUR_GET_OUTDOOR_TEMP_INT: self.outdoor_temp_int,
+            CMD_CUR_GET_PRESSURE_FRAC: self.pressure_frac,
+            CMD_CUR_GET_PRESSURE_INT: self.pressure_int,
+            CMD_CUR_GET_LIGHT_FRAC: self.light_frac,
+            CMD_CUR_GET_LIGHT_INT: self.light_int,
+        }
+        if rx in registers:
+            return registers[rx]
+
+        if rx & MASK_HEADER == MASK_SET_INT_HEADER:
+            self.desired_int = rx & MASK_DATA_6BIT
+        elif rx & MASK_HEADER == MASK_SET_FRAC_HEADER:
+            self.desired_frac = rx & MASK_DATA_6BIT
+        return None
+
+
+# Port adı şemalarında (mem://ac, pty://curtain) kullanılan isimler
+EMULATORS = {
+    "ac": AirConditionerBoardEmulator,
+    "curtain": CurtainBoardEmulator,
+}
+
+
+def create_emulator(kind, **kwargs):
+    """İsme göre ('ac' / 'curtain') yeni bir emülatör oluşturur."""
+    try:
+        return EMULATORS[kind](**kwargs)
+    except KeyError:
+        raise ValueError(f"Bilinmeyen kart tipi: {kind}")
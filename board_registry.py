@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KART KAYDI (REGISTRY)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Hub'a bağlı kartların bildirimsel listesi. Her kart için tip
+#           (ac / curtain), port, hız ve sorgu aralığı config.BOARDS içinde
+#           yazılır; liste boşsa eski iki sabit (AC_BOARD_PORT,
+#           CURTAIN_BOARD_PORT) kullanılır. Servis çekirdeği (hub_service),
+#           ayrı G/Ç süreci (io_worker) ve arayüz kartları buradan oluşturur.
+#           Portlar paralel ve süre sınırıyla açılır: asılı kalan bir sürücü
+#           diğer kartların bağlanmasını bekletmez.
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection, BAUD_RATES
+from async_api import POLL_INTERVAL
+import config as cfg
+
+log = logging.getLogger("HomeAutomation.registry")
+
+# Tip adı -> kart sınıfı (config.BOARDS içindeki "type")
+BOARD_TYPES = {
+    "ac": AirConditionerSystemConnection,
+    "curtain": CurtainControlSystemConnection,
+}
+ENTRY_KEYS = {"name", "type", "port", "baud", "poll_interval"}
+OPEN_TIMEOUT = 5.0  # Bir portun açılması (hız pazarlığı dahil) için en fazla bekleme (sn)
+
+
+class BoardSpec(namedtuple("BoardSpec", "name kind port baud poll_interval")):
+    """
+    Tek bir kartın tanımı (değişmez; süreçler arası gönderilebilir).
+    name          : Benzersiz ad (HTTP API ve loglarda kullanılır, örn. "salon-klima")
+    kind          : BOARD_TYPES anahtarı
+    port / baud   : Port adı ("COM1", "/dev/ttyUSB0", "mem://ac") ve en yüksek hız
+    poll_interval : Sorgu aralığı (sn)
+    """
+    __slots__ = ()
+
+    @property
+    def board_class(self):
+        return BOARD_TYPES[self.kind]
+
+    def create(self, transport=None):
+        """Kart nesnesini oluşturur (port henüz açılmaz)."""
+        return self.board_class(com_port=self.port, baud_rate=self.baud, transport=transport)
+
+
+_opening = set()  # Açılışı süren kartlar (zaman aşımına uğrayıp arkada devam edenler dahil)
+_opening_lock = threading.Lock()
+
+
+def open_boards(boards, timeout=None):
+    """
+    Kartların portlarını paralel açar (hız pazarlığı, byte aralığı ölçümü ve
+    toplu okuma yoklaması kartlar arasında beklemez).
+    boards  : kart adı -> kart nesnesi
+    timeout : Tüm açılışlar için ortak süre sınırı (None: OPEN_TIMEOUT)
+    Dönüş: kart adı -> açıldı mı (aynı sırayla). Süresinde bitmeyen açılış
+    başarısız sayılır; thread'i arkada biter ve port açılmışsa kapatılır.
+    Önceki çağrıdan kalan açılışı hâlâ süren kart (örn. bağlan tekrar
+    basıldı) ikinci kez açılmaz, başarısız sayılır.
+    """
+    if not boards:
+        return {}
+    deadline = time.monotonic() + (OPEN_TIMEOUT if timeout is None else timeout)
+    results = {}
+    lock = threading.Lock()
+    abandoned = set()
+
+    def open_one(name, board):
+        try:
+            ok = board.open()
+        except Exception:
+            log.debug("Port açılamadı (%s)", name, exc_info=True)
+            ok = False
+        with lock:
+            results[name] = ok
+            late = name in abandoned
+        if late and ok:
+            board.close()  # Çağıran artık beklemiyor: port açık kalmasın
+        with _opening_lock:
+            _opening.discard(board)
+
+    threads = []
+    with _opening_lock:
+        for name, board in boards.items():
+            if board in _opening:
+                log.warning("Port açılışı hâlâ sürüyor, atlandı (%s)", name)
+                results[name] = False
+                continue
+            _opening.add(board)
+            threads.append(threading.Thread(target=open_one, args=(name, board), name=f"BoardOpen-{name}",
+                                            daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    with lock:
+        for name in boards:
+            if name not in results:
+                abandoned.add(name)
+                log.warning("Port açılışı zaman aşımına uğradı (%s)", name)
+        return {name: bool(results.get(name)) and name not in abandoned for name in boards}
+
+
+def legacy_entries():
+    """config.BOARDS boşken kullanılan eski iki kartlı düzen."""
+    return [
+        {"name": "ac", "type": "ac", "port": cfg.AC_BOARD_PORT, "baud": cfg.AC_BOARD_BAUD},
+        {"name": "curtain", "type": "curtain", "port": cfg.CURTAIN_BOARD_PORT, "baud": cfg.CURTAIN_BOARD_BAUD},
+    ]
+
+
+def load_registry(entries=None):
+    """
+    Kart tanımlarını doğrular ve BoardSpec listesi döner (sıra korunur).
+    entries: sözlük listesi (None: config.BOARDS, o da boşsa eski iki kart).
+    Hatalı tanımda (bilinmeyen tip / anahtar, tekrarlanan ad, geçersiz hız
+    veya aralık) ValueError verir; yanlış yazılmış bir kart sessizce atlanmaz.
+    """
+    if entries is None:
+        entries = getattr(cfg, "BOARDS", None) or legacy_entries()
+    specs = []
+    names = set()
+    for i, entry in enumerate(entries):
+        unknown = set(entry) - ENTRY_KEYS
+        if unknown:
+            raise ValueError(f"Kart #{i + 1}: bilinmeyen anahtar(lar): {', '.join(sorted(unknown))}")
+        kind = entry.get("type")
+        if kind not in BOARD_TYPES:
+            raise ValueError(f"Kart #{i + 1}: bilinmeyen tip {kind!r} (seçenekler: {', '.join(BOARD_TYPES)})")
+        name = entry.get("name") or kind
+        if name in names:
+            raise ValueError(f"Kart adı tekrarlanıyor: {name}")
+        if not entry.get("port"):
+            raise ValueError(f"Kart {name}: port yazılmamış")
+        baud = entry.get("baud", BAUD_RATES[0])
+        if baud not in BAUD_RATES:
+            raise ValueError(f"Kart {name}: desteklenmeyen hız {baud} (seçenekler: {BAUD_RATES})")
+        interval = float(entry.get("poll_interval", POLL_INTERVAL))
+        if interval <= 0:
+            raise ValueError(f"Kart {name}: sorgu aralığı pozitif olmalı")
+        names.add(name)
+        specs.append(BoardSpec(name, kind, entry["port"], baud, interval))
+    return specs
@@ -0,0 +1,454 @@
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import math
+import random
+import threading
+import time
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SERİ PORT HAKEMİ (KOMUT KUYRUĞU)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Bir seri porta erişen TEK yer burasıdır. Her port için bir işçi
+#           (asyncio görevi) öncelikli bir kuyruk işletir:
+#             - Ayar (SET) komutları önce gider,
+#             - Sorgular (poll) boş zamanı doldurur.
+#           Arayüz gibi başka thread'lerden gelen her istek bir Future alır.
+#           Tüm portların işçileri tek bir olay döngüsü thread'inde çalışır;
+#           sorgu zamanlarını ortak bir zamanlayıcı (PollScheduler) dağıtır.
+#           Kart sayısı artınca thread sayısı artmaz.
+#           Art arda cevapsız kalan kartın hattı kopmuş sayılır; işçi portu
+#           titreşimli üstel beklemeyle yeniden açmayı dener (gözetmen).
+# ==============================================================================
+
+from async_api import AsyncHomeAutomationSystemConnection, POLL_INTERVAL
+from board_registry import OPEN_TIMEOUT
+from link_stats import LatencyHistogram
+
+log = logging.getLogger("HomeAutomation.io")
+
+# Kuyruk öncelikleri (küçük sayı = önce)
+PRIORITY_SET = 0
+PRIORITY_POLL = 10
+
+# Dosya tanımlayıcısı olmayan portların (Windows'ta pyserial, MemoryTransport)
+# bloklayan okumaları bu kadar thread'lik ORTAK havuzda yapılır.
+BLOCKING_IO_WORKERS = 4
+
+# --- HAT GÖZETMENİ (YENİDEN BAĞLANMA) ---
+DEAD_AFTER_FAILURES = 3   # Art arda bu kadar cevapsız / hatalı tur: hat kopmuş sayılır
+RECONNECT_BASE = 0.5      # İlk yeniden deneme beklemesinin üst sınırı (sn)
+RECONNECT_MAX = 30.0      # Bekleme en fazla bu kadar büyür (sn)
+
+# Hat durumları (bkz. PortArbiter.link_status)
+LINK_ONLINE = "online"              # Kart cevap veriyor
+LINK_DOWN = "down"                  # Hat kopuk, sonraki denemeyi bekliyor
+LINK_RECONNECTING = "reconnecting"  # Port yeniden açıldı / açılıyor, kart henüz cevap vermedi
+LINK_OFFLINE = "offline"            # Port hiç açılamadı (hakeme bağlı değil)
+
+
+def backoff_delay(attempt, rng=random, base=None, cap=None):
+    """
+    'attempt'. yeniden denemeden önceki bekleme (sn): tavan = min(cap, base * 2^attempt),
+    sonuç [tavan / 2, tavan] aralığında rastgele. Aynı anda kopan kartlar
+    (örn. ortak USB hub) denemelerini aynı ana yığmaz.
+    """
+    base = RECONNECT_BASE if base is None else base
+    cap = RECONNECT_MAX if cap is None else cap
+    ceiling = min(cap, base * 2 ** min(attempt, 32))
+    return ceiling / 2 + rng.random() * ceiling / 2
+
+
+class SetpointCoalescer:
+    """
+    Ayar komutlarını alan (field) bazında birleştirir ("en son gelen kazanır").
+    - Kuyrukta bekleyen bir ayar varsa yeni değer onun yerine geçer (yeni yazma yok).
+    - Gönderilecek byte'lar karta en son onaylanan byte'larla aynıysa yazma atlanır.
+    Kaydedilen yazma sayısı stats() ile raporlanır.
+    Birden fazla thread'den çağrılabilir.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # alan -> [en yeni değer, ortak Future]
+        self._acked = {}    # alan -> karta en son başarıyla yazılan byte'lar
+        self.submitted = 0  # Gelen toplam ayar isteği
+        self.written = 0    # Hatta gerçekten yazılan ayar
+        self.coalesced = 0  # Bekleyen ayarın üzerine yazıldığı için kaydedilen
+        self.noops = 0      # Kartta zaten aynı değer olduğu için atlanan
+
+    def offer(self, field, value, future):
+        """
+        Yeni değeri kaydeder. Alan için bekleyen bir ayar varsa değerini günceller
+        ve onun Future'ını döner. Yoksa 'future'ı bekleyen ayar olarak kaydeder
+        ve None döner (çağıran yeni bir işi kuyruğa eklemelidir).
+        """
+        with self._lock:
+            self.submitted += 1
+            entry = self._pending.get(field)
+            if entry is not None:
+                entry[0] = value
+                self.coalesced += 1
+                return entry[1]
+            self._pending[field] = [value, future]
+            return None
+
+    def take(self, field):
+        """İşçi yazmaya başlarken çağırır: alanın en yeni değerini alır ve bekleyeni temizler."""
+        with self._lock:
+            return self._pending.pop(field)[0]
+
+    def is_noop(self, field, commands, board_commands):
+        """
+        Gönderilecek byte'lar hem son onaylanan hem de kartın bilinen değerinin
+        byte'larıyla aynıysa yazma gereksizdir (kart başka yerden değişmemiş).
+        """
+        with self._lock:
+            acked = self._acked.get(field)
+            if acked is not None and acked == commands == board_commands:
+                self.noops += 1
+                return True
+            return False
+
+    def abandon(self, future):
+        """Yazılmadan iptal edilen ayarın bekleyen kaydını siler (sonraki ayar yeni iş açar)."""
+        with self._lock:
+            for field, entry in list(self._pending.items()):
+                if entry[1] is future:
+                    del self._pending[field]
+
+    def ack(self, field, commands):
+        with self._lock:
+            self._acked[field] = commands
+            self.written += 1
+
+    def stats(self):
+        """Sayaçların anlık kopyası. 'saved': hiç yazılmadan karşılanan istek sayısı."""
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "written": self.written,
+                "coalesced": self.coalesced,
+                "noops": self.noops,
+                "saved": self.coalesced + self.noops,
+            }
+
+
+class PollScheduler:
+    """
+    Tüm kartların sorgu turlarını ortak bir zaman ızgarasına yerleştirir.
+    - Aynı aralıktaki kartlar aralık içine eşit kaydırılır (faz): 50 kart 0.5 sn
+      aralıkla 10 ms arayla sorgulanır, hepsi aynı anda değil.
+    - Slotlar ızgaraya bağlıdır; tur süresi sonraki turu kaydırmaz (kayma yok).
+    - Geciken kart kaçırdığı slotları art arda turlarla telafi etmez: her kart
+      her aralıkta en fazla bir tur alır (adil paylaşım).
+    Slot ile turun gerçek başlangıcı arasındaki fark (jitter) kart başına ölçülür.
+    Sadece olay döngüsü thread'inde kullanılır.
+    """
+    def __init__(self):
+        self.epoch = None
+        self._groups = {}  # Sorgu aralığı -> o aralıktaki hakemler
+
+    def add(self, arbiter, now):
+        """Hakemi ızgaraya ekler; aynı aralıktaki tüm hakemlerin fazları yeniden dağıtılır."""
+        if self.epoch is None:
+            self.epoch = now
+        group = self._groups.setdefault(arbiter.poll_interval, [])
+        group.append(arbiter)
+        self._spread(group)
+
+    def remove(self, arbiter):
+        group = self._groups.get(arbiter.poll_interval, [])
+        if arbiter in group:
+            group.remove(arbiter)
+            self._spread(group)
+
+    @staticmethod
+    def _spread(group):
+        for i, arbiter in enumerate(group):
+            arbiter.poll_phase = i * arbiter.poll_interval / len(group)
+
+    def next_slot(self, arbiter, now):
+        """'now' anından sonraki ilk slot (loop.time cinsinden)."""
+        interval = arbiter.poll_interval
+        base = self.epoch + arbiter.poll_phase
+        return base + (math.floor((now - base) / interval) + 1) * interval
+
+    @property
+    def arbiters(self):
+        return [a for group in self._groups.values() for a in group]
+
+    def stats(self):
+        """Kart sayısı, toplam tur ve tüm kartların birleşik jitter histogramı."""
+        jitter = LatencyHistogram()
+        arbiters = self.arbiters
+        for arbiter in arbiters:
+            jitter.merge(arbiter.poll_jitter)
+        polls = [a.polls for a in arbiters]
+        return {
+            "boards": len(arbiters),
+            "polls": sum(polls),
+            "min_polls": min(polls, default=0),
+            "max_polls": max(polls, default=0),
+            "jitter": jitter.snapshot(),
+        }
+
+
+class PortArbiter:
+    """
+    Tek bir kartın portuna tüm erişimi sıralayan işçi.
+    İstekler asla araya girmez: bir sorgu ya da ayar bitmeden diğeri başlamaz.
+    Sorgu zamanını 'scheduler' belirler (verilmezse kendine ait bir tane).
+    Art arda DEAD_AFTER_FAILURES tur hiç cevap gelmezse (veya tur hata verirse)
+    port kapatılıp backoff_delay aralıklarıyla yeniden açılır. Hat kopukken
+    gelen istekler beklemeden ConnectionError ile biter.
+    """
+    def __init__(self, driver, poll_interval=POLL_INTERVAL, scheduler=None):
+        self.driver = driver
+        self.board = driver.board
+        self.poll_interval = poll_interval
+        self.scheduler = scheduler or PollScheduler()
+        self.poll_phase = 0.0
+        self.polls = 0
+        self.poll_jitter = LatencyHistogram()  # Slot -> gerçek başlangıç gecikmesi
+        self.link = LINK_ONLINE
+        self.failures = 0      # Art arda cevapsız tur
+        self.reconnects = 0    # Başarılı yeniden bağlanma sayısı
+        self._attempt = 0      # Yeniden deneme sayısı (kart cevap verince sıfırlanır)
+        self.rng = random.Random()
+        self._retry_at = None  # Sonraki deneme anı (time.monotonic), beklemiyorsa None
+        self._reopening = None  # Süren port açma işi (zaman aşımına uğrasa da biter)
+        self.loop = None
+        self._queue = None
+        self._seq = itertools.count()  # Aynı öncelikte FIFO sırası
+        self._task = None
+        self.coalescer = SetpointCoalescer()
+
+    def _start(self, loop):
+        """Olay döngüsü thread'inde çağrılır (bkz. SerialIOService.attach)."""
+        self.loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self.scheduler.add(self, loop.time())
+        self._task = loop.create_task(self._run())
+
+    def submit(self, job, priority=PRIORITY_SET):
+        """
+        Herhangi bir thread'den iş ekler. 'job' bağlantı nesnesini alan bir
+        coroutine fonksiyonudur. Sonuç concurrent.futures.Future olarak döner.
+        """
+        return self._enqueue(job, priority, concurrent.futures.Future())
+
+    def _enqueue(self, job, priority, future):
+        item = (priority, next(self._seq), job, future)
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        return future
+
+    def submit_set(self, field, value):
+        """
+        Ayar komutunu (örn. "desiredTemperature", 25.5) en yüksek öncelikle sıraya koyar.
+        Aynı alan için henüz yazılmamış bir ayar varsa sadece değeri güncellenir
+        ve onun Future'ı döner (bkz. SetpointCoalescer).
+        """
+        future = concurrent.futures.Future()
+        pending = self.coalescer.offer(field, value, future)
+        if pending is not None:
+            return pending
+        return self._enqueue(lambda driver: self._write_setpoint(driver, field), PRIORITY_SET, future)
+
+    async def _write_setpoint(self, driver, field):
+        """Alanın EN YENİ değerini yazar; kartta zaten aynıysa hiç yazmaz."""
+        value = self.coalescer.take(field)
+        board = driver.board
+        commands = board._encode_setpoint(field, value)
+        if self.coalescer.is_noop(field, commands, board._encode_setpoint(field, getattr(board, field))):
+            return
+        await driver.set(field, value)
+        self.coalescer.ack(field, commands)
+
+    def request_poll(self):
+        """Zamanını beklemeden bir sorgu turu ister (sonucu: tüm alanlar geldi mi)."""
+        return self.submit(lambda driver: driver.update(), PRIORITY_POLL)
+
+    def link_status(self):
+        """Hat durumu (herhangi bir thread'den okunabilir, JSON'a çevrilebilir)."""
+        retry_at = self._retry_at
+        return {
+            "state": self.link,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+            "retry_in": None if retry_at is None else max(0.0, retry_at - time.monotonic()),
+        }
+
+    async def _run(self):
+        try:
+            await self._serve()
+        finally:
+            self.scheduler.remove(self)
+
+    async def _serve(self):
+        # İlk tur hemen: açılıştan ilk ölçüme kadar slot beklenmez. Sonrakiler ızgarada.
+        next_poll = self.loop.time()
+        while True:
+            timeout = max(0.0, next_poll - self.loop.time())
+            try:
+                _, _, job, future = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                # Bekleyen komut yok ve sorgu zamanı geldi: boş zamanı sorgu doldurur
+                self.poll_jitter.add(max(0.0, self.loop.time() - next_poll))
+                self.polls += 1
+                try:
+                    await self.driver.update()
+                    dead = self.board.lastPollSilent
+                except Exception:
+                    # Tek bir hatalı tur işçiyi durdurmasın
+                    log.debug("Sorgu turu hatası (%s)", self.driver.board.comPort, exc_info=True)
+                    dead = True
+                if not dead:
+                    self.failures = 0
+                    self._attempt = 0
+                    if self.link != LINK_ONLINE:
+                        # Port açılması yetmez: hat, kart ilk cevabı verince kurulmuş sayılır
+                        self.link = LINK_ONLINE
+                        self.reconnects += 1
+                        log.info("%s: hat yeniden kuruldu", self.board.comPort)
+                else:
+                    self.failures += 1
+                    if self.failures >= DEAD_AFTER_FAILURES:
+                        await self._reconnect()
+                next_poll = self.scheduler.next_slot(self, self.loop.time())
+                continue
+
+            if not future.set_running_or_notify_cancel():
+                # Çağıran vazgeçti. Bekleyen ayar kaydı da silinir; yoksa alanın
+                # sonraki ayarları bu ölü Future'a birleşir ve karta hiç gitmez.
+                self.coalescer.abandon(future)
+                continue
+            try:
+                future.set_result(await job(self.driver))
+            except Exception as e:
+                future.set_exception(e)
+
+    async def _reconnect(self):
+        """
+        Hat gözetmeni: port yeniden açılana kadar bekle / dene döngüsü. Port
+        açılınca hat LINK_RECONNECTING kalır; kart cevap verene kadar (bkz.
+        _serve) deneme sayısı sıfırlanmaz, cevapsız kart giderek seyrek denenir.
+        """
+        port = self.board.comPort
+        log.warning("%s: %d turdur cevap yok, hat yeniden kuruluyor", port, self.failures)
+        while True:
+            self.link = LINK_DOWN
+            delay = backoff_delay(self._attempt, self.rng)
+            self._attempt += 1
+            self._retry_at = time.monotonic() + delay
+            await self._reject_until(self.loop.time() + delay)
+            self._retry_at = None
+            self.link = LINK_RECONNECTING
+            if await self._reopen():
+                break
+            log.info("%s: port açılamadı (%d. deneme)", port, self._attempt)
+        self.failures = 0
+
+    async def _reject_until(self, deadline):
+        """'deadline'a kadar gelen istekleri ConnectionError ile bitirir."""
+        while True:
+            timeout = deadline - self.loop.time()
+            if timeout <= 0:
+                return
+            try:
+                _, _, _, future = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return
+            self.coalescer.abandon(future)
+            if future.set_running_or_notify_cancel():
+                future.set_exception(ConnectionError(f"{self.board.comPort}: hat kopuk, yeniden bağlanılıyor"))
+
+    async def _reopen(self):
+        """
+        Portu kapatıp açar (bloklayan açılış ortak G/Ç havuzunda). En fazla
+        OPEN_TIMEOUT beklenir; asılı kalan açılış bitmeden yenisi başlatılmaz.
+        """
+        if self._reopening is not None and not self._reopening.done():
+            return False
+
+        def reopen():
+            try:
+                self.board.close()
+            except Exception:
+                pass  # Cihaz çekilmiş olabilir
+            return self.board.open()
+
+        self._reopening = self.loop.run_in_executor(None, reopen)
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._reopening), OPEN_TIMEOUT)
+        except asyncio.TimeoutError:
+            return False
+
+
+class SerialIOService:
+    """
+    Tüm port işçilerini barındıran tek arka plan thread'i ve olay döngüsü.
+    Kart sayısı artsa da thread sayısı artmaz: fd'li portlar döngüde,
+    fd'siz portlar BLOCKING_IO_WORKERS thread'lik ortak havuzda okunur.
+    poll_interval: aralığı verilmeyen kartların sorgu aralığı (sn).
+    """
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+            max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="SerialIOBlocking"))
+        self.scheduler = PollScheduler()
+        self.arbiters = []
+        self._thread = threading.Thread(target=self._run_loop, name="SerialIOService", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def attach(self, board, poll_interval=None):
+        """
+        Açılmış bir kart nesnesini hakeme bağlar ve işçisini başlatır.
+        Bundan sonra o porta sadece dönen PortArbiter üzerinden erişilmelidir.
+        poll_interval: bu kartın sorgu aralığı (None: servisin aralığı).
+        """
+        if not self._thread.is_alive():
+            self.start()
+        arbiter = PortArbiter(AsyncHomeAutomationSystemConnection(board), poll_interval or self.poll_interval,
+                              self.scheduler)
+        ready = threading.Event()
+
+        def start():
+            arbiter._start(self.loop)
+            ready.set()
+
+        self.loop.call_soon_threadsafe(start)
+        ready.wait()
+        self.arbiters.append(arbiter)
+        return arbiter
+
+    def schedule_stats(self):
+        """Zamanlayıcı özeti (bkz. PollScheduler.stats). Olay döngüsü thread'inde toplanır."""
+        if not self._thread.is_alive():
+            return self.scheduler.stats()
+        return asyncio.run_coroutine_threadsafe(self._stats(), self.loop).result(timeout=2)
+
+    async def _stats(self):
+        return self.scheduler.stats()
+
+    def stop(self):
+        """İşçileri durdurur ve olay döngüsü thread'inin bitmesini bekler."""
+        async def shutdown():
+            tasks = [a._task for a in self.arbiters if a._task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._thread.is_alive():
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=2)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
+            self.loop.close()
@@ -18,6 +18,10 @@
 # Python Yazılımı -> COM1 Portunu dinler.
 # PICSimLab       -> COM2 Portunu kullanmalıdır.
 AC_BOARD_PORT = "COM1"
+# İzin verilen en yüksek hız. Bağlantı 9600 ile açılır, kartla pazarlık yapılarak
+# ortak en yüksek hıza (9600 / 19200 / 38400 / 57600 / 115200) geçilir.
+# Eski firmware veya sorun çıkaran sanal port için 9600 yazmak yeterlidir.
+AC_BOARD_BAUD = 115200
 
 # ------------------------------------------------------------------------------
 # BOARD #2: PERDE VE SENSÖR SİSTEMİ (CURTAIN & SENSORS)
@@ -26,6 +30,74 @@ AC_BOARD_PORT = "COM1"
 # Python Yazılımı -> COM4 Portunu dinler.
 # PICSimLab       -> COM3 Portunu kullanmalıdır.
 CURTAIN_BOARD_PORT = "COM4"
+# Perde kartı hız pazarlığı bilmez; burada yazan hızda sabit çalışır.
+CURTAIN_BOARD_BAUD = 9600
+
+# ------------------------------------------------------------------------------
+# KART KAYDI (BİRDEN FAZLA KART)
+# ------------------------------------------------------------------------------
+# Hub'a bağlı tüm kartlar. BOŞ bırakılırsa yukarıdaki iki kart kullanılır.
+# Her kart: name (benzersiz), type ("ac" / "curtain"), port, baud (en yüksek hız,
+# varsayılan 9600), poll_interval (sn, varsayılan 0.5). Kart sayısı artınca
+# thread sayısı artmaz; sorgular tek zamanlayıcıda aralığa eşit dağıtılır.
+# Arayüz her tipin İLK kartını panellerde gösterir; tüm kartlar MODULE STATUS
+# listesinde ve HTTP API'de (/state, /boards/<ad>/...) yer alır. Emülatörlü
+# birden fazla kart için port adına ek yazılabilir: "mem://ac/2". Örnek:
+# BOARDS = [
+#     {"name": "ac", "type": "ac", "port": "COM1", "baud": 115200},
+#     {"name": "curtain", "type": "curtain", "port": "COM4"},
+#     {"name": "yatak-odasi-klima", "type": "ac", "port": "COM6", "poll_interval": 1.0},
+# ]
+BOARDS = []
+
+# ------------------------------------------------------------------------------
+# PORT KEŞFİ (OTOMATİK BULMA)
+# ------------------------------------------------------------------------------
+# Portu "auto" yazılan ya da bu bilgisayarda bulunmayan (örn. Linux'ta "COM1")
+# kartların portu açılışta aranır: aday portlar paralel yoklanır ve kart tipi
+# zararsız sorgulara verdiği cevaptan anlaşılır (bkz. port_discovery).
+# Eşleşme PORT_CACHE_FILE'a yazılır; aynı donanımla sonraki açılışta yoklanmaz.
+PORT_DISCOVERY = True
+PORT_CACHE_FILE = "data/ports.json"
+# Linux'ta aday portlar. pty'lerden sadece ham moddakiler (emülatör, socat,
+# sanal port köprüsü) yoklanır; açık terminal pencereleri atlanır.
+DISCOVERY_PATTERNS = ["/dev/ttyUSB*", "/dev/ttyACM*", "/dev/pts/[0-9]*"]
+
+# ------------------------------------------------------------------------------
+# TELEMETRİ KAYDI
+# ------------------------------------------------------------------------------
+# Tüm sensör ölçümleri bu klasördeki segment dosyalarına yazılır (telemetry_store).
+# Boyut/yaş bütçeleri için telemetry_store.py içindeki sabitlere bakınız.
+TELEMETRY_DIR = "data/telemetry"
+# True: delta + varint sıkıştırılmış segmentler (telemetry_codec, örnek başına
+# ~0.3-1 byte; bloklar en geç 30 sn'de diske yazılır). False: sabit genişlikli
+# ham kayıtlar (16 byte, her FLUSH_EVERY kayıtta diske; scan() ile kopyasız okuma).
+TELEMETRY_COMPRESSED = True
+
+# ------------------------------------------------------------------------------
+# HAT İSTATİSTİKLERİ (TEŞHİS)
+# ------------------------------------------------------------------------------
+# True: kartların byte / hata sayaçları ve komut başına gidiş-dönüş süreleri
+# tutulur (link_stats); arayüzde "LINK DIAGNOSTICS" ve HTTP /diagnostics ile görülür.
+# Maliyeti sorgu başına birkaç mikrosaniyedir; False ile tamamen kapanır.
+LINK_STATS_ENABLED = True
+
+# ------------------------------------------------------------------------------
+# SERİ G/Ç SÜRECİ
+# ------------------------------------------------------------------------------
+# True: kart sorguları, komut kuyruğu ve telemetri ayrı bir süreçte çalışır;
+# durum paylaşılan bellekten okunur (io_worker). Arayüz yükü seri zamanlamayı
+# etkilemez. Açılış ~0.2-0.5 sn uzar, bellek kullanımı artar.
+IO_WORKER_PROCESS = False
+
+# ------------------------------------------------------------------------------
+# YEREL HTTP API
+# ------------------------------------------------------------------------------
+# Portları açan süreç, durumu ve ayar komutlarını bu adreste paylaşır (http_api).
+# Sadece bu bilgisayardan erişim için 127.0.0.1; ağdan erişim için "0.0.0.0".
+HTTP_API_ENABLED = True
+HTTP_API_HOST = "127.0.0.1"
+HTTP_API_PORT = 8765
 
 # --- NOT ---
 # Eğer bağlantı hatası alırsanız:
@@ -0,0 +1,70 @@
+import signal
+import threading
+import time
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - EKRANSIZ SERVİS (DAEMON)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Ekranı olmayan ağ geçitleri için giriş noktası.
+#           Kart sorguları, telemetri kaydı ve komut kuyruğu pencere olmadan
+#           çalışır; Tk / customtkinter hiç içe aktarılmaz.
+#           SIGINT (Ctrl+C), SIGTERM ve Windows'ta SIGBREAK servisi temiz
+#           kapatır: işçiler durur, portlar kapanır, telemetri ve loglar
+#           diske yazılır. Açılış süresi (soğuk başlangıç) loglanır.
+# ==============================================================================
+
+import logger
+from hub_service import HubService
+import config as cfg
+
+STOP_SIGNALS = ("SIGINT", "SIGTERM", "SIGBREAK")  # SIGBREAK: Windows konsolunda Ctrl+Break
+
+
+def install_signal_handlers(stop):
+    """Durdurma sinyallerinde 'stop' olayını kurar. Kurulan sinyal adlarını döner."""
+    installed = []
+    for name in STOP_SIGNALS:
+        sig = getattr(signal, name, None)
+        if sig is None:
+            continue  # Bu platformda yok
+        signal.signal(sig, lambda signum, frame: stop.set())
+        installed.append(name)
+    return installed
+
+
+def run(started=None, hub=None, stop=None):
+    """
+    Servisi çalıştırır ve 'stop' kurulana kadar bekler. Çıkış kodu döner.
+    started : Süreç başlangıcı (time.perf_counter); soğuk başlangıç buna göre ölçülür.
+    hub     : Hazır HubService (None: config'deki portlarla oluşturulur).
+    stop    : threading.Event (None: sinyallerle kurulan yeni olay).
+    """
+    started = time.perf_counter() if started is None else started
+    log = logger.get_logger()
+    if stop is None:
+        stop = threading.Event()
+        install_signal_handlers(stop)
+
+    hub = hub or HubService()
+    hub.start()
+    if cfg.HTTP_API_ENABLED and hub.api is None:
+        hub.serve()
+    status = hub.connect()
+    log.info("Servis hazır: %s, soğuk başlangıç %.0f ms", status, (time.perf_counter() - started) * 1000)
+    if not any(status.values()):
+        log.error("Hiçbir karta bağlanılamadı; portları config.py içinde kontrol edin")
+
+    try:
+        # Zaman aşımlı bekleme: Windows'ta Ctrl+C ancak ana thread uyanınca işlenir
+        while not stop.wait(1.0):
+            pass
+    finally:
+        log.info("Kapanıyor...")
+        hub.stop()
+        logger.shutdown()
+    return 0 if any(status.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(run())
@@ -1,9 +1,10 @@
 import customtkinter as ctk
+import tkinter
 from tkinter import messagebox
+import logging
 import sys
 import os
 import threading
-import time
 from datetime import datetime
 
 # ==============================================================================
@@ -20,7 +21,10 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
 # Kendi yazdığımız modüllerin içe aktarılması
-from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+import logger
+from command_queue import LINK_DOWN, LINK_ONLINE, LINK_RECONNECTING
+from gui_render import LogRing, RenderCache, UpdateQueue, format_link_state, format_link_stats, link_error_count
+from hub_service import HubService
 import config as cfg
 
 # --- TEMA VE RENK PALETİ AYARLARI ---
@@ -39,11 +43,23 @@ THEME = {
 
     "danger": "#f87171",  # Hata/Offline durumu (Kırmızı)
     "success": "#4ade80",  # Başarılı/Online durumu (Yeşil)
+    "warning": "#fbbf24",  # Bağlanıyor/Yeniden bağlanıyor durumu (Amber)
     "text_main": "#e2e8f0",  # Ana metin rengi (Beyazımsı)
     "text_sub": "#94a3b8",  # Alt bilgi metin rengi (Gri)
     "border": "#374151"  # İnce kenarlık çizgilerinin rengi
 }
 
+# Sidebar'daki modül satırlarının başlıkları (kart tipi -> başlık / kısa başlık)
+MODULE_TITLES = {"ac": "AC Unit Controller", "curtain": "Curtain & Sensors"}
+MODULE_SHORT = {"ac": "AC", "curtain": "CUR"}
+
+# Arka plan thread'leri Tk'yi hiç çağırmaz (threaded Tcl'de event_generate, Tk ana
+# döngüsünü beklerdi). Uyandırma, Tk'nin dosya olaylarına bağlı bir borudan gelir;
+# boşta hiç uyanma olmaz. Tk'nin dosya olayı yoksa (Windows) bayrak yoklanır:
+# aralık boşta WAKE_IDLE_MIN_MS'den WAKE_IDLE_MAX_MS'ye kadar ikiye katlanır.
+WAKE_IDLE_MIN_MS = 250
+WAKE_IDLE_MAX_MS = 2000
+
 # CustomTkinter genel ayarları
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
@@ -62,15 +78,38 @@ class ModernHomeAutomationGUI:
         self.root.configure(fg_color=THEME["bg_main"])
 
         # --- API BAĞLANTILARI (NESNE OLUŞTURMA) ---
-        # Henüz portlar açılmadı, sadece nesneler tanımlandı.
-        self.ac_api = AirConditionerSystemConnection(com_port=cfg.AC_BOARD_PORT)
-        self.curtain_api = CurtainControlSystemConnection(com_port=cfg.CURTAIN_BOARD_PORT)
+        # Henüz portlar açılmadı, sadece nesneler tanımlandı. Kartlar, komut
+        # kuyruğu ve telemetri deposu ekransız servisle ortaktır (bkz. hub_service).
+        self.hub = HubService()
+        # Kart listesi config.BOARDS'tan gelir (bkz. board_registry); paneller
+        # her tipin ilk kartını gösterir. Diğer kartlar sidebar ve HTTP API'dedir.
+        self.ac_name = self.hub.primary_name("ac")
+        self.cur_name = self.hub.primary_name("curtain")
+        self.ac_api = self.hub.ac_api
+        self.curtain_api = self.hub.curtain_api
+        # Bağlantı kurulunca her kart için bir hakem (PortArbiter) eklenir.
+        self.ac_port = None
+        self.curtain_port = None
+
+        # Kartlar durum değişince arayüzü uyandırır (bkz. signal_wake / pump_events).
+        # Sorgu thread'i Tk'yi beklemez; değişiklik yoksa hiç uyandırma olmaz.
+        self._wake = threading.Event()
+        self._wake_pipe = self._open_wake_pipe()
+        self._idle_ms = WAKE_IDLE_MIN_MS
+        self.updates = UpdateQueue(self.signal_wake)
+        for board in (self.ac_api, self.curtain_api):
+            if board is not None:
+                board.listeners.append(self.updates.publish)
 
         # Durum değişkenleri
         self.ac_connected = False  # Klima kartı bağlı mı?
         self.curtain_connected = False  # Perde kartı bağlı mı?
         self.running = True  # Uygulama çalışıyor mu?
-        self.last_ambient = 0.0  # Trend okları için son sıcaklık hafızası
+        self.connecting = False  # Portlar arka planda açılıyor mu?
+        self._connect_result = None  # Bağlantı thread'inin sonucu (kart adı -> bağlı mı / hata)
+        self._link_states = {}  # Kart adı -> son gösterilen hat durumu (geçişler loglanır)
+        # Sadece değişen widget'lar yeniden çizilir (bkz. gui_render.RenderCache)
+        self.render = RenderCache()
 
         # --- GRID DÜZENİ (LAYOUT) ---
         # Ekranı ikiye bölüyoruz: Sol (Sidebar - Sabit), Sağ (Main Area - Esnek)
@@ -86,14 +125,24 @@ class ModernHomeAutomationGUI:
 
         # --- ARKA PLAN İŞLEMLERİ (THREADING) ---
         # Seri porttan veri okurken arayüz donmasın diye ayrı bir iş parçacığı başlatıyoruz.
-        self.thread = threading.Thread(target=self.background_data_loop, daemon=True)
-        self.thread.start()
+        # Tek thread, tek asyncio döngüsü: tüm kartlar aynı anda sorgulanır.
+        self.hub.start()
+        # Durum ve komutlar yerel HTTP API ile diğer programlara da açılır
+        if cfg.HTTP_API_ENABLED:
+            self.hub.serve()
+
+        self.tick_clock()
+
+        # Dosya günlüğü: yazma ve dosya döndürme arka plan thread'inde yapılır
+        self.log = logger.get_logger()
 
-        # Arayüzü periyodik olarak güncelleme döngüsünü başlat
-        self.update_gui_loop()
+        # Günlük satırları biriktirilir ve kare başına tek seferde yazılır
+        self.log_ring = LogRing(self.signal_wake)
 
         # Başlangıç logu
         self.log_message("Sistem Hazır. Bağlantı Bekleniyor...", "info")
+        # Durum değişiklikleri ve günlük satırları ana thread'de buradan çizilir
+        self.pump_events()
 
     def setup_ui(self):
         """
@@ -166,9 +215,20 @@ class ModernHomeAutomationGUI:
         ctk.CTkLabel(sidebar, text="MODULE STATUS", font=ctk.CTkFont(size=11, weight="bold"),
                      text_color=THEME["text_sub"]).pack(anchor="w", padx=25, pady=(0, 12))
 
-        # Modül durumlarını tutan referanslar (Daha sonra rengini değiştirmek için)
-        self.mod_ac_frame = self.create_module_status_row(sidebar, "AC Unit Controller")
-        self.mod_cur_frame = self.create_module_status_row(sidebar, "Curtain & Sensors")
+        # Modül durumlarını tutan referanslar (Daha sonra rengini değiştirmek için).
+        # Kayıttaki her kart için bir satır; ek kartlar tip ve adıyla gösterilir.
+        self.module_rows = {}
+        for spec in self.hub.specs:
+            title = MODULE_TITLES[spec.kind] if spec.name == spec.kind else f"{MODULE_SHORT[spec.kind]} · {spec.name}"
+            self.module_rows[spec.name] = self.create_module_status_row(sidebar, title)
+
+        # --- HAT TEŞHİSİ (bkz. link_stats) ---
+        # Gidiş-dönüş süresi (p50/p99), trafik ve hata sayaçları; saatle birlikte saniyede bir yenilenir
+        ctk.CTkLabel(sidebar, text="LINK DIAGNOSTICS", font=ctk.CTkFont(size=11, weight="bold"),
+                     text_color=THEME["text_sub"]).pack(anchor="w", padx=25, pady=(18, 6))
+        self.diag_rows = {name: self.create_diagnostics_row(sidebar, title)
+                          for name, title in ((self.ac_name, "AC"), (self.cur_name, "CUR")) if name is not None}
+        self._diag_errors = {}  # Kart adı -> son görülen hata toplamı (artış kırmızı gösterilir)
 
         # --- BAĞLANTI PANELİ (ALT KISIM) ---
         spacer = ctk.CTkLabel(sidebar, text="")
@@ -187,11 +247,12 @@ class ModernHomeAutomationGUI:
         info_grid = ctk.CTkFrame(conn_box, fg_color="transparent")
         info_grid.pack(fill="x", padx=10, pady=(0, 10))
 
-        self.lbl_port_ac = ctk.CTkLabel(info_grid, text=f"AC: COM{cfg.AC_BOARD_PORT}",
+        ports = {spec.name: spec.port for spec in self.hub.specs}
+        self.lbl_port_ac = ctk.CTkLabel(info_grid, text=f"AC: {ports.get(self.ac_name, '-')}",
                                         font=ctk.CTkFont(size=10, weight="bold"), text_color=THEME["text_sub"])
         self.lbl_port_ac.pack(side="left", padx=5)
 
-        self.lbl_port_cur = ctk.CTkLabel(info_grid, text=f"CUR: COM{cfg.CURTAIN_BOARD_PORT}",
+        self.lbl_port_cur = ctk.CTkLabel(info_grid, text=f"CUR: {ports.get(self.cur_name, '-')}",
                                          font=ctk.CTkFont(size=10, weight="bold"), text_color=THEME["text_sub"])
         self.lbl_port_cur.pack(side="right", padx=5)
 
@@ -211,19 +272,49 @@ class ModernHomeAutomationGUI:
 
         return {"label": lbl, "dot": dot}
 
-    def update_sidebar_status(self, ac_online, cur_online):
-        """Bağlantı durumuna göre sidebar'daki renkleri (Yeşil/Kırmızı) günceller."""
-
-        def set_status(widget_dict, is_online):
-            if is_online:
-                widget_dict["label"].configure(text="ACTIVE", text_color=THEME["success"])
-                widget_dict["dot"].configure(text_color=THEME["success"])
-            else:
-                widget_dict["label"].configure(text="OFFLINE", text_color=THEME["danger"])
-                widget_dict["dot"].configure(text_color=THEME["danger"])
-
-        set_status(self.mod_ac_frame, ac_online)
-        set_status(self.mod_cur_frame, cur_online)
+    def create_diagnostics_row(self, parent, title):
+        """Yardımcı Fonksiyon: Sidebar'daki hat teşhis satırını (başlık + 3 satır metin) oluşturur."""
+        f = ctk.CTkFrame(parent, fg_color="transparent")
+        f.pack(fill="x", padx=25, pady=3)
+
+        ctk.CTkLabel(f, text=title, font=ctk.CTkFont(size=10, weight="bold"), text_color="#d1d5db",
+                     width=30, anchor="nw").pack(side="left", anchor="n")
+        lbl = ctk.CTkLabel(f, text="-", font=ctk.CTkFont(family="Consolas", size=10), justify="left",
+                           anchor="w", text_color=THEME["text_sub"])
+        lbl.pack(side="left", fill="x")
+        return lbl
+
+    def refresh_diagnostics(self):
+        """Bağlı kartların hat sayaçlarını teşhis satırlarına yazar. Yeni hata varsa satır kırmızı olur."""
+        for name, lbl in self.diag_rows.items():
+            if self.hub.port(name) is None:
+                continue  # Bağlı değil: son metin kalır
+            stats = self.hub.boards[name].getLinkStats()
+            errors = link_error_count(stats)
+            color = THEME["danger"] if errors > self._diag_errors.get(name, errors) else THEME["text_sub"]
+            self._diag_errors[name] = errors
+            self.render.configure(lbl, text=format_link_stats(stats), text_color=color)
+
+    def refresh_link_status(self):
+        """
+        Sidebar'daki modül satırlarını canlı hat durumuyla günceller
+        (ACTIVE / RETRY / RECONNECTING / OFFLINE) ve hat kopma / geri gelme
+        geçişlerini günlüğe yazar.
+        """
+        states = self.hub.link_states()
+        for name, row in self.module_rows.items():
+            link = states.get(name)
+            text, color = format_link_state(link, self.connecting)
+            self.render.configure(row["label"], text=text, text_color=THEME[color])
+            self.render.configure(row["dot"], text_color=THEME[color])
+
+            state = (link or {}).get("state")
+            previous = self._link_states.get(name)
+            self._link_states[name] = state
+            if previous == LINK_ONLINE and state == LINK_DOWN:
+                self.log_message(f"HAT KOPTU: {name} cevap vermiyor, yeniden bağlanılacak", "error")
+            elif previous in (LINK_DOWN, LINK_RECONNECTING) and state == LINK_ONLINE:
+                self.log_message(f"Hat yeniden kuruldu: {name}", "info")
 
     def create_header(self):
         """Sağ taraftaki ana başlık ve saat göstergesini oluşturur."""
@@ -285,7 +376,8 @@ class ModernHomeAutomationGUI:
                                                                                                       padx=(5, 0),
                                                                                                       pady=(12, 0))
         # Trend Oku (Artıyor/Azalıyor)
-        self.lbl_trend_ac = ctk.CTkLabel(val_box, text="", font=ctk.CTkFont(size=24)).pack(side="left", padx=(15, 0))
+        self.lbl_trend_ac = ctk.CTkLabel(val_box, text="", font=ctk.CTkFont(size=24))
+        self.lbl_trend_ac.pack(side="left", padx=(15, 0))
 
         # Metrikler (Fan Hızı ve Hedef Sıcaklık Barları)
         metrics = ctk.CTkFrame(frame, fg_color="transparent")
@@ -408,7 +500,8 @@ class ModernHomeAutomationGUI:
     def toggle_controls(self, enable):
         """
         Bağlantı durumuna göre butonları ve girişleri Aktif/Pasif yapar.
-        Bağlantı yoksa kullanıcı komut gönderemez.
+        Bağlantı yoksa kullanıcı komut gönderemez. Açılamamış kart kaldıkça
+        bağlantı butonu açık kalır: tekrar basınca sadece eksik kartlar açılır.
         """
         state = "normal" if enable else "disabled"
         self.entry_temp.configure(state=state)
@@ -416,7 +509,10 @@ class ModernHomeAutomationGUI:
         self.slider_curtain.configure(state=state)
         self.btn_set_curtain.configure(state=state)
 
-        if enable:
+        if enable and any(self.hub.port(name) is None for name in self.hub.boards):
+            self.btn_connect.configure(text="EKSİK KARTLARI BAĞLA", state="normal", fg_color=THEME["action"],
+                                       text_color="white")
+        elif enable:
             self.btn_connect.configure(text="SİSTEM BAĞLI", state="disabled", fg_color=THEME["bg_card"],
                                        text_color=THEME["success"])
         else:
@@ -424,122 +520,270 @@ class ModernHomeAutomationGUI:
                                        text_color="white")
 
     def log_message(self, msg, tag="info"):
-        """Ekrana log basar. Otomatik timestamp ve renk ekler."""
+        """
+        Ekrana log basar. Otomatik timestamp ve renk ekler.
+        Satır hemen yazılmaz; LogRing'e eklenir ve flush_log ile toplu yazılır.
+        Tk'ye dokunmaz: herhangi bir thread'den çağrılabilir (bkz. pump_events).
+        """
         timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log_ring.add(f"[{timestamp}] {msg}", tag)
+        self.log.log(logging.ERROR if tag == "error" else logging.INFO, msg)
+
+    def flush_log(self, event=None):
+        """
+        ANA THREAD: Bekleyen günlük satırlarını tek kilit aç/kapa ile yazar,
+        kapasiteyi aşan eski satırları tek delete ile siler.
+        """
+        chunks, trim = self.log_ring.take()
+        if not chunks: return
         self.log_box.configure(state="normal")  # Yazmak için kilidi aç
-        self.log_box.insert("end", f"[{timestamp}] {msg}\n", tag)
+        for text, tag in chunks:
+            self.log_box.insert("end", text, tag)
+        if trim:
+            self.log_box.delete("1.0", f"{trim + 1}.0")
         self.log_box.see("end")  # En sona kaydır
         self.log_box.configure(state="disabled")  # Tekrar kilitle
 
-    def background_data_loop(self):
+    def tick_clock(self):
+        """Saati saniye sınırında günceller (saniyede tek uyanma)."""
+        if not self.running: return
+        now = datetime.now()
+        self.render.configure(self.lbl_time, text=now.strftime("%H:%M:%S"))
+        self.refresh_diagnostics()
+        self.refresh_link_status()
+        self.root.after(1000 - now.microsecond // 1000, self.tick_clock)
+
+    def _open_wake_pipe(self):
+        """
+        Tk'nin olay döngüsüne dosya olayı olarak bağlanan uyandırma borusu
+        (okuma ucu, yazma ucu). createfilehandler yoksa (Windows) None.
         """
-        ARKA PLAN THREAD:
-        Seri porttan veri okuma işlemlerini burada yaparız ki arayüz donmasın.
+        if not hasattr(self.root.tk, "createfilehandler"):
+            return None
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)  # Boru dolarsa yazan thread beklemesin
+        self.root.tk.createfilehandler(read_fd, tkinter.READABLE, self._on_wake_pipe)
+        return read_fd, write_fd
+
+    def signal_wake(self):
         """
-        while self.running:
+        Herhangi bir thread'den: arayüzü uyandırır (bkz. UpdateQueue, LogRing).
+        Bayrak zaten kuruluysa boruya tekrar yazılmaz. Tk çağrılmaz, beklenmez.
+        """
+        if self._wake.is_set():
+            return
+        self._wake.set()
+        if self._wake_pipe is not None:
             try:
-                if self.ac_connected: self.ac_api.update()
-                if self.curtain_connected: self.curtain_api.update()
-                time.sleep(0.5)  # İşlemciyi yormamak için kısa bekleme
-            except:
-                pass
+                os.write(self._wake_pipe[1], b"\0")
+            except OSError:
+                pass  # Boru dolu (uyandırma zaten bekliyor) veya kapandı
+
+    def _on_wake_pipe(self, fd, mask):
+        """ANA THREAD: borudaki uyandırma byte'larını boşaltır ve bekleyen işleri çizer."""
+        try:
+            os.read(fd, 4096)
+        except OSError:
+            pass
+        self.pump_events()
 
-    def update_gui_loop(self):
+    def pump_events(self):
+        """
+        ANA THREAD: Uyandırma bayrağı kuruluysa bekleyen durum değişikliklerini
+        çizer, günlük satırlarını yazar ve bağlantı sonucunu uygular; değilse
+        hiçbir şey yapmaz. Bayrak boşaltmadan ÖNCE indirilir: arada gelen olay
+        kaybolmaz. Boru yoksa kendini yeniden kurar (boşta aralık büyür).
         """
-        ANA THREAD DÖNGÜSÜ:
-        Arka planda (API'de) güncellenen verileri ekrana (Label'lara) yazar.
+        if not self.running: return
+        woke = self._wake.is_set()
+        if woke:
+            self._wake.clear()
+            if self._connect_result is not None:
+                self.on_connected()
+            self.on_state_changed()
+            self.flush_log()
+        if self._wake_pipe is None:
+            self._idle_ms = WAKE_IDLE_MIN_MS if woke else min(self._idle_ms * 2, WAKE_IDLE_MAX_MS)
+            self.root.after(self._idle_ms, self.pump_events)
+
+    def on_state_changed(self, event=None):
+        """
+        ANA THREAD: Birikmiş tüm durum değişikliklerini tek seferde çizer.
         Tkinter'da GUI güncellemeleri SADECE ana thread'de yapılmalıdır.
         """
         if not self.running: return
-        self.lbl_time.configure(text=datetime.now().strftime("%H:%M:%S"))
-
+        pending = self.updates.drain()
+        if self.ac_api in pending:
+            self.render_ac()
+        if self.curtain_api in pending:
+            self.render_curtain()
+
+    def render_ac(self):
+        """Klima panelini çizer. Sadece gösterilen metni/değeri değişen widget'lar yeniden çizilir."""
+        if not self.ac_connected: return
+        render = self.render
+        # Tek bir tutarlı kayıt: sorgu thread'i bu sırada yenisini yayınlasa da değişmez
+        state = self.ac_api.state
         try:
-            # --- KLIMA VERİLERİNİ GÜNCELLE ---
-            if self.ac_connected:
-                temp = self.ac_api.getAmbientTemp()
-                self.lbl_ac_ambient.configure(text=f"{temp:.2f}")
-
-                # Trend oku mantığı
-                if temp > self.last_ambient:
-                    self.lbl_trend_ac.configure(text="▲", text_color=THEME["danger"])
-                elif temp < self.last_ambient:
-                    self.lbl_trend_ac.configure(text="▼", text_color=THEME["secondary"])
-                else:
-                    self.lbl_trend_ac.configure(text="", text_color=THEME["text_sub"])
-                self.last_ambient = temp
-
-                fan = self.ac_api.getFanSpeed()
-                self.bar_fan["label"].configure(text=f"{fan} RPS")
-                self.bar_fan["prog"].set(fan / 255)  # Progress bar 0-1 arası çalışır
-
-                targ = self.ac_api.getDesiredTemp()
-                self.bar_target["label"].configure(text=f"{targ:.1f} °C")
-                self.bar_target["prog"].set(targ / 50)
-
-            # --- PERDE VERİLERİNİ GÜNCELLE ---
-            if self.curtain_connected:
-                self.lbl_cur_temp["label"].configure(
-                    text=f"{self.curtain_api.getOutdoorTemp():.1f} {self.lbl_cur_temp['unit']}")
-                self.lbl_cur_press["label"].configure(
-                    text=f"{self.curtain_api.getOutdoorPress():.1f} {self.lbl_cur_press['unit']}")
-                self.lbl_cur_light["label"].configure(
-                    text=f"{self.curtain_api.getLightIntensity():.1f} {self.lbl_cur_light['unit']}")
-
-                cur_val = self.curtain_api.curtainStatus
-                self.lbl_cur_stat["label"].configure(text=f"%{cur_val:.0f}")
+            temp = state.ambientTemperature
+            # Bayat (uzun süredir cevap alınamayan) değer gri gösterilir
+            stale = state.isStale("ambientTemperature")
+            render.configure(self.lbl_ac_ambient, text=f"{temp:.2f}",
+                             text_color=THEME["text_sub"] if stale else THEME["text_main"])
+
+            # Trend oku mantığı (son iki ölçüm, bkz. ac_api.history)
+            trend = self.ac_api.history.trend("ambientTemperature")
+            if trend > 0:
+                render.configure(self.lbl_trend_ac, text="▲", text_color=THEME["danger"])
+            elif trend < 0:
+                render.configure(self.lbl_trend_ac, text="▼", text_color=THEME["secondary"])
+            else:
+                render.configure(self.lbl_trend_ac, text="", text_color=THEME["text_sub"])
+
+            fan = state.fanSpeed
+            render.configure(self.bar_fan["label"], text=f"{fan} RPS")
+            render.set(self.bar_fan["prog"], fan / 255)  # Progress bar 0-1 arası çalışır
+
+            targ = state.desiredTemperature
+            render.configure(self.bar_target["label"], text=f"{targ:.1f} °C")
+            render.set(self.bar_target["prog"], targ / 50)
+        except Exception:
+            pass
 
+    def render_curtain(self):
+        """Perde ve sensör panelini çizer."""
+        if not self.curtain_connected: return
+        render = self.render
+        state = self.curtain_api.state  # Tek bir tutarlı kayıt (bkz. BoardState)
+        try:
+            # Bayat değerin yanına "?" eklenir (son geçerli değer korunur)
+            def mark(field):
+                return " ?" if state.isStale(field) else ""
+
+            render.configure(self.lbl_cur_temp["label"],
+                text=f"{state.outdoorTemp:.1f} {self.lbl_cur_temp['unit']}{mark('outdoorTemp')}")
+            render.configure(self.lbl_cur_press["label"],
+                text=f"{state.outdoorPress:.1f} {self.lbl_cur_press['unit']}{mark('outdoorPress')}")
+            render.configure(self.lbl_cur_light["label"],
+                text=f"{state.lightIntensity:.1f} {self.lbl_cur_light['unit']}{mark('lightIntensity')}")
+
+            cur_val = state.curtainStatus
+            render.configure(self.lbl_cur_stat["label"], text=f"%{cur_val:.0f}")
         except Exception:
             pass
-        # 200 ms sonra bu fonksiyonu tekrar çağır (Sonsuz Döngü)
-        self.root.after(200, self.update_gui_loop)
 
     def connect_system(self):
-        """Bağlantıyı Başlat butonuna basılınca çalışır."""
+        """
+        Bağlantıyı Başlat butonuna basılınca çalışır. Portlar arka plan
+        thread'inde (paralel, süre sınırıyla) açılır; pencere bu sırada donmaz.
+        """
+        if self.connecting: return
+        self.connecting = True
+        self.btn_connect.configure(text="BAĞLANIYOR...", state="disabled")
         self.log_message("Bağlantı başlatılıyor...", "cmd")
-        self.root.update()
+        self.refresh_link_status()
+        threading.Thread(target=self._connect_worker, name="Connect", daemon=True).start()
+
+    def _connect_worker(self):
+        """
+        ARKA PLAN THREAD: portları açar. Sonuç bırakılır ve uyandırma bayrağı
+        kurulur; arayüze ana thread'de pump_events -> on_connected uygular.
+        """
+        try:
+            self._connect_result = self.hub.connect()
+        except Exception as e:
+            self._connect_result = e
+        self.signal_wake()
+
+    def on_connected(self, event=None):
+        """ANA THREAD: bağlantı sonucunu arayüze uygular."""
+        self.connecting = False
+        status, self._connect_result = self._connect_result, None
         try:
-            # Seri portları açmayı dene
-            ok_ac = self.ac_api.open()
-            ok_cur = self.curtain_api.open()
+            if isinstance(status, Exception):
+                raise status
+            ok_ac, ok_cur = status.get(self.ac_name, False), status.get(self.cur_name, False)
+
+            # Açılan portların tüm erişimi bundan sonra hakem üzerinden yapılır
+            self.ac_port = self.hub.port(self.ac_name)
+            self.curtain_port = self.hub.port(self.cur_name)
 
             self.ac_connected = ok_ac
             self.curtain_connected = ok_cur
 
-            # Sidebar'daki renkleri güncelle
-            self.update_sidebar_status(ok_ac, ok_cur)
+            # Sidebar'daki satırları güncelle
+            self.refresh_link_status()
+            # İlk çizim: bağlantıdan önce gelen olaylar bağlı bayrağı yüzünden atlanmış olabilir
+            self.render_ac()
+            self.render_curtain()
 
-            if ok_ac or ok_cur:
+            if any(status.values()):
                 self.toggle_controls(enable=True)
-                self.log_message(f"Bağlantı Başarılı (AC:{ok_ac}, CUR:{ok_cur})", "info")
+                self.log_message(f"Bağlantı Başarılı ({sum(status.values())}/{len(status)} kart; "
+                                 f"AC:{ok_ac}, CUR:{ok_cur})", "info")
             else:
+                self.toggle_controls(enable=False)  # Tekrar denenebilsin
                 self.log_message("HATA: Portlara erişilemedi.", "error")
                 messagebox.showerror("Bağlantı Hatası", "Portlar açılamadı.")
         except Exception as e:
+            # Önceki denemede bağlanan kartların kontrolleri açık kalır
+            self.toggle_controls(enable=any(self.hub.port(name) for name in self.hub.boards))
+            self.refresh_link_status()
             self.log_message(f"Kritik Hata: {e}", "error")
 
+    def send_setpoint(self, name, port, field, value):
+        """
+        Ayar komutunu kartın kuyruğuna ekler. Kart bağlı değilse veya değer
+        kartın SETPOINT_RANGES sınırları dışındaysa (HTTP API ile aynı kural)
+        uyarı gösterir ve False döner.
+        """
+        if port is None:
+            messagebox.showwarning("Bağlantı", f"Kart bağlı değil: {name}")
+            return False
+        low, high = self.hub.boards[name].SETPOINT_RANGES.get(field, (float("-inf"), float("inf")))
+        if not low <= value <= high:
+            messagebox.showwarning("Limit", f"{low:g}-{high:g} arası giriniz.")
+            return False
+        # Kuyruğun başına girer; süren sorgu biter bitmez hatta çıkar
+        port.submit_set(field, value).add_done_callback(self._report_command)
+        return True
+
     def cmd_set_temp(self):
         """Klima 'Ayarla Gönder' butonu işlevi."""
         try:
             val = float(self.entry_temp.get())
-            if 10 <= val <= 50:
-                self.ac_api.setDesiredTemp(val)
-                self.log_message(f"AC Komut: {val}°C", "cmd")
-            else:
-                messagebox.showwarning("Limit", "10-50 arası giriniz.")
-        except:
+        except ValueError:
             messagebox.showerror("Hata", "Sayı giriniz.")
+            return
+        if self.send_setpoint(self.ac_name, self.ac_port, "desiredTemperature", val):
+            self.log_message(f"AC Komut: {val}°C", "cmd")
 
     def cmd_set_curtain(self):
         """Perde 'Pozisyonu Uygula' butonu işlevi."""
         val = self.slider_curtain.get()
-        self.curtain_api.setCurtainStatus(val)
-        self.log_message(f"Perde Komut: %{val:.0f}", "cmd")
+        if self.send_setpoint(self.cur_name, self.curtain_port, "curtainStatus", val):
+            self.log_message(f"Perde Komut: %{val:.0f}", "cmd")
+
+    def _report_command(self, future):
+        """
+        Komut gönderilemediyse (örn. hat kopukken) günlüğe yazar. Sorgu
+        thread'inde çalışır: satır sadece LogRing'e eklenir, Tk çağrılmaz.
+        """
+        if not future.cancelled() and future.exception() is not None:
+            self.log_message(f"Komut gönderilemedi: {future.exception()}", "error")
 
     def on_closing(self):
         """Pencere kapatılırken portları temizler ve thread'i durdurur."""
         self.running = False
-        if self.ac_connected: self.ac_api.close()
-        if self.curtain_connected: self.curtain_api.close()
+        # Önce port işçileri durur, sonra portlar ve telemetri deposu kapanır
+        self.hub.stop()
+        if self._wake_pipe is not None:
+            self.root.tk.deletefilehandler(self._wake_pipe[0])
+            for fd in self._wake_pipe:
+                os.close(fd)
+            self._wake_pipe = None
+        logger.shutdown()  # Kuyrukta bekleyen log kayıtları diske yazılır
         self.root.destroy()
         sys.exit()
 
@@ -0,0 +1,255 @@
+import threading
+import time
+from collections import deque
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ARAYÜZ ÇİZİM YARDIMCILARI
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Arayüzün (gui_app) Tk'ye bağımlı olmayan yardımcıları.
+#           RenderCache: her widget için son çizilen değeri tutar ve sadece
+#           DEĞİŞEN seçenekleri Tk'ye gönderir. Boşta bekleyen sistemde
+#           hiçbir configure çağrısı yapılmaz.
+#           UpdateQueue: sorgu thread'inin yayınladığı durum değişikliklerini
+#           toplar, arayüzü sadece çizilecek bir şey olduğunda uyandırır.
+#           LogRing: sistem günlüğü kutusu için sabit kapasiteli satır
+#           tamponu; satırlar toplu eklenir, eskiler toplu silinir, ani
+#           mesaj patlamaları hız sınırıyla özetlenir.
+#           format_link_stats: kenar çubuğundaki hat teşhis satırlarının metni.
+#           format_link_state: modül satırlarındaki canlı hat durumu etiketi.
+# ==============================================================================
+
+from command_queue import LINK_DOWN, LINK_ONLINE, LINK_RECONNECTING
+
+# --- SİSTEM GÜNLÜĞÜ SINIRLARI ---
+LOG_MAX_LINES = 2000   # Günlük kutusunda tutulan en fazla satır
+LOG_TRIM_SLACK = 200   # Sınır bu kadar aşılınca eski satırlar tek seferde silinir
+LOG_RATE_LIMIT = 50    # Saniyede kabul edilen en fazla mesaj; fazlası sayılıp özetlenir
+# ==============================================================================
+
+_MISSING = object()  # Henüz çizilmemiş seçenek (hiçbir değere eşit değil)
+
+
+class RenderCache:
+    """
+    Widget güncellemelerini süzer.
+    configure(): sadece son çizilenden farklı olan seçenekleri uygular.
+    set(): progress bar / slider gibi .set(değer) kullanan widget'lar için.
+    Sayaçlar: applied (Tk'ye giden çağrı), skipped (değişmediği için atlanan).
+    """
+    def __init__(self):
+        self._last = {}  # (widget, seçenek) -> son çizilen değer
+        self.applied = 0
+        self.skipped = 0
+
+    def configure(self, widget, **options):
+        """Değişen seçenekler varsa tek bir configure ile uygular. Uygulandıysa True."""
+        changed = {k: v for k, v in options.items() if self._last.get((widget, k), _MISSING) != v}
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.configure(**changed)
+        for k, v in changed.items():
+            self._last[(widget, k)] = v
+        self.applied += 1
+        return True
+
+    def set(self, widget, value):
+        """widget.set(value) - değer değişmediyse çağrılmaz."""
+        if self._last.get((widget, "set"), _MISSING) == value:
+            self.skipped += 1
+            return False
+        widget.set(value)
+        self._last[(widget, "set")] = value
+        self.applied += 1
+        return True
+
+    def forget(self, widget):
+        """Widget dışarıdan değiştirildiyse (örn. doğrudan configure) önbelleği temizler."""
+        for key in [k for k in self._last if k[0] is widget]:
+            del self._last[key]
+
+    def stats(self):
+        total = self.applied + self.skipped
+        return {
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / total if total else 0.0,
+        }
+
+
+class UpdateQueue:
+    """
+    Sorgu thread'inden arayüz thread'ine durum değişikliği kuyruğu.
+    publish() herhangi bir thread'den çağrılır; aynı kaynaktan gelen olaylar
+    birleştirilir ve arayüz, çizilmeyi bekleyen ilk olayda TEK kez uyandırılır
+    (wake). Arayüz drain() ile bekleyenlerin hepsini bir seferde alır.
+    Değişiklik yoksa hiç uyandırma olmaz.
+    """
+    def __init__(self, wake):
+        self._wake = wake
+        self._lock = threading.Lock()
+        self._pending = {}  # kaynak -> değişen alanlar kümesi
+        self._armed = False  # Uyandırıldı, henüz boşaltılmadı
+        self.published = 0
+        self.wakeups = 0
+
+    def publish(self, source, fields=()):
+        with self._lock:
+            self._pending.setdefault(source, set()).update(fields)
+            self.published += 1
+            if self._armed:
+                return  # Arayüz zaten uyandırıldı; bu olay aynı çizimde işlenecek
+            self._armed = True
+            self.wakeups += 1
+        try:
+            self._wake()
+        except Exception:
+            # Arayüz kapanıyor (ana döngü yok): sonraki olay tekrar denesin
+            with self._lock:
+                self._armed = False
+
+    def drain(self):
+        """Bekleyen tüm olaylar: {kaynak: değişen alanlar}. Sadece arayüz thread'inden."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._armed = False
+        return pending
+
+
+class LogRing:
+    """
+    Sistem günlüğü kutusunun (log_box) satır tamponu.
+    add() herhangi bir thread'den çağrılır; satır bekleyenlere eklenir ve
+    arayüz, bekleyen ilk satırda TEK kez uyandırılır (wake). Arayüz take()
+    ile bekleyenlerin hepsini alır ve tek seferde çizer.
+    Bekleyen satırlar da kapasiteyle sınırlıdır: kutuya hiç yazılmadan
+    silinecek satırlar hiç tutulmaz. Bellek ve ekleme maliyeti, hub ne kadar
+    uzun çalışırsa çalışsın sabit kalır.
+
+    capacity   : Kutuda kalacak satır sayısı.
+    slack      : Silme, kapasite bu kadar aşılınca toplu yapılır.
+    rate_limit : Saniyede kabul edilen mesaj; fazlası "N mesaj bastırıldı" olur.
+    """
+    def __init__(self, wake, capacity=LOG_MAX_LINES, slack=LOG_TRIM_SLACK, rate_limit=LOG_RATE_LIMIT,
+                 clock=time.monotonic):
+        self._wake = wake
+        self._clock = clock
+        self.capacity = capacity
+        self.slack = slack
+        self.rate_limit = rate_limit
+        self._lock = threading.Lock()
+        self._pending = deque(maxlen=capacity)  # (satır, etiket)
+        self._armed = False
+        self._window = None    # Hız sınırı penceresinin başlangıcı (sn)
+        self._in_window = 0    # Penceredeki mesaj sayısı
+        self._suppressed = 0   # Henüz özeti yazılmamış bastırılan mesajlar
+        self.lines = 0         # Kutudaki satır sayısı
+        self.suppressed = 0    # Toplam bastırılan mesaj (istatistik)
+
+    def add(self, text, tag="info"):
+        """Bir satır ekler. Hız sınırını aştıysa sadece sayılır; kabul edildiyse True."""
+        now = self._clock()
+        with self._lock:
+            if self._window is None or now - self._window >= 1.0:
+                self._window = now
+                self._in_window = 0
+            self._in_window += 1
+            accepted = self._in_window <= self.rate_limit
+            if accepted:
+                self._pending.append((text, tag))
+            else:
+                self._suppressed += 1  # Özet satırı bir sonraki çizimde yazılır
+                self.suppressed += 1
+            if self._armed:
+                return accepted  # Arayüz zaten uyandırıldı; aynı çizimde yazılacak
+            self._armed = True
+        try:
+            self._wake()
+        except Exception:
+            with self._lock:
+                self._armed = False
+        return accepted
+
+    def take(self):
+        """
+        Bekleyen satırları alır: (parçalar, silinecek satır sayısı).
+        parçalar: aynı etiketli ardışık satırlar birleştirilmiş (metin, etiket)
+        listesi; her parça kutuya tek insert ile yazılır. Sadece arayüz thread'inden.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, deque(maxlen=self.capacity)
+            self._armed = False
+            suppressed, self._suppressed = self._suppressed, 0
+        if suppressed:
+            pending.append((f"... {suppressed} mesaj bastırıldı (saniyede en fazla {self.rate_limit})", "error"))
+        chunks = []
+        for text, tag in pending:
+            if chunks and chunks[-1][1] == tag:
+                chunks[-1][0].append(text)
+            else:
+                chunks.append(([text], tag))
+        self.lines += sum(text.count("\n") + 1 for text, _ in pending)
+        trim = 0
+        if self.lines > self.capacity + self.slack:
+            trim = self.lines - self.capacity
+            self.lines = self.capacity
+        return [("\n".join(lines) + "\n", tag) for lines, tag in chunks], trim
+
+
+# --- HAT DURUMU (MODÜL SATIRLARI) ---
+def format_link_state(link, connecting=False):
+    """
+    Modül satırının etiketi ve tema rengi anahtarı (bkz. PortArbiter.link_status).
+    link       : hat durumu sözlüğü (None: kart bağlı değil)
+    connecting : bağlantı henüz kuruluyor mu (portlar açılıyor)
+    """
+    state = (link or {}).get("state")
+    if state == LINK_ONLINE:
+        return "ACTIVE", "success"
+    if state == LINK_RECONNECTING:
+        return "RECONNECTING", "warning"
+    if state == LINK_DOWN:
+        retry_in = link.get("retry_in")
+        return ("DOWN" if retry_in is None else f"RETRY {retry_in:.0f}s"), "danger"
+    if connecting:
+        return "CONNECTING", "warning"
+    return "OFFLINE", "danger"
+
+
+# --- HAT TEŞHİS PANELİ ---
+def link_error_count(stats):
+    """Tüm hata sayaçlarının toplamı (zaman aşımı dahil). Sayaç yoksa 0."""
+    if not stats:
+        return 0
+    return (stats["timeouts"] + stats["short_reads"] + stats["write_errors"]
+            + stats["read_errors"] + stats["bad_frames"])
+
+
+def _format_bytes(count):
+    for unit in ("B", "kB", "MB"):
+        if count < 1000 or unit == "MB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1000
+
+
+def format_link_stats(stats):
+    """
+    Kenar çubuğu için üç satırlık özet (bkz. link_stats.LinkStats.snapshot):
+    en sık kullanılan isteğin gidiş-dönüş süresi, trafik ve hata sayaçları.
+    """
+    if stats is None:
+        return "sayaçlar kapalı"
+    busiest = max(stats["round_trips"].items(), key=lambda item: item[1]["count"], default=None)
+    if busiest is None:
+        rtt = "rtt -"
+    else:
+        label, h = busiest
+        commands = label.split()
+        if len(commands) > 1:
+            label = f"{commands[0]}+{len(commands) - 1}"  # Toplu sorgu: ilk komut + kalan sayısı
+        rtt = f"rtt {h['p50_ms']:.2f}/{h['p99_ms']:.2f} ms [{label}]"
+    return (f"{rtt}\n"
+            f"tx {_format_bytes(stats['bytes_out'])}  rx {_format_bytes(stats['bytes_in'])}\n"
+            f"t/o {stats['timeouts']}  kısa {stats['short_reads']}  "
+            f"hata {stats['write_errors'] + stats['read_errors'] + stats['bad_frames']}")
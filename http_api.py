@@ -0,0 +1,228 @@
+import concurrent.futures
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - YEREL HTTP / JSON API
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Seri portlar tek bir sürece aittir. Diğer programlar (panolar,
+#           betikler) durumu ve komutları bu API üzerinden paylaşır.
+#             GET  /state                 -> son durum (bellekteki hazır JSON)
+#             GET  /state?since=N         -> sürüm N'den yenisi gelene kadar bekler (long-poll)
+#             GET  /events                -> Server-Sent Events: her değişiklikte bir olay
+#             GET  /diagnostics           -> kartların hat sayaçları (bkz. link_stats)
+#             GET  /links                 -> hat durumu (bağlı / kopuk / yeniden bağlanıyor)
+#             POST /boards/<kart>/<alan>  -> {"value": 25.5} ayar komutu
+#           Okumalar seri hatta TEK byte eklemez: durum, kartlar değiştiğinde
+#           bir kez JSON'a çevrilir ve tüm istemcilere aynı byte'lar gönderilir.
+#           Komutlar arayüzle aynı sıralı komut kuyruğundan (PortArbiter) geçer.
+# ==============================================================================
+
+log = logging.getLogger("HomeAutomation.http")
+
+LONG_POLL_TIMEOUT = 25.0   # since=N isteğinin en uzun bekleme süresi (sn)
+SSE_KEEPALIVE = 15.0       # Değişiklik yoksa bu aralıkla yorum satırı gönderilir (sn)
+COMMAND_TIMEOUT = 2.0      # Ayar komutunun karta yazılmasını bekleme süresi (sn)
+MAX_BODY_BYTES = 1024      # Komut gövdesinin en büyük boyu ({"value": <sayı>} için bol)
+
+
+class StateSnapshot:
+    """
+    Tüm kartların durumunun önbelleklenmiş JSON hali.
+    Kartların dinleyicisi (listeners) olarak kaydolur; bir değişiklikte JSON
+    bir kez üretilir ve sürüm (version) artar. Okuyucular hazır byte'ları alır.
+    wait() yeni sürüm gelene kadar bekler (long-poll ve SSE için).
+    """
+    def __init__(self, boards):
+        self.boards = boards
+        self._cond = threading.Condition()
+        self.version = 0
+        self.body = b""
+        self.closed = False
+        for board in boards.values():
+            board.listeners.append(self._on_change)
+        self.rebuild()
+
+    def _on_change(self, board, fields):
+        self.rebuild()
+
+    def rebuild(self):
+        """Durumu yeniden JSON'a çevirir ve bekleyen okuyucuları uyandırır."""
+        state = {name: board.snapshot() for name, board in self.boards.items()}
+        with self._cond:
+            self.version += 1
+            self.body = json.dumps({"version": self.version, "time": time.time(), "boards": state},
+                                   separators=(",", ":")).encode("utf-8")
+            self._cond.notify_all()
+
+    def current(self):
+        """(sürüm, JSON byte'ları)"""
+        with self._cond:
+            return self.version, self.body
+
+    def wait(self, since, timeout):
+        """Sürüm 'since'ten büyük olana (veya zaman aşımına / kapanışa) kadar bekler."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > since or self.closed, timeout)
+            return self.version, self.body
+
+    def close(self):
+        """Bekleyen tüm okuyucuları bırakır (sunucu kapanırken)."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Bağlantı açık kalır (keep-alive): istek başına TCP kurulmaz
+    # Başlık ve gövde tek yazmada gider (Nagle + gecikmeli ACK beklemesi olmaz);
+    # tampon her istekten sonra handle_one_request tarafından boşaltılır.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    server_version = "NexusHub/1.0"
+
+    # --- YARDIMCILAR ---
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass  # İstek başına log yazılmaz (yüksek istek hızında gereksiz yük)
+
+    # --- OKUMA ---
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/state":
+            self._get_state(parse_qs(url.query))
+        elif url.path == "/events":
+            self._get_events()
+        elif url.path == "/diagnostics":
+            self._send(200, json.dumps(self.server.hub.diagnostics()).encode("utf-8"))
+        elif url.path == "/links":
+            self._send(200, json.dumps(self.server.hub.link_states()).encode("utf-8"))
+        else:
+            self._error(404, "bilinmeyen adres")
+
+    do_HEAD = do_GET
+
+    def _get_state(self, query):
+        snapshot = self.server.snapshot
+        if "since" in query:
+            try:
+                since = int(query["since"][0])
+                timeout = min(float(query.get("timeout", [LONG_POLL_TIMEOUT])[0]), LONG_POLL_TIMEOUT)
+            except ValueError:
+                return self._error(400, "since / timeout sayı olmalı")
+            version, body = snapshot.wait(since, timeout)
+        else:
+            version, body = snapshot.current()
+        etag = f'"{version}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        self._send(200, body, headers={"ETag": etag})
+
+    def _get_events(self):
+        snapshot = self.server.snapshot
+        try:
+            last = int(self.headers.get("Last-Event-ID", -1))  # Yeniden bağlanan istemci kaldığı yerden
+        except ValueError:
+            last = -1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while not snapshot.closed:
+                version, body = snapshot.wait(last, SSE_KEEPALIVE)
+                if version > last:
+                    self.wfile.write(b"id: %d\ndata: %s\n\n" % (version, body))
+                    last = version
+                else:
+                    self.wfile.write(b": keepalive\n\n")  # Kopan istemciyi fark etmek için
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # İstemci ayrıldı
+
+    # --- KOMUT ---
+    def do_POST(self):
+        # Gövde her durumda okunur; yoksa açık kalan bağlantıda sonraki istek bozulur
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            # Gövde okunmadı: bağlantı kapanır
+            self.close_connection = True
+            return self._error(400, "Content-Length geçersiz")
+        raw = self.rfile.read(length)
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "boards":
+            return self._error(404, "bilinmeyen adres")
+        name, field = parts[1], parts[2]
+        board = self.server.hub.boards.get(name)
+        if board is None or field not in board.SETPOINTS:
+            return self._error(404, f"ayarlanabilir alan yok: {name}/{field}")
+        try:
+            value = float(json.loads(raw or b"{}")["value"])
+        except (ValueError, KeyError, TypeError):
+            return self._error(400, 'gövde {"value": <sayı>} olmalı')
+        low, high = board.SETPOINT_RANGES.get(field, (float("-inf"), float("inf")))
+        if not low <= value <= high:
+            return self._error(400, f"değer {low:g}-{high:g} arasında olmalı")
+        port = self.server.hub.port(name)
+        if port is None:
+            return self._error(503, f"kart bağlı değil: {name}")
+        try:
+            port.submit_set(field, value).result(timeout=COMMAND_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            return self._error(504, "komut zaman aşımına uğradı")
+        except Exception as e:
+            return self._error(502, f"komut gönderilemedi: {e}")
+        log.info("HTTP komut: %s/%s = %s", name, field, value)
+        self._send(200, json.dumps({"ok": True, "board": name, "field": field, "value": value}).encode("utf-8"))
+
+
+class ApiServer:
+    """
+    HubService'in HTTP sunucusu. Her bağlantı ayrı bir thread'de işlenir;
+    istekler sadece bellekteki StateSnapshot'ı okur.
+    """
+    def __init__(self, hub, host="127.0.0.1", port=0):
+        self.hub = hub
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.hub = hub
+        self.httpd.snapshot = hub.snapshot
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="ApiServer", daemon=True)
+
+    @property
+    def address(self):
+        """(host, port) - port=0 ile açıldıysa işletim sisteminin verdiği port."""
+        return self.httpd.server_address[:2]
+
+    def start(self):
+        self._thread.start()
+        log.info("HTTP API: http://%s:%d", *self.address)
+        return self
+
+    def stop(self):
+        self.hub.snapshot.close()  # Bekleyen long-poll / SSE istemcileri bırakılır
+        self.httpd.shutdown()
+        self.httpd.server_close()
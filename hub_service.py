@@ -0,0 +1,179 @@
+import logging
+import os
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SERVİS ÇEKİRDEĞİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Kartları, seri port hakemini (komut kuyruğu) ve telemetri
+#           deposunu bir araya getiren, arayüzden bağımsız çekirdek.
+#           Hem pencereli arayüz (gui_app) hem ekransız servis (daemon)
+#           aynı çekirdeği kullanır. Bu modül Tk / customtkinter İÇE AKTARMAZ.
+#           config.IO_WORKER_PROCESS açıksa kartlar ayrı bir süreçte çalışır
+#           (bkz. io_worker); arayüz ve API aynı nesnelerle çalışmaya devam eder.
+#           Portu "auto" yazılan / bulunmayan kartların portu açılışta aranır
+#           (bkz. port_discovery). Kopan hatlar hakem tarafından yeniden
+#           kurulur; güncel hat durumu link_states() ile okunur.
+# ==============================================================================
+
+from board_registry import load_registry, open_boards
+from command_queue import LINK_OFFLINE, SerialIOService
+from http_api import ApiServer, StateSnapshot
+from io_worker import IOWorker
+from port_discovery import PortDiscovery
+from telemetry_codec import CompressedTelemetryStore
+from telemetry_store import TelemetryStore
+import config as cfg
+
+log = logging.getLogger("HomeAutomation.hub")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class HubService:
+    """
+    Kart nesneleri ve ortak servisler.
+    specs  : kart tanımları (bkz. board_registry.BoardSpec)
+    boards : kart adı -> kart nesnesi (tanım sırasıyla)
+             (ayrı süreç modunda io_worker.RemoteBoard)
+    ports  : bağlantısı açılmış kart adı -> PortArbiter (port erişiminin tek yolu)
+             (ayrı süreç modunda io_worker.RemotePort)
+    snapshot : Kartların önbelleklenmiş JSON durumu (bkz. http_api.StateSnapshot)
+
+    telemetry_dir : Telemetri klasörü (None: config.TELEMETRY_DIR)
+    transports    : Kart adı -> hazır transport (test / emülatör için; ayrı süreçte kullanılamaz)
+    ports         : Kart adı -> port adı (None: tanımdaki port; örn. "mem://ac" emülatör)
+    isolated      : Kartlar ayrı süreçte mi çalışsın (None: config.IO_WORKER_PROCESS)
+    registry      : BoardSpec listesi (None: config.BOARDS, bkz. board_registry.load_registry)
+    discovery     : port_discovery.PortDiscovery (None: config.PORT_DISCOVERY açıksa
+                    config.PORT_CACHE_FILE önbellekli arama, False: arama yok)
+    """
+    def __init__(self, telemetry_dir=None, transports=None, ports=None, isolated=None, registry=None,
+                 discovery=None):
+        transports = transports or {}
+        ports = ports or {}
+        isolated = cfg.IO_WORKER_PROCESS if isolated is None else isolated
+        specs = load_registry() if registry is None else list(registry)
+        specs = [spec._replace(port=ports[spec.name]) if spec.name in ports else spec for spec in specs]
+        if discovery is None and cfg.PORT_DISCOVERY:
+            discovery = PortDiscovery(os.path.join(BASE_DIR, cfg.PORT_CACHE_FILE))
+        self.discovery = discovery or None
+        if self.discovery is not None:
+            # Hazır transport verilen kartların portu kullanılmaz, aranmaz
+            specs = self.discovery.assign(specs, skip=transports)
+        self.specs = specs
+        store_class = CompressedTelemetryStore if cfg.TELEMETRY_COMPRESSED else TelemetryStore
+        telemetry_dir = telemetry_dir or os.path.join(BASE_DIR, cfg.TELEMETRY_DIR)
+        self.ports = {}
+
+        if isolated:
+            if transports:
+                raise ValueError("Ayrı süreçte hazır transport kullanılamaz; 'mem://' port adları verin")
+            # Kartlar, komut kuyruğu ve telemetri deposu G/Ç sürecindedir
+            self.worker = IOWorker(specs, telemetry_dir, store_class, link_stats=cfg.LINK_STATS_ENABLED)
+            self.boards = self.worker.boards
+            self.io_service = None
+            self.telemetry = None
+        else:
+            self.worker = None
+            self.boards = {spec.name: spec.create(transports.get(spec.name)) for spec in specs}
+            # Portlara TEK erişim noktası: ayar komutları önce, sorgular boş zamanda.
+            self.io_service = SerialIOService()
+            # Her yeni ölçüm kalıcı telemetri deposuna da yazılır
+            self.telemetry = store_class(telemetry_dir)
+            for name, board in self.boards.items():
+                board.recorders.append(self.telemetry.recorder(name))
+                board.enableLinkStats(cfg.LINK_STATS_ENABLED)
+        # Arayüz panelleri her tipin ilk kartını gösterir (yoksa None)
+        self.ac_api = self.primary("ac")
+        self.curtain_api = self.primary("curtain")
+
+        # Diğer süreçler durumu seri hatta dokunmadan buradan okur
+        self.snapshot = StateSnapshot(self.boards)
+        self.api = None
+
+    def start(self):
+        """Olay döngüsü thread'ini / G/Ç sürecini başlatır (kartlar henüz bağlı değil)."""
+        if self.worker is not None:
+            self.worker.start()
+        else:
+            self.io_service.start()
+
+    def connect(self):
+        """
+        Bağlı olmayan kartların portlarını açar ve hakeme bağlar.
+        Dönüş: kart adı -> bağlı mı.
+        """
+        if self.worker is not None:
+            for name, ok in self.worker.connect().items():
+                if ok and name not in self.ports:
+                    self.ports[name] = self.worker.port(name)
+        else:
+            # Portlar paralel açılır; hakeme tanım sırasıyla bağlanır
+            opened = open_boards({name: board for name, board in self.boards.items() if name not in self.ports})
+            for spec in self.specs:
+                if opened.get(spec.name):
+                    self.ports[spec.name] = self.io_service.attach(self.boards[spec.name], spec.poll_interval)
+        if self.discovery is not None:
+            # Açılamayan portun önbellek kaydı silinir: sonraki açılışta yeniden aranır
+            for spec in self.specs:
+                if spec.name not in self.ports:
+                    self.discovery.forget(spec.port)
+        return {name: name in self.ports for name in self.boards}
+
+    def serve(self, host=cfg.HTTP_API_HOST, port=cfg.HTTP_API_PORT):
+        """
+        Yerel HTTP API'yi başlatır. Port kullanımdaysa hata loglanır ve
+        servis API'siz devam eder. Dönüş: ApiServer veya None.
+        """
+        try:
+            self.api = ApiServer(self, host, port).start()
+        except OSError as e:
+            log.error("HTTP API başlatılamadı (%s:%s): %s", host, port, e)
+        return self.api
+
+    def port(self, name):
+        """Kartın PortArbiter'ı. Kart bağlı değilse None."""
+        return self.ports.get(name)
+
+    def primary_name(self, kind):
+        """Verilen tipteki ilk kartın adı (bkz. board_registry.BOARD_TYPES). Yoksa None."""
+        return next((spec.name for spec in self.specs if spec.kind == kind), None)
+
+    def primary(self, kind):
+        """Verilen tipteki ilk kart nesnesi. Yoksa None."""
+        name = self.primary_name(kind)
+        return None if name is None else self.boards[name]
+
+    def diagnostics(self):
+        """Kart adı -> hat sayaçları (bkz. link_stats.LinkStats.snapshot; kapalıysa None)."""
+        return {name: board.getLinkStats() for name, board in self.boards.items()}
+
+    def link_states(self):
+        """
+        Kart adı -> hat durumu (bkz. command_queue.PortArbiter.link_status).
+        Bağlı olmayan kartlar {"state": "offline"} döner.
+        """
+        if self.worker is not None:
+            live = self.worker.link_states()
+        else:
+            # connect() başka bir thread'de sürüyor olabilir: sözlüğün kopyası gezilir
+            live = {name: port.link_status() for name, port in list(self.ports.items())}
+        return {name: live.get(name) or {"state": LINK_OFFLINE} for name in self.boards}
+
+    def stop(self):
+        """Önce API'yi ve port işçilerini durdurur, sonra portları ve telemetri deposunu kapatır."""
+        if self.api is not None:
+            self.api.stop()
+            self.api = None
+        if self.worker is not None:
+            self.worker.stop()  # Portlar ve telemetri G/Ç sürecinde kapanır
+            self.ports.clear()
+            log.info("Servis durduruldu")
+            return
+        self.io_service.stop()
+        for name in list(self.ports):
+            self.boards[name].close()
+            del self.ports[name]
+        self.telemetry.close()  # Tampondaki son kayıtlar diske yazılır
+        log.info("Servis durduruldu")
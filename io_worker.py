@@ -0,0 +1,416 @@
+import concurrent.futures
+import itertools
+import logging
+import math
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - AYRI SÜREÇTE SERİ G/Ç (İSTEĞE BAĞLI)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Kart sorguları arayüz / API ile aynı yorumlayıcıda (GIL) çalışınca
+#           ağır bir çizim seri okumayı geciktirebilir. Bu modda kartlar,
+#           komut kuyruğu ve telemetri ayrı bir süreçte (IOWorker) çalışır:
+#             - Her durum kaydı paylaşılan belleğe (shared_memory) bir
+#               seqlock ile yazılır; ana süreç kaydı kopyalamadan, kilitsiz okur.
+#             - Ayar komutları ve cevapları bir pipe üzerinden gider.
+#             - Değişiklik bildirimleri (listeners) de pipe ile gelir.
+#             - Hat durumu ve sayaçları PUSH_INTERVAL'da bir gönderilir; ana
+#               süreç (arayüz thread'i) bunları beklemeli istekle sormaz.
+#             - Portların açılması (connect) ayrı bir thread'de yürür; mesaj
+#               döngüsü bu sırada da cevap verir.
+#           Ana süreçteki RemoteBoard / RemotePort nesneleri, arayüz ve HTTP
+#           API için normal kart / PortArbiter ile aynı arayüzü sunar.
+# ==============================================================================
+
+from automation_api import STALE_AFTER
+from board_registry import open_boards
+from command_queue import SerialIOService
+from timeseries import History
+import logger
+
+log = logging.getLogger("HomeAutomation.worker")
+
+SEQLOCK = struct.Struct("<Q")     # Çift: kayıt tutarlı, tek: yazma sürüyor
+WORKER_LOG_FILE = "io_worker.log" # Dosya döndürme süreçler arası güvenli değil: ayrı dosya
+CONNECT_TIMEOUT = 30.0            # Portları açma + hız pazarlığı + kalibrasyon (sn)
+STOP_TIMEOUT = 5.0
+PUSH_INTERVAL = 0.5               # Hat durumu ve sayaçları ana sürece bu aralıkla gönderilir (sn)
+READ_DEADLINE = 0.005             # Tek sayaçta bekleme sınırı (yazar yazarken ölmüş olabilir)
+
+
+def _record_struct(state):
+    """
+    Durum kaydının paylaşılan bellekteki biçimi:
+    seq, zaman, lastPollOk, alan değerleri (int -> q, diğerleri -> d),
+    alan zaman damgaları (time.monotonic; hiç alınmadıysa NaN).
+    """
+    codes = "".join("q" if type(getattr(state, f)) is int else "d" for f in state.FIELDS)
+    return struct.Struct(f"<Qd?{codes}{len(state.FIELDS)}d")
+
+
+class SharedState:
+    """
+    Paylaşılan bellekte tek kartın durum yuvası (seqlock + kayıt).
+    Tek yazar (G/Ç süreci), çok okuyucu. Okuyucu sayacı kayıttan önce ve
+    sonra okur; değişmişse veya tek ise (yazma sürüyor) tekrar dener.
+    Sayaç READ_DEADLINE boyunca tek kalırsa (yazar yazarken öldü) beklemeden
+    son okunan kayıt döner. Okunan kayıt sayaçla önbelleklenir: değişmediyse
+    aynı nesne döner.
+    """
+    def __init__(self, buf, offset, state_class, record):
+        self._buf = buf
+        self.offset = offset
+        self.state_class = state_class
+        self.record = record
+        self._write_seq = 0
+        self._read_seq = None
+        self._cached = None
+        self.retries = 0  # Yazmaya denk gelip tekrarlanan okuma sayısı
+        self.stalls = 0   # Sayaç tek kaldığı için son kaydın döndüğü okuma sayısı
+
+    @staticmethod
+    def slot_size(record):
+        size = SEQLOCK.size + record.size
+        return (size + 7) // 8 * 8  # Sayaç 8 byte hizalı kalsın
+
+    def write(self, state):
+        """G/Ç sürecinde her yeni kayıtta çağrılır (kartın stateSinks listesi)."""
+        fields = state.FIELDS
+        seq = self._write_seq + 1
+        SEQLOCK.pack_into(self._buf, self.offset, seq)  # Tek: okuyucular beklesin
+        self.record.pack_into(self._buf, self.offset + SEQLOCK.size, state.seq, state.time,
+                              bool(state.lastPollOk), *(getattr(state, f) for f in fields),
+                              *(math.nan if t is None else t for t in state.fieldTimes))
+        self._write_seq = seq + 1
+        SEQLOCK.pack_into(self._buf, self.offset, self._write_seq)  # Çift: kayıt hazır
+
+    def read(self):
+        """Son tutarlı kayıt (state_class nesnesi)."""
+        buf = self._buf
+        if buf is None:
+            return self._cached  # Yuva kapandı: son okunan kayıt
+        deadline = None
+        while True:
+            before = SEQLOCK.unpack_from(buf, self.offset)[0]
+            if before == self._read_seq:
+                return self._cached
+            if before & 1:
+                self.retries += 1
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + READ_DEADLINE
+                elif now >= deadline:
+                    self.stalls += 1
+                    return self._cached  # Yazma hiç bitmeyecek: son tutarlı kayıt
+                time.sleep(0)  # Yazar bitirsin
+                continue
+            values = self.record.unpack_from(buf, self.offset + SEQLOCK.size)
+            if SEQLOCK.unpack_from(buf, self.offset)[0] == before:
+                break
+            self.retries += 1
+        n = len(self.state_class.FIELDS)
+        seq, stamp, poll_ok = values[:3]
+        stamps = tuple(None if math.isnan(t) else t for t in values[3 + n:])
+        self._cached = self.state_class(seq, stamp, poll_ok, stamps, values[3:3 + n])
+        self._read_seq = before
+        return self._cached
+
+    def close(self, final_read=True):
+        """
+        Son kaydı önbelleğe alır ve belleği bırakır (paylaşılan bellek kapanmadan önce).
+        final_read=False: yazar sonlandırıldı / çöktü, yuva okunmaz (önbellek kalır).
+        """
+        if self._buf is not None:
+            if final_read:
+                self.read()
+            self._buf = None
+
+
+def _layout(specs):
+    """
+    specs: board_registry.BoardSpec listesi. Her iki süreçte aynı sonucu verir:
+    [(ad, kart nesnesi, yuva başlangıcı, kayıt biçimi)], toplam boyut.
+    """
+    out = []
+    offset = 0
+    for spec in specs:
+        board = spec.create()
+        record = _record_struct(board.state)
+        out.append((spec.name, board, offset, record))
+        offset += SharedState.slot_size(record)
+    return out, offset
+
+
+def _worker_main(specs, shm_name, conn, telemetry_dir, telemetry_class, link_stats):
+    """G/Ç sürecinin giriş noktası. Ana süreç kapanırsa (pipe kopar) kendisi de kapanır."""
+    logger.get_logger(log_file=WORKER_LOG_FILE)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            try:
+                conn.send(message)
+            except (OSError, ValueError):
+                pass  # Ana süreç gitti
+
+    def reply(rid, future):
+        try:
+            send(("reply", rid, True, future.result()))
+        except Exception as e:
+            send(("reply", rid, False, f"{type(e).__name__}: {e}"))
+
+    telemetry = telemetry_class(telemetry_dir)
+    layout, _ = _layout(specs)
+    boards = {}
+    slots = []
+    for name, board, offset, record in layout:
+        slot = SharedState(shm.buf, offset, board.STATE_CLASS, record)
+        slots.append(slot)
+        board.stateSinks.append(slot.write)
+        board.recorders.append(telemetry.recorder(name))
+        board.enableLinkStats(link_stats)
+        # Değişen alanlar ve yeni değerleri: ana süreç geçmişi (history) günceller, dinleyicileri çağırır
+        board.listeners.append(lambda b, fields, name=name: send(
+            ("changed", name, tuple(fields), time.time(), {f: getattr(b.state, f) for f in fields})))
+        boards[name] = board
+
+    intervals = {spec.name: spec.poll_interval for spec in specs}
+    io_service = SerialIOService()
+    ports = {}
+    connect_lock = threading.Lock()
+    connecting = []  # Süren bağlantı thread'leri (kapanışta beklenir)
+
+    def push():
+        # Hat durumu ve sayaçlar (kopya; port beklemez). Ana süreç son gelenleri
+        # önbellekte tutar: arayüz ve API okurken bu sürece soru sormaz.
+        send(("links", {name: port.link_status() for name, port in list(ports.items())},
+              {name: board.getLinkStats() for name, board in boards.items()}))
+
+    def connect(rid):
+        # Portların açılması OPEN_TIMEOUT sürebilir: mesaj döngüsü bu sırada
+        # ayar / sorgu isteklerine cevap vermeye devam eder.
+        with connect_lock:
+            opened = open_boards({name: board for name, board in boards.items() if name not in ports})
+            for name, ok in opened.items():
+                if ok:
+                    ports[name] = io_service.attach(boards[name], intervals[name])
+            push()
+            send(("reply", rid, True, {name: name in ports for name in boards}))
+
+    try:
+        next_push = time.monotonic()
+        while True:
+            try:
+                ready = conn.poll(max(0.0, next_push - time.monotonic()))
+                message = conn.recv() if ready else None
+            except (EOFError, OSError):
+                break
+            if time.monotonic() >= next_push:
+                push()
+                next_push = time.monotonic() + PUSH_INTERVAL
+            if message is None:
+                continue
+            kind, rid, args = message[0], message[1], message[2:]
+            if kind == "stop":
+                break
+            if kind == "connect":
+                thread = threading.Thread(target=connect, args=(rid,), name="IOWorkerConnect", daemon=True)
+                connecting[:] = [t for t in connecting if t.is_alive()] + [thread]
+                thread.start()
+                continue
+            port = ports.get(args[0])
+            if port is None:
+                send(("reply", rid, False, f"kart bağlı değil: {args[0]}"))
+            elif kind == "set":
+                port.submit_set(*args[1:]).add_done_callback(lambda f, rid=rid: reply(rid, f))
+            elif kind == "poll":
+                port.request_poll().add_done_callback(lambda f, rid=rid: reply(rid, f))
+    finally:
+        for thread in connecting:
+            thread.join()  # open_boards en fazla OPEN_TIMEOUT sürer
+        io_service.stop()
+        for name in ports:
+            boards[name].close()
+        telemetry.close()
+        for slot in slots:
+            slot.close()
+        shm.close()
+        logger.shutdown()
+
+
+class RemoteBoard:
+    """
+    G/Ç sürecindeki kartın ana süreçteki görünümü.
+    state      : paylaşılan bellekten okunan son kayıt (bkz. SharedState)
+    listeners  : değişiklik bildirimleri (kartlardaki ile aynı: f(kart, alanlar))
+    history    : değişen değerlerin geçmişi (trend okları için)
+    """
+    def __init__(self, name, board, slot, worker):
+        self.name = name
+        self.worker = worker
+        self.comPort = board.comPort
+        self.STATE_CLASS = board.STATE_CLASS
+        self.STATE_FIELDS = board.STATE_FIELDS
+        self.SETPOINTS = board.SETPOINTS
+        self.SETPOINT_RANGES = board.SETPOINT_RANGES
+        self.listeners = []
+        self.history = History()
+        self._slot = slot
+
+    @property
+    def state(self):
+        return self._slot.read()
+
+    @property
+    def lastPollOk(self):
+        return self._slot.read().lastPollOk
+
+    def isStale(self, field, maxAge=STALE_AFTER):
+        return self._slot.read().isStale(field, maxAge)
+
+    def snapshot(self):
+        return self._slot.read().asdict()
+
+    def getLinkStats(self):
+        """
+        G/Ç sürecinin en son gönderdiği hat sayaçları (en fazla PUSH_INTERVAL
+        eski; bekleme yok). Sayaçlar kapalıysa veya henüz gelmediyse None.
+        """
+        return self.worker._stats.get(self.name)
+
+    def _publish(self, fields):
+        for listener in self.listeners:
+            try:
+                listener(self, fields)
+            except Exception:
+                pass
+
+
+class RemotePort:
+    """G/Ç sürecindeki PortArbiter'ın vekili: aynı metotlar, aynı Future sonuçları."""
+    def __init__(self, worker, name):
+        self.worker = worker
+        self.name = name
+
+    def submit_set(self, field, value):
+        return self.worker._request("set", self.name, field, value)
+
+    def request_poll(self):
+        return self.worker._request("poll", self.name)
+
+
+class IOWorker:
+    """
+    Kartları ayrı bir süreçte çalıştırır (spawn: Windows ile aynı davranış).
+    specs          : board_registry.BoardSpec listesi (sorgu aralıkları dahil)
+    telemetry_dir  : Telemetri klasörü (depo G/Ç sürecinde açılır)
+    link_stats     : Kartların hat sayaçları açılsın mı (bkz. enableLinkStats)
+    """
+    def __init__(self, specs, telemetry_dir, telemetry_class, link_stats=False):
+        layout, size = _layout(specs)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.boards = {}
+        self._slots = []
+        for name, board, offset, record in layout:
+            slot = SharedState(self.shm.buf, offset, board.STATE_CLASS, record)
+            # Süreç açılana kadar varsayılan değerler görünsün. Sayaç sıfırlanır:
+            # G/Ç sürecindeki yazar 0'dan sayar (aynı sayaç değeri iki kez görülmesin).
+            slot.write(board.state)
+            SEQLOCK.pack_into(self.shm.buf, offset, 0)
+            slot.read()  # Önbellek hiç boş kalmasın (bkz. SharedState.read)
+            self._slots.append(slot)
+            self.boards[name] = RemoteBoard(name, board, slot, self)
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, name="IOWorker", daemon=True,
+                                   args=(specs, self.shm.name, child, telemetry_dir, telemetry_class,
+                                         link_stats))
+        self._child = child
+        self._pending = {}
+        self._links = {}  # G/Ç sürecinin son gönderdiği hat durumları (bkz. PortArbiter.link_status)
+        self._stats = {}  # ... ve hat sayaçları
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, name="IOWorkerReader", daemon=True)
+
+    def start(self):
+        self.process.start()
+        self._child.close()  # Uç artık G/Ç sürecinde; burada açık kalırsa kopma fark edilmez
+        self._reader.start()
+        log.info("G/Ç süreci başladı (pid %s)", self.process.pid)
+
+    def _request(self, kind, *args):
+        future = concurrent.futures.Future()
+        with self._lock:
+            rid = next(self._ids)
+            self._pending[rid] = future
+            try:
+                self._conn.send((kind, rid) + args)
+            except (OSError, ValueError) as e:
+                del self._pending[rid]
+                future.set_exception(RuntimeError(f"G/Ç süreci yok: {e}"))
+        return future
+
+    def _read_loop(self):
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == "changed":
+                _, name, fields, stamp, values = message
+                board = self.boards[name]
+                for field, value in values.items():
+                    board.history.record(field, stamp, value)
+                board._publish(set(fields))
+            elif message[0] == "links":
+                _, self._links, self._stats = message
+            elif message[0] == "reply":
+                _, rid, ok, result = message
+                with self._lock:
+                    future = self._pending.pop(rid, None)
+                if future is None:
+                    continue
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(RuntimeError(result))
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError("G/Ç süreci kapandı"))
+
+    def connect(self, timeout=CONNECT_TIMEOUT):
+        """Portları G/Ç sürecinde açar. Dönüş: kart adı -> bağlı mı."""
+        return self._request("connect").result(timeout)
+
+    def port(self, name):
+        return RemotePort(self, name)
+
+    def link_states(self):
+        """Bağlı kartların G/Ç sürecinden en son gelen hat durumu (bekleme yok)."""
+        return dict(self._links)
+
+    def stop(self):
+        """G/Ç sürecini durdurur (portlar ve telemetri orada kapanır), belleği bırakır."""
+        if self.process.is_alive():
+            self._request("stop")
+            self.process.join(STOP_TIMEOUT)
+            if self.process.is_alive():
+                log.error("G/Ç süreci kapanmadı, sonlandırılıyor")
+                self.process.terminate()
+                self.process.join()
+        self._reader.join(STOP_TIMEOUT)  # Süreç bitince pipe kopar, okuyucu çıkar
+        self._conn.close()
+        # Sonlandırılan / çöken süreç yuvayı yazma ortasında bırakmış olabilir
+        clean = self.process.exitcode == 0
+        for slot in self._slots:
+            slot.close(final_read=clean)
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,146 @@
+import bisect
+import time
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - HAT İSTATİSTİKLERİ (TEŞHİS)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Bir kartın seri hattındaki trafik ve hata sayaçları:
+#           gönderilen / alınan byte, zaman aşımı, eksik okuma, yazma ve okuma
+#           hataları, bozuk çerçeveler ve komut başına gidiş-dönüş süresi
+#           histogramı. Kart açık tutulduğu sürece sorgu thread'inde güncellenir;
+#           arayüz ve HTTP API snapshot() ile kopyasını okur.
+#           Kayıt işlemleri sadece sayaç artırır (liste / nesne üretmez);
+#           kapalıyken (kart.linkStats = None) hiç çağrılmaz.
+# ==============================================================================
+
+# Histogram kova üst sınırları (saniye). Son kova: en büyük sınırdan uzun süreler.
+LATENCY_BOUNDS = (0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+
+def command_label(commands):
+    """Komut byte'larının okunur hali: (6,) -> '0x06', (4, 3) -> '0x04 0x03'."""
+    return " ".join(f"0x{c:02X}" for c in commands)
+
+
+class LatencyHistogram:
+    """
+    Sabit kovalı süre histogramı. Yüzdelikler kova üst sınırıyla verilir
+    (taşma kovasında en uzun süre kullanılır); yani yaklaşık ve üstten sınırlıdır.
+    """
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        """Başka bir histogramın örneklerini ekler (örn. tüm kartların toplamı)."""
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """q (0-1) yüzdeliğinin üst sınırı (saniye). Örnek yoksa None."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return LATENCY_BOUNDS[i] if i < len(LATENCY_BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self):
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": self.total / count * 1000 if count else None,
+            "p50_ms": None if not count else min(self.percentile(0.50), self.max) * 1000,
+            "p99_ms": None if not count else min(self.percentile(0.99), self.max) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": list(self.counts),
+        }
+
+
+class LinkStats:
+    """
+    Tek bir kartın hat sayaçları. Tek yazar (kartın portuna o an erişen thread);
+    okuyucular snapshot() ile tutarlıya yakın bir kopya alır.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.time()
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.timeouts = 0      # Hiç cevap gelmeden süre doldu
+        self.short_reads = 0   # Cevabın bir kısmı geldi
+        self.write_errors = 0
+        self.read_errors = 0
+        self.bad_frames = 0    # Toplu cevap tam boyda geldi ama çözülemedi
+        self.last_error = None
+        self.round_trips = {}  # Komut byte'ları (tuple) -> LatencyHistogram
+
+    # --- KAYIT (sorgu thread'i) ---
+    def wrote(self, count):
+        self.bytes_out += count
+
+    def received(self, requested, data):
+        """Bir okuma sonucu: 'requested' byte istendi, 'data' geldi."""
+        got = len(data)
+        self.bytes_in += got
+        if got < requested:
+            if got:
+                self.short_reads += 1
+            else:
+                self.timeouts += 1
+
+    def round_trip(self, commands, seconds):
+        """Cevabı eksiksiz gelen bir isteğin süresi (yazmadan son byte'a kadar)."""
+        key = tuple(commands)
+        histogram = self.round_trips.get(key)
+        if histogram is None:
+            histogram = self.round_trips[key] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def write_failed(self, error):
+        self.write_errors += 1
+        self.last_error = f"yazma: {error}"
+
+    def read_failed(self, error):
+        self.read_errors += 1
+        self.last_error = f"okuma: {error}"
+
+    def bad_frame(self):
+        self.bad_frames += 1
+
+    # --- OKUMA (arayüz / API) ---
+    def snapshot(self):
+        """Sayaçların JSON'a çevrilebilir kopyası."""
+        return {
+            "since": self.started,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "timeouts": self.timeouts,
+            "short_reads": self.short_reads,
+            "write_errors": self.write_errors,
+            "read_errors": self.read_errors,
+            "bad_frames": self.bad_frames,
+            "last_error": self.last_error,
+            "bounds_ms": [b * 1000 for b in LATENCY_BOUNDS],
+            "round_trips": {command_label(key): h.snapshot() for key, h in list(self.round_trips.items())},
+        }
@@ -1,56 +1,207 @@
-============================================================================== 
-
-PROJE: NEXUS CONTROL HUB - LOGLAMA ALTYAPISI 
-
-YAZAR: Suude Kaynak- 152120211110 
-
-TARİH: 2025 
-
-AÇIKLAMA: Sistem olaylarını kaydeden, hata takibi yapan ve dosya/konsol 
-
-çıktılarını yöneten özelleştirilmiş loglama modülüdür. 
-
-============================================================================== 
-
-import logging from logging.handlers import RotatingFileHandler import os import sys 
-
-Logların kaydedileceği klasör 
-
-LOG_DIR = "logs" if not os.path.exists(LOG_DIR): os.makedirs(LOG_DIR) 
-
-def get_logger(name="HomeAutomation"): """ Rotating File Handler kullanan yapılandırılmış logger. """ logger = logging.getLogger(name) 
-
-# Eğer logger daha önce yapılandırıldıysa tekrar ekleme yapma 
-if logger.handlers: 
-   return logger 
- 
-logger.setLevel(logging.DEBUG) 
- 
-# Format Belirleme (Zaman | Seviye | Dosya:Satır | Mesaj) 
-log_formatter = logging.Formatter( 
-   '%(asctime)s | %(levelname)-8s | %(filename)s:%(lineno)d | %(message)s', 
-   datefmt='%Y-%m-%d %H:%M:%S' 
-) 
- 
-# Dosyaya Yazma (Rotating File Handler) 
-# 5 MB'a ulaşınca dosyayı yedekle (app.log.1), en fazla 3 yedek tut. 
-file_handler = RotatingFileHandler( 
-   os.path.join(LOG_DIR, "system.log"), 
-   maxBytes=5 * 1024 * 1024,  # 5 MB 
-   backupCount=3, 
-   encoding='utf-8' 
-) 
-file_handler.setFormatter(log_formatter) 
-file_handler.setLevel(logging.DEBUG) 
- 
-# Konsola Yazma 
-console_handler = logging.StreamHandler(sys.stdout) 
-console_handler.setFormatter(log_formatter) 
-console_handler.setLevel(logging.INFO)  # Konsolda sadece INFO ve üstünü göster 
- 
-# Handler'ları ekle 
-logger.addHandler(file_handler) 
-logger.addHandler(console_handler) 
- 
-return logger 
- 
\ No newline at end of file
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - LOGLAMA ALTYAPISI
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Sistem olaylarını kaydeden, hata takibi yapan ve dosya/konsol
+#           çıktılarını yöneten özelleştirilmiş loglama modülüdür.
+#           Kuyruklu modda (varsayılan) log çağrısı sadece kaydı bir kuyruğa
+#           bırakır; dosyaya yazma, dosya döndürme (rotation) ve konsol
+#           çıktısı tek bir arka plan thread'inde, toplu olarak yapılır.
+#           Böylece sorgu thread'indeki log çağrıları seri haberleşme
+#           zamanlamasını bozmaz.
+# ==============================================================================
+
+# Logların kaydedileceği klasör
+LOG_DIR = "logs"
+LOG_FILE = "system.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # 5 MB'a ulaşınca dosyayı yedekle (system.log.1)
+LOG_BACKUP_COUNT = 3             # En fazla 3 yedek tut
+LOG_BATCH = 256                  # Arka plan thread'inin tek seferde yazdığı en fazla kayıt
+
+# Format Belirleme (Zaman | Seviye | Dosya:Satır | Mesaj)
+LOG_FORMAT = '%(asctime)s | %(levelname)-8s | %(filename)s:%(lineno)d | %(message)s'
+LOG_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+
+class _DeferredFlushMixin:
+    """
+    StreamHandler her kayıttan sonra flush() çağırır. Toplu yazma sırasında
+    (hold=True) bu çağrı atlanır; toplu yazmanın sonunda bir kez flush edilir.
+    """
+    hold = False
+
+    def flush(self):
+        if not self.hold:
+            super().flush()
+
+
+class _BatchRotatingFileHandler(_DeferredFlushMixin, RotatingFileHandler):
+    pass
+
+
+class _BatchStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+
+class LogPipeline:
+    """
+    Kuyruk tabanlı log hattı.
+    Sıcak yol (herhangi bir thread): QueueHandler kaydı kilitsiz
+    queue.SimpleQueue'ya bırakır, G/Ç yapmaz.
+    Arka plan thread'i: kuyruktaki kayıtları LOG_BATCH'lik gruplar halinde
+    alır, handler'lara yazar ve grup sonunda bir kez flush eder.
+    stop() bekleyen tüm kayıtları yazdıktan sonra dosyaları kapatır.
+    """
+    _STOP = object()  # Thread'e çıkış işareti
+
+    def __init__(self, handlers, batch=LOG_BATCH):
+        self.handlers = handlers
+        self.batch = batch
+        self.queue = queue.SimpleQueue()
+        self.handler = QueueHandler(self.queue)
+        self.written = 0   # Yazılan kayıt
+        self.batches = 0   # Yapılan toplu yazma (flush) sayısı
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="LogPipeline", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            records = [self.queue.get()]  # Kayıt gelene kadar bekle
+            while len(records) < self.batch:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            markers = [r for r in records if not isinstance(r, logging.LogRecord)]
+            self._write([r for r in records if isinstance(r, logging.LogRecord)])
+            for marker in markers:
+                if marker is self._STOP:
+                    return
+                marker.set()  # flush() bekleyen çağırana haber ver
+
+    def _write(self, records):
+        if not records:
+            return
+        for handler in self.handlers:
+            handler.hold = True
+        try:
+            for record in records:
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+        finally:
+            for handler in self.handlers:
+                handler.hold = False
+                handler.flush()
+        self.written += len(records)
+        self.batches += 1
+
+    def flush(self, timeout=None):
+        """Şu ana kadar kuyruğa giren kayıtlar yazılana kadar bekler."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)  # Kuyruk sıralı: işaret yazıldığında öncekiler de yazılmıştır
+        done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Bekleyen kayıtları yazar, thread'i durdurur ve handler'ları kapatır."""
+        if self._thread is not None:
+            self.queue.put(self._STOP)
+            self._thread.join(timeout)
+            self._thread = None
+        for handler in self.handlers:
+            handler.close()
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def _build_handlers(log_dir, log_file=LOG_FILE):
+    """Dosya (döndürmeli) ve konsol handler'ları. Toplu yazmaya uygun alt sınıflardır."""
+    os.makedirs(log_dir, exist_ok=True)
+    log_formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT)
+
+    # Dosyaya Yazma (Rotating File Handler)
+    file_handler = _BatchRotatingFileHandler(
+        os.path.join(log_dir, log_file),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(log_formatter)
+    file_handler.setLevel(logging.DEBUG)
+
+    # Konsola Yazma
+    console_handler = _BatchStreamHandler(sys.stdout)
+    console_handler.setFormatter(log_formatter)
+    console_handler.setLevel(logging.INFO)  # Konsolda sadece INFO ve üstünü göster
+
+    return [file_handler, console_handler]
+
+
+def get_pipeline(log_dir=LOG_DIR, log_file=LOG_FILE):
+    """
+    Süreç genelindeki tek log hattı (ilk çağrıda oluşturulur ve başlatılır).
+    Her süreç kendi dosyasına yazmalıdır: dosya döndürme süreçler arası güvenli değildir.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LogPipeline(_build_handlers(log_dir, log_file))
+            _pipeline.start()
+            atexit.register(shutdown)
+        return _pipeline
+
+
+def get_logger(name="HomeAutomation", queued=True, log_dir=LOG_DIR, log_file=LOG_FILE):
+    """
+    Yapılandırılmış logger.
+    queued=True : kayıtlar LogPipeline üzerinden arka planda yazılır (önerilen).
+    queued=False: eski davranış; handler'lar logger'a doğrudan eklenir ve
+                  her log çağrısı dosyaya o thread'de yazar.
+    Alt logger'lar (örn. "HomeAutomation.api") kayıtlarını buraya iletir.
+    """
+    logger = logging.getLogger(name)
+
+    # Eğer logger daha önce yapılandırıldıysa tekrar ekleme yapma
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(logging.DEBUG)
+    if queued:
+        logger.addHandler(get_pipeline(log_dir, log_file).handler)
+    else:
+        for handler in _build_handlers(log_dir, log_file):
+            logger.addHandler(handler)
+    return logger
+
+
+def shutdown():
+    """
+    Bekleyen kayıtları diske yazar ve log hattını kapatır (örn. pencere
+    kapanırken). Hattın handler'ı logger'lardan çıkarılır; sonraki
+    get_logger() çağrısı yeni bir hat kurar.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        pipeline, _pipeline = _pipeline, None
+    if pipeline is None:
+        return
+    for logger in logging.Logger.manager.loggerDict.values():
+        if isinstance(logger, logging.Logger) and pipeline.handler in logger.handlers:
+            logger.removeHandler(pipeline.handler)
+    pipeline.stop()
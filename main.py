@@ -1,18 +1,24 @@
-import customtkinter as ctk
+import time
+STARTED = time.perf_counter()  # Soğuk başlangıç ölçümü için: içe aktarmalardan önce
+import argparse
+import sys
 
 # ==============================================================================
 # PROJE: NEXUS CONTROL HUB - ANA BAŞLATICI (ENTRY POINT)
-# YAZAR: [Senin Adın]
+# YAZAR: Suude Kaynak - 152120211110
 # TARİH: 2025
 # AÇIKLAMA: Bu dosya uygulamanın çalıştırılacağı ana dosyadır (main.py).
-#           Arayüz kodlarını (GUI) modüler tutmak için ayrı bir dosyadan çağırır.
+#           python main.py             -> Pencereli arayüz (gui_app)
+#           python main.py --headless  -> Ekransız servis (daemon)
+#           Arayüz kütüphaneleri sadece pencereli modda içe aktarılır.
 # ==============================================================================
 
-# "modern_home_automation_gui.py" dosyasının içindeki ana sınıfı (Class) dahil ediyoruz.
-# Böylece binlerce satır kodu tek dosyada tutmak yerine parçalara bölmüş oluyoruz.
-from modern_home_automation_gui import ModernHomeAutomationGUI
 
-if __name__ == "__main__":
+def run_gui():
+    # customtkinter ve arayüz modülü SADECE burada yüklenir
+    import customtkinter as ctk
+    from gui_app import ModernHomeAutomationGUI
+
     # 1. Ana Pencere Nesnesini (Root) Oluştur
     # CustomTkinter'ın temel pencere yapısını başlatır.
     app = ctk.CTk()
@@ -20,8 +26,24 @@ if __name__ == "__main__":
     # 2. Uygulama Arayüzünü Yükle
     # Oluşturduğumuz pencereyi (app), diğer dosyadaki sınıfa parametre olarak gönderiyoruz.
     # Bu işlem, tüm butonları, etiketleri ve tasarımı pencereye yerleştirir.
-    gui = ModernHomeAutomationGUI(app)
+    ModernHomeAutomationGUI(app)
 
     # 3. Sonsuz Döngüyü Başlat (Main Loop)
     # Bu komut, kullanıcı pencereyi kapatana kadar programın açık kalmasını sağlar.
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NEXUS CONTROL HUB")
+    parser.add_argument("--headless", action="store_true",
+                        help="Pencere açmadan servis olarak çalış (Tk gerekmez)")
+    args = parser.parse_args(argv)
+    if args.headless:
+        import daemon
+        return daemon.run(started=STARTED)
+    return run_gui()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PORT KEŞFİ (OTOMATİK BULMA)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Portu "auto" yazılan ya da bu bilgisayarda bulunmayan kartlar için
+#           aday seri portları (Linux: /dev/ttyUSB*, /dev/ttyACM*, ham moddaki
+#           pty'ler) PARALEL yoklar ve kart tipini zararsız iki sorguya verilen
+#           cevaptan tanır:
+#             0x08 (CMD_CUR_GET_LIGHT_INT) : perde kartı cevap verir, klima
+#                                            tanımaz (ISR_EXIT)
+#             0x05 (CMD_AC_GET_FAN_SPEED)  : ikisi de cevap verir
+#           -> 2 byte: perde, 1 byte: klima, 0 byte: kart değil / cevap yok.
+#           Ayar başlıkları (10xxxxxx / 11xxxxxx) hiç gönderilmez.
+#           Bulunan eşleşme cihaz kimliği ve aygıt düğümünün ctime'ı ile
+#           birlikte önbellek dosyasına yazılır; gereken kartlar önbellekte
+#           varsa sonraki açılışta yoklama yapılmaz. Aynı numarayla yeniden
+#           yaratılan düğüm (örn. başka bir pty'nin aldığı /dev/pts/N) yeni
+#           ctime'ı yüzünden yeniden yoklanır.
+# ==============================================================================
+
+from automation_api import BAUD_DEFAULT, CMD_AC_GET_FAN_SPEED, CMD_CUR_GET_LIGHT_INT, PACING_DEFAULT
+from transport import SCHEME_MEMORY, SCHEME_PTY, make_transport
+import config as cfg
+
+log = logging.getLogger("HomeAutomation.discovery")
+
+AUTO_PORT = "auto"            # config'de port yerine yazılırsa port aranır
+PROBE_COMMANDS = (CMD_CUR_GET_LIGHT_INT, CMD_AC_GET_FAN_SPEED)
+REPLY_KINDS = {2: "curtain", 1: "ac"}  # Cevap byte sayısı -> kart tipi
+PROBE_TIMEOUT = 0.15          # Bir portun cevabını bekleme süresi (sn)
+PROBE_PACING = PACING_DEFAULT  # Yoklama byte'ları arası (kart henüz ölçülmedi)
+PROBE_WORKERS = 32            # Aynı anda yoklanan en fazla port (thread'ler select'te bekler)
+BY_ID_DIR = "/dev/serial/by-id"  # USB adaptörlerinin kalıcı adları (udev)
+CACHE_VERSION = 2             # 2: kayıtlarda düğüm ctime'ı
+
+
+def _natural_key(port):
+    """'/dev/pts/10' -> '/dev/pts/9'dan sonra gelsin."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", port)]
+
+
+def _own_terminals():
+    """Bu sürecin kendi terminali (hiç yoklanmaz)."""
+    names = set()
+    for fd in (0, 1, 2):
+        try:
+            if os.isatty(fd):
+                names.add(os.ttyname(fd))
+        except OSError:
+            pass
+    return names
+
+
+def _is_raw_pty(port):
+    """
+    pty ucu ham modda mı (ICANON kapalı)? Açık bir kabuk terminali kanonik
+    moddadır; emülatör / socat / sanal port köprüleri ham moddadır. Kontrol
+    sadece termios okur; porta yazmaz ve ayarlarını değiştirmez.
+    """
+    import termios
+    try:
+        fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    except OSError:
+        return False
+    try:
+        return not termios.tcgetattr(fd)[3] & termios.ICANON
+    except termios.error:
+        return False
+    finally:
+        os.close(fd)
+
+
+def candidate_ports(patterns=None):
+    """
+    Yoklanacak port adları (doğal sırayla).
+    Linux'ta 'patterns' (None: config.DISCOVERY_PATTERNS) ile eşleşen cihazlar;
+    diğer sistemlerde pyserial'ın listelediği portlar.
+    """
+    if not sys.platform.startswith("linux"):
+        try:
+            from serial.tools import list_ports
+        except ImportError:
+            return []
+        return sorted((p.device for p in list_ports.comports()), key=_natural_key)
+    own = _own_terminals()
+    ports = set()
+    for pattern in cfg.DISCOVERY_PATTERNS if patterns is None else patterns:
+        for port in glob.glob(pattern):
+            if port in own or (port.startswith("/dev/pts/") and not _is_raw_pty(port)):
+                continue
+            ports.add(port)
+    return sorted(ports, key=_natural_key)
+
+
+def device_id(port):
+    """
+    Portun arkasındaki cihazın kimliği: USB adaptörünün kalıcı adı (by-id)
+    yoksa aygıt numarası. Port yoksa None. Adaptör başka bir ttyUSB numarası
+    alsa da kimliği aynı kalır; aynı numaraya başka adaptör gelirse değişir.
+    """
+    try:
+        rdev = os.stat(port).st_rdev
+    except OSError:
+        return None
+    real = os.path.realpath(port)
+    for link in glob.glob(os.path.join(BY_ID_DIR, "*")):
+        if os.path.realpath(link) == real:
+            return os.path.basename(link)
+    return f"{os.major(rdev)}:{os.minor(rdev)}"
+
+
+def node_ctime(port):
+    """
+    Aygıt düğümünün ctime'ı (ns). Düğüm yeniden yaratılınca (pty numarası
+    yeniden kullanıldı, adaptör çıkarılıp takıldı) değişir; porta okuma /
+    yazma değiştirmez. Port yoksa None.
+    """
+    try:
+        return os.stat(port).st_ctime_ns
+    except OSError:
+        return None
+
+
+def fingerprint(port, timeout=PROBE_TIMEOUT):
+    """
+    Portu varsayılan hızda açar, yoklama sorgularını gönderir ve kart tipini
+    döner ("ac" / "curtain"). Port açılamazsa veya tanınmazsa None.
+    Hız pazarlığıyla başka hızda kalmış klima kartı ilk byte'ı çerçeve hatası
+    sayıp varsayılan hıza döner; ikinci sorguya yine cevap verir.
+    """
+    try:
+        link = make_transport(port, BAUD_DEFAULT, timeout)
+        link.open()
+    except Exception as e:
+        log.debug("Yoklama: %s açılamadı (%s)", port, e)
+        return None
+    try:
+        link.reset_input_buffer()
+        for cmd in PROBE_COMMANDS:
+            link.write(bytes([cmd]))
+            time.sleep(PROBE_PACING)
+        reply = link.read(len(PROBE_COMMANDS))
+    except Exception as e:
+        log.debug("Yoklama: %s hatası (%s)", port, e)
+        return None
+    finally:
+        link.close()
+    return REPLY_KINDS.get(len(reply))
+
+
+def port_missing(port):
+    """Emülatör olmayan ve bu bilgisayarda bulunmayan port mu? ("COM1" Linux'ta yoktur)"""
+    if port.startswith((SCHEME_MEMORY, SCHEME_PTY)):
+        return False
+    if os.name == "posix":
+        return not os.path.exists(port)
+    return port not in candidate_ports()
+
+
+class PortDiscovery:
+    """
+    Aday portları paralel yoklar ve sonucu önbellekte tutar.
+    cache_path : Önbellek dosyası (None: önbellek yok, her seferinde yoklanır)
+    candidates : Sabit aday listesi (None: candidate_ports() ile bulunur)
+    timeout    : Port başına cevap bekleme süresi (sn)
+    workers    : Aynı anda yoklanan en fazla port
+    """
+    def __init__(self, cache_path=None, candidates=None, timeout=PROBE_TIMEOUT, workers=PROBE_WORKERS):
+        self.cache_path = cache_path
+        self.candidates = candidates
+        self.timeout = timeout
+        self.workers = workers
+        self.probed = 0  # Son scan() içinde gerçekten yoklanan port sayısı
+        self._cache = self._load_cache()
+
+    # --- ÖNBELLEK (port -> tip, cihaz kimliği) ---
+    def _load_cache(self):
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("ports", {})
+
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "ports": self._cache}, f, indent=2)
+        os.replace(tmp, self.cache_path)  # Yarım yazılmış önbellek kalmasın
+
+    def forget(self, port):
+        """Port açılamadı / kart cevap vermedi: bir sonraki aramada yeniden yoklanır."""
+        if self._cache.pop(port, None) is not None:
+            self._save_cache()
+
+    # --- ARAMA ---
+    def scan(self, need=None, exclude=()):
+        """
+        Kart tipi tanınan portlar: port -> tip (doğal sırayla).
+        need    : tip -> gereken kart sayısı. Önbellekteki (kimliği ve düğüm
+                  ctime'ı hâlâ tutan) portlar bunu karşılıyorsa hiç yoklama yapılmaz.
+        exclude : Yoklanmayacak portlar (örn. başka kartın zaten açtığı portlar)
+        """
+        ports = [p for p in (candidate_ports() if self.candidates is None else self.candidates)
+                 if p not in exclude]
+        ids = {port: device_id(port) for port in ports}
+        ctimes = {port: node_ctime(port) for port in ports}
+        found = {}
+        for port in ports:
+            entry = self._cache.get(port)
+            if (entry is not None and ids[port] is not None and entry.get("id") == ids[port]
+                    and entry.get("ctime") == ctimes[port]):
+                found[port] = entry["kind"]
+        self.probed = 0
+        if need is None or any(list(found.values()).count(kind) < n for kind, n in need.items()):
+            unknown = [port for port in ports if port not in found and ids[port] is not None]
+            self.probed = len(unknown)
+            if unknown:
+                started = time.perf_counter()
+                with ThreadPoolExecutor(min(self.workers, len(unknown)), "PortProbe") as pool:
+                    kinds = list(pool.map(lambda port: fingerprint(port, self.timeout), unknown))
+                log.info("Port keşfi: %d port %.0f ms'de yoklandı", len(unknown),
+                         (time.perf_counter() - started) * 1000)
+                for port, kind in zip(unknown, kinds):
+                    if kind is not None:
+                        found[port] = kind
+                        self._cache[port] = {"kind": kind, "id": ids[port], "ctime": ctimes[port],
+                                             "seen": time.time()}
+                self._save_cache()
+        return {port: found[port] for port in sorted(found, key=_natural_key)}
+
+    def assign(self, specs, skip=()):
+        """
+        Portu "auto" olan veya bulunmayan kartlara aynı tipte bulunan portları
+        sırayla atar. Dönüş: yeni BoardSpec listesi (bulunamayanlar aynen kalır).
+        skip: aranmayacak kart adları (örn. hazır transport verilenler).
+        """
+        wanted = [spec for spec in specs
+                  if spec.name not in skip and (spec.port == AUTO_PORT or port_missing(spec.port))]
+        if not wanted:
+            return list(specs)
+        need = {}
+        for spec in wanted:
+            need[spec.kind] = need.get(spec.kind, 0) + 1
+        taken = {spec.port for spec in specs if spec not in wanted}
+        free = self.scan(need, exclude=taken)
+        out = []
+        for spec in specs:
+            if spec in wanted:
+                port = next((p for p, kind in free.items() if kind == spec.kind), None)
+                if port is None:
+                    log.warning("Kart %s (%s): port bulunamadı (%s)", spec.name, spec.kind, spec.port)
+                else:
+                    log.info("Kart %s (%s): %s -> %s", spec.name, spec.kind, spec.port, port)
+                    del free[port]
+                    spec = spec._replace(port=port)
+            out.append(spec)
+        return out
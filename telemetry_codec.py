@@ -0,0 +1,351 @@
+import struct
+import time
+from bisect import bisect_left
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SIKIŞTIRILMIŞ TELEMETRİ SEGMENTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Kart değerleri yavaş değişir ve ondalık (0.1) hassasiyetindedir
+#           (amb_int + amb_frac/10, p_int*10 + p_frac, l_int*10). Ham kayıt
+#           (16 byte) yerine her kanal ayrı bir akış olarak bloklara yazılır:
+#             - zaman: 10 ms birimli, farkın farkı (delta-of-delta),
+#             - değer: 0.1 birimli tam sayı, fark (delta),
+#             - ikisi de zigzag; küçükse TEK byte, aynıysa tek byte'lık tekrar,
+#               büyükse varint.
+#           Her bloğun başlığı (kanal, ilk/son zaman) okunarak dosya içinde
+#           blok blok atlanabilir; sadece istenen aralıktaki bloklar çözülür.
+#           Bloklar BLOCK_SAMPLES örnekte veya en geç BLOCK_MAX_AGE saniyede
+#           diske yazılır: çökmede kanal başına en fazla bu kadar veri kaybolur.
+#           Yeniden açılışta yarım yazılmış son blok kesilip atılır.
+# ==============================================================================
+
+from telemetry_store import HEADER, RECORD, Segment, TelemetryStore
+
+TIME_UNIT = 0.01      # Zaman çözünürlüğü (saniye). 2 Hz sorguda sapma çoğunlukla 0-1 birim
+VALUE_SCALE = 10      # Değerler 0.1 hassasiyetle saklanır
+BLOCK_SAMPLES = 1024  # Bir bloktaki en fazla örnek (2 Hz'de ~8.5 dakika)
+BLOCK_MAX_AGE = 30.0  # Bitmemiş bloklar en geç bu kadar saniyede bir diske yazılır
+
+# Blok başlığı: eşitleme, kart id, kanal id, örnek sayısı, veri uzunluğu,
+#               ilk zaman, son zaman (TIME_UNIT), ilk değer (VALUE_SCALE)
+BLOCK = struct.Struct("<2sHHHIqqq")
+BLOCK_SYNC = b"\xa5\x5a"
+CODEC_MAGIC = b"NXTZ"
+CODEC_SUFFIX = ".tlz"
+
+# Örnek kodları (ilk örnekten sonraki her örnek için):
+#   1vvv tttt : zigzag(değer farkı) < 8 ve zigzag(zaman farkının farkı) < 16
+#   01nn nnnn : n+1 örnek (1-64) boyunca zaman adımı ve değer aynı
+#   0000 0000 : kaçış; ardından varint(zigzag(dod)), varint(zigzag(dv))
+CODE_SHORT = 0x80
+CODE_RUN = 0x40
+CODE_ESCAPE = 0x00
+RUN_MAX = 64
+
+
+def zigzag(n):
+    """İşaretli tam sayıyı küçük pozitif sayıya eşler: 0,-1,1,-2 -> 0,1,2,3."""
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def unzigzag(z):
+    return (z >> 1) if not z & 1 else -((z + 1) >> 1)
+
+
+def put_varint(out, n):
+    """Negatif olmayan tam sayıyı 7'şer bitlik gruplar halinde ekler."""
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def get_varint(buf, pos):
+    """(değer, sonraki konum) döner."""
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class BlockEncoder:
+    """
+    Tek bir kanal (kart, kanal) için akış kodlayıcı.
+    add() blok dolunca bloğun byte'larını, dolmadıysa None döner.
+    """
+    def __init__(self, board_id, channel_id):
+        self.board_id = board_id
+        self.channel_id = channel_id
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.payload = bytearray()
+        self.first_time = self.last_time = self.first_value = None
+        self._delta = 0
+        self._value = 0
+        self._run = 0
+
+    def add(self, tick, value):
+        """tick: zaman (TIME_UNIT), value: değer (VALUE_SCALE) - ikisi de tam sayı."""
+        if self.count == 0:
+            self.first_time = self.last_time = tick
+            self.first_value = self._value = value
+            self.count = 1
+            return None
+        delta = tick - self.last_time
+        dod = zigzag(delta - self._delta)
+        dv = zigzag(value - self._value)
+        if dod == 0 and dv == 0:
+            self._run += 1
+            if self._run == RUN_MAX:
+                self._flush_run()
+        else:
+            self._flush_run()
+            if dod < 16 and dv < 8:
+                self.payload.append(CODE_SHORT | (dv << 4) | dod)
+            else:
+                self.payload.append(CODE_ESCAPE)
+                put_varint(self.payload, dod)
+                put_varint(self.payload, dv)
+        self._delta = delta
+        self.last_time = tick
+        self._value = value
+        self.count += 1
+        if self.count >= BLOCK_SAMPLES:
+            return self.finish()
+        return None
+
+    def _flush_run(self):
+        if self._run:
+            self.payload.append(CODE_RUN | (self._run - 1))
+            self._run = 0
+
+    def peek(self):
+        """Bitmemiş bloğun o anki hali (kodlayıcıyı değiştirmez). Boşsa None."""
+        if not self.count:
+            return None
+        payload = bytes(self.payload)
+        if self._run:
+            payload += bytes([CODE_RUN | (self._run - 1)])
+        return BLOCK.pack(BLOCK_SYNC, self.board_id, self.channel_id, self.count, len(payload),
+                          self.first_time, self.last_time, self.first_value) + payload
+
+    def finish(self):
+        """Bloğu kapatıp byte'larını döner (boşsa None) ve yeni bloğa hazırlanır."""
+        block = self.peek()
+        self._reset()
+        return block
+
+
+# Tek byte'lık kodların (zaman farkı değişimi, değer değişimi) önceden hesaplanmış tablosu
+_SHORT_CODES = [(unzigzag(c & 0x0F), unzigzag((c >> 4) & 0x07)) if c & CODE_SHORT else None
+                for c in range(256)]
+
+
+def decode_block(buf, offset=0):
+    """
+    'offset'teki bloğu çözer: (zamanlar, değerler) tam sayı listeleri.
+    Zaman TIME_UNIT, değer VALUE_SCALE biriminde.
+    """
+    _, _, _, _, length, tick, _, value = BLOCK.unpack_from(buf, offset)
+    pos = offset + BLOCK.size
+    data = bytes(buf[pos:pos + length])  # Byte erişimi bytes üzerinde en hızlısı
+    times = [tick]
+    values = [value]
+    delta = 0
+    pos, end = 0, len(data)
+    short = _SHORT_CODES
+    while pos < end:
+        code = data[pos]
+        pos += 1
+        step = short[code]
+        if step is not None:
+            delta += step[0]
+            value += step[1]
+        elif code & CODE_RUN:
+            n = (code & 0x3F) + 1
+            times.extend(range(tick + delta, tick + delta * n + 1, delta) if delta else [tick] * n)
+            values.extend([value] * n)
+            tick += delta * n
+            continue
+        else:
+            dod, pos = get_varint(data, pos)
+            dv, pos = get_varint(data, pos)
+            delta += unzigzag(dod)
+            value += unzigzag(dv)
+        tick += delta
+        times.append(tick)
+        values.append(value)
+    return times, values
+
+
+class CompressedSegment(Segment):
+    """
+    Sıkıştırılmış segment. Blok dizini (kanal -> [(son zaman, ilk zaman, konum)])
+    blok başlıkları okunarak çıkarılır; kapanmış segmentte bir kez, açık
+    segmentte sadece yeni eklenen bloklar için.
+    """
+    RECORD_SIZE = 1  # Bloklar değişken uzunluklu; yarım blok index() içinde atlanır
+
+    def __init__(self, path, start_time):
+        super().__init__(path, start_time)
+        self._index = {}
+        self._indexed = 0  # Dizine alınmış byte sayısı (başlık hariç)
+        self._latest = start_time
+
+    def index(self, sealed):
+        view = self.view(sealed)
+        pos = self._indexed
+        while pos + BLOCK.size <= len(view):
+            sync, board_id, channel_id, _, length, first, last, _ = BLOCK.unpack_from(view, pos)
+            if sync != BLOCK_SYNC or pos + BLOCK.size + length > len(view):
+                break  # Yarım yazılmış son blok
+            self._index.setdefault((board_id, channel_id), []).append((last, first, pos))
+            self._latest = max(self._latest, last * TIME_UNIT)
+            pos += BLOCK.size + length
+        self._indexed = pos
+        return self._index, view
+
+    def valid_length(self):
+        """Başlık + tam bloklar (yarım / bozuk son blok hariç)."""
+        if self.size <= HEADER.size:
+            return self.size
+        self.index(sealed=False)
+        return HEADER.size + self._indexed
+
+    def last_time(self, sealed):
+        self.index(sealed)
+        return self._latest
+
+    def samples(self, series, start_tick, end_tick, sealed):
+        """
+        Bir kanalın [start_tick, end_tick) aralığındaki örnekleri.
+        Blok dizininde ikili arama ile ilk ilgili bloğa atlanır.
+        """
+        index, view = self.index(sealed)
+        blocks = index.get(series, [])
+        i = bisect_left(blocks, (start_tick,))
+        for last, first, pos in blocks[i:]:
+            if first >= end_tick:
+                break
+            yield from _in_range(*decode_block(view, pos), start_tick, end_tick)
+
+
+def _in_range(times, values, start_tick, end_tick):
+    for t, v in zip(times, values):
+        if start_tick <= t < end_tick:
+            yield t, v
+
+
+class CompressedTelemetryStore(TelemetryStore):
+    """
+    TelemetryStore ile aynı arayüz (append / recorder / query / flush / close),
+    aynı segment devri ve saklama bütçeleri; segmentler sıkıştırılmış bloklardır.
+    Her kanalın bitmemiş bloğu bellekte tutulur; sorgular onu da görür.
+    Bitmemiş bloklar en geç BLOCK_MAX_AGE saniyede (örnek zamanı), flush()
+    ve close() ile diske yazılır.
+    """
+    SEGMENT_CLASS = CompressedSegment
+    SEGMENT_MAGIC = CODEC_MAGIC
+    SEGMENT_RECORD_SIZE = 0  # Değişken uzunluklu
+    SEGMENT_SUFFIX = CODEC_SUFFIX
+
+    def __init__(self, directory, **kwargs):
+        self._encoders = {}
+        self._seal_at = None  # Bitmemiş blokların diske yazılacağı örnek zamanı
+        super().__init__(directory, **kwargs)
+
+    def append(self, board, channel, value, timestamp=None):
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            now = max(now, self._last_time)
+            if self._needs_roll(now):
+                self._roll(now)
+            series = (self._id("boards", board, True), self._id("channels", channel, True))
+            encoder = self._encoders.get(series)
+            if encoder is None:
+                encoder = self._encoders[series] = BlockEncoder(*series)
+            block = encoder.add(round(now / TIME_UNIT), round(value * VALUE_SCALE))
+            if block is not None:
+                self._file.write(block)
+                self._file.flush()
+            self._last_time = now
+            if self._seal_at is None:
+                self._seal_at = now + BLOCK_MAX_AGE
+            elif now >= self._seal_at:
+                self._write_pending()
+
+    def _write_pending(self):
+        for encoder in self._encoders.values():
+            block = encoder.finish()
+            if block is not None:
+                self._file.write(block)
+        self._file.flush()
+        self._seal_at = None
+
+    def _roll(self, now):
+        if self._file is not None:
+            self._write_pending()  # Bitmemiş bloklar eski segmentte kalır
+        super()._roll(now)
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._write_pending()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+    def _rows(self, start, end, series=None):
+        """
+        [start, end) aralığındaki örnekler: (tick, (kart id, kanal id), değer).
+        series verilmezse tüm kanallar. Her kanalın örnekleri kendi içinde sıralıdır.
+        """
+        start_tick = round(start / TIME_UNIT) if start != float("-inf") else float("-inf")
+        end_tick = round(end / TIME_UNIT) if end != float("inf") else float("inf")
+        with self._lock:
+            segments = list(self.segments)
+            pending = [(key, encoder.peek()) for key, encoder in self._encoders.items()
+                       if series is None or key == series]
+        rows = []
+        for i, segment in enumerate(segments):
+            sealed = i + 1 < len(segments)
+            if sealed and segments[i + 1].start_time < start:
+                continue
+            if segment.start_time >= end:
+                break
+            keys = [series] if series is not None else list(segment.index(sealed)[0])
+            for key in keys:
+                rows.extend((t, key, v) for t, v in segment.samples(key, start_tick, end_tick, sealed))
+        for key, block in pending:
+            if block is not None:
+                rows.extend((t, key, v) for t, v in _in_range(*decode_block(block), start_tick, end_tick))
+        return rows
+
+    def scan(self, start, end):
+        """
+        TelemetryStore.scan ile aynı biçim: [start, end) kayıtları RECORD olarak,
+        zamana göre sıralı. Bloklar çözülüp paketlenir (kopyasız değildir).
+        """
+        rows = self._rows(start, end)
+        if not rows:
+            return []
+        rows.sort(key=lambda row: row[0])
+        out = bytearray(len(rows) * RECORD.size)
+        for i, (tick, (board_id, channel_id), value) in enumerate(rows):
+            RECORD.pack_into(out, i * RECORD.size, tick * TIME_UNIT, board_id, channel_id, value / VALUE_SCALE)
+        return [memoryview(out)]
+
+    def query(self, board, channel, start, end):
+        board_id = self._id("boards", board, False)
+        channel_id = self._id("channels", channel, False)
+        if board_id is None or channel_id is None:
+            return []
+        return [(t * TIME_UNIT, v / VALUE_SCALE) for t, _, v in self._rows(start, end, (board_id, channel_id))]
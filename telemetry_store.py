@@ -0,0 +1,304 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KALICI TELEMETRİ DEPOSU
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Sensör ölçümlerini sabit genişlikli ikili kayıtlar halinde
+#           segment dosyalarına SADECE SONA EKLEYEREK yazar.
+#           Kayıt: (zaman, kart, kanal, değer) -> struct "<dHHf" (16 byte).
+#           Kayıtlar zamana göre sıralı olduğundan okuma, mmap üzerinde ikili
+#           arama + kopyasız dilimdir (log dosyası taramak gerekmez).
+#           Segmentler boyut/yaş sınırında kapanır; toplam boyut veya yaş
+#           bütçesini aşan eski segmentler silinir. Yeniden açılışta son
+#           segmentteki yarım kayıt (örn. elektrik kesintisi) kesilip atılır.
+# ==============================================================================
+
+RECORD = struct.Struct("<dHHf")           # zaman (epoch sn), kart id, kanal id, değer
+HEADER = struct.Struct("<4sHHd")          # sihirli sayı, sürüm, kayıt boyu, açılış zamanı
+MAGIC = b"NXTS"
+VERSION = 1
+SEGMENT_SUFFIX = ".tlm"
+CATALOG_FILE = "catalog.json"             # kart / kanal adı -> id eşlemesi
+
+# --- SEGMENT VE SAKLAMA BÜTÇELERİ ---
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024       # ~262 bin kayıt
+SEGMENT_MAX_AGE = 24 * 60 * 60            # Bir segment en fazla bir gün açık kalır (sn)
+RETAIN_MAX_BYTES = 512 * 1024 * 1024      # Tüm segmentlerin toplam sınırı
+RETAIN_MAX_AGE = 365 * 24 * 60 * 60       # Bundan eski segmentler silinir (sn)
+FLUSH_EVERY = 64                          # Bu kadar kayıtta bir diske yazılır
+
+
+class Segment:
+    """
+    Tek bir segment dosyası. Kapanmış (sealed) segmentin mmap'i önbellekte
+    tutulur; açık segment her sorguda o anki boyutuyla yeniden eşlenir.
+    """
+    RECORD_SIZE = RECORD.size  # Görünüm bu boyun katına kırpılır
+
+    def __init__(self, path, start_time):
+        self.path = path
+        self.start_time = start_time
+        self._map = None
+
+    @property
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def view(self, sealed):
+        """
+        Kayıt alanının memoryview'i (başlık hariç). Yarım yazılmış son kayıt
+        (örn. elektrik kesintisi) görünüme dahil edilmez.
+        """
+        if sealed and self._map is not None:
+            mm = self._map
+        else:
+            with open(self.path, "rb") as f:
+                length = os.fstat(f.fileno()).st_size
+                if length <= HEADER.size:
+                    return memoryview(b"")
+                mm = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+            if sealed:
+                self._map = mm
+        usable = (len(mm) - HEADER.size) // self.RECORD_SIZE * self.RECORD_SIZE
+        return memoryview(mm)[HEADER.size:HEADER.size + usable]
+
+    def valid_length(self):
+        """Dosyanın sağlam kısmının boyu: başlık + tam kayıtlar (yarım son kayıt hariç)."""
+        size = self.size
+        if size <= HEADER.size:
+            return size
+        return HEADER.size + (size - HEADER.size) // self.RECORD_SIZE * self.RECORD_SIZE
+
+    def last_time(self, sealed):
+        """Son kaydın zamanı. Segment boşsa açılış zamanı."""
+        view = self.view(sealed)
+        if not len(view):
+            return self.start_time
+        return RECORD.unpack_from(view, len(view) - RECORD.size)[0]
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Dışarıda hâlâ görünüm var; nesne serbest kalınca kapanır
+            self._map = None
+
+
+def _first_at_or_after(view, timestamp):
+    """Sıralı kayıtlarda zamanı >= timestamp olan ilk kaydın sırası (ikili arama)."""
+    lo, hi = 0, len(view) // RECORD.size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if RECORD.unpack_from(view, mid * RECORD.size)[0] < timestamp:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class TelemetryStore:
+    """
+    Segmentli, sadece sona eklenen telemetri deposu.
+    Yazma birden fazla thread'den yapılabilir (kilitli). Sorgular yazmayı
+    beklemez; diske henüz yazılmamış (FLUSH_EVERY) son kayıtları görmez.
+    Segment biçimi alt sınıflarda değiştirilebilir (bkz. telemetry_codec).
+    """
+    # Segment dosya biçimi: başlıktaki sihirli sayı / kayıt boyu ve uzantı
+    SEGMENT_CLASS = Segment
+    SEGMENT_MAGIC = MAGIC
+    SEGMENT_RECORD_SIZE = RECORD.size
+    SEGMENT_SUFFIX = SEGMENT_SUFFIX
+
+    def __init__(self, directory, segment_max_bytes=SEGMENT_MAX_BYTES, segment_max_age=SEGMENT_MAX_AGE,
+                 retain_max_bytes=RETAIN_MAX_BYTES, retain_max_age=RETAIN_MAX_AGE):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.retain_max_bytes = retain_max_bytes
+        self.retain_max_age = retain_max_age
+        self._lock = threading.Lock()
+        self._file = None
+        self._unflushed = 0
+        self._last_time = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._catalog = self._load_catalog()
+        self.segments = self._scan_segments()
+        if self.segments:
+            self._open_active(self.segments[-1])
+            self._last_time = self.segments[-1].last_time(sealed=False)
+
+    # --- KATALOG (isim <-> id) ---
+    def _load_catalog(self):
+        try:
+            with open(os.path.join(self.directory, CATALOG_FILE), encoding="utf-8") as f:
+                catalog = json.load(f)
+        except (OSError, ValueError):
+            catalog = {}
+        return {"boards": catalog.get("boards", []), "channels": catalog.get("channels", [])}
+
+    def _save_catalog(self):
+        path = os.path.join(self.directory, CATALOG_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._catalog, f)
+        os.replace(tmp, path)  # Yarım yazılmış katalog kalmasın
+
+    def _id(self, kind, name, create):
+        names = self._catalog[kind]
+        if name in names:
+            return names.index(name)
+        if not create:
+            return None
+        names.append(name)
+        self._save_catalog()
+        return len(names) - 1
+
+    # --- SEGMENTLER ---
+    def _scan_segments(self):
+        segments = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(self.SEGMENT_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    magic, version, size, started = HEADER.unpack(f.read(HEADER.size))
+            except (OSError, struct.error):
+                continue
+            if magic == self.SEGMENT_MAGIC and version == VERSION and size == self.SEGMENT_RECORD_SIZE:
+                segments.append(self.SEGMENT_CLASS(path, started))
+        segments.sort(key=lambda s: s.start_time)
+        return segments
+
+    def _open_active(self, segment):
+        """
+        Segmenti sona ekleme için açar. Çökmeden kalan yarım kayıt önce kesilir;
+        yoksa sonra eklenen tüm kayıtlar kayık okunur (ikili arama da bozulur).
+        """
+        valid = segment.valid_length()
+        if segment.size > valid:
+            with open(segment.path, "r+b") as f:
+                f.truncate(valid)
+        self._file = open(segment.path, "ab")
+
+    def _roll(self, now):
+        """Açık segmenti kapatır, yenisini açar ve bütçeyi aşan eskileri siler."""
+        if self._file is not None:
+            self._file.close()
+        stamp = int(now * 1000)
+        path = os.path.join(self.directory, f"{stamp:015d}{self.SEGMENT_SUFFIX}")
+        while os.path.exists(path):  # Aynı milisaniyede ikinci segment
+            stamp += 1
+            path = os.path.join(self.directory, f"{stamp:015d}{self.SEGMENT_SUFFIX}")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(self.SEGMENT_MAGIC, VERSION, self.SEGMENT_RECORD_SIZE, now))
+        segment = self.SEGMENT_CLASS(path, now)
+        self.segments.append(segment)
+        self._open_active(segment)
+        self._unflushed = 0
+        self._retire(now)
+
+    def _needs_roll(self, now):
+        if self._file is None:
+            return True
+        active = self.segments[-1]
+        return (self._file.tell() >= self.segment_max_bytes
+                or now - active.start_time >= self.segment_max_age)
+
+    def _retire(self, now):
+        """En eski kapanmış segmentleri yaş ve toplam boyut bütçesine göre siler."""
+        total = sum(s.size for s in self.segments)
+        while len(self.segments) > 1:
+            oldest = self.segments[0]
+            too_old = now - oldest.last_time(sealed=True) > self.retain_max_age
+            if total <= self.retain_max_bytes and not too_old:
+                break
+            total -= oldest.size
+            oldest.close()
+            try:
+                os.remove(oldest.path)
+            except OSError:
+                pass
+            self.segments.pop(0)
+
+    # --- YAZMA ---
+    def append(self, board, channel, value, timestamp=None):
+        """
+        Bir ölçümü ekler. Zaman geri giderse (saat ayarı) son kaydın zamanı
+        kullanılır; böylece kayıtlar sıralı kalır ve ikili arama geçerlidir.
+        """
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            now = max(now, self._last_time)
+            if self._needs_roll(now):
+                self._roll(now)
+            self._file.write(RECORD.pack(now, self._id("boards", board, True),
+                                         self._id("channels", channel, True), value))
+            self._last_time = now
+            self._unflushed += 1
+            if self._unflushed >= FLUSH_EVERY:
+                self._file.flush()
+                self._unflushed = 0
+
+    def recorder(self, board):
+        """Kart nesnesinin 'recorders' listesine eklenecek fonksiyon (alan, zaman, değer)."""
+        return lambda channel, timestamp, value: self.append(board, channel, value, timestamp)
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            for segment in self.segments:
+                segment.close()
+
+    # --- OKUMA ---
+    def scan(self, start, end):
+        """
+        [start, end) aralığındaki ham kayıtlar: segment başına bir memoryview
+        (kopyasız dilim). Kayıtlar RECORD.iter_unpack ile çözülebilir.
+        """
+        with self._lock:
+            segments = list(self.segments)
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+        out = []
+        for i, segment in enumerate(segments):
+            next_start = segments[i + 1].start_time if i + 1 < len(segments) else None
+            if next_start is not None and next_start < start:
+                continue  # Bu segment tamamen aralıktan önce
+            if segment.start_time >= end:
+                break
+            view = segment.view(sealed=next_start is not None)
+            lo = _first_at_or_after(view, start)
+            hi = _first_at_or_after(view, end)
+            if hi > lo:
+                out.append(view[lo * RECORD.size:hi * RECORD.size])
+        return out
+
+    def query(self, board, channel, start, end):
+        """Bir kartın bir kanalı için [start, end) aralığındaki (zaman, değer) listesi."""
+        board_id = self._id("boards", board, False)
+        channel_id = self._id("channels", channel, False)
+        if board_id is None or channel_id is None:
+            return []
+        return [(t, v) for view in self.scan(start, end)
+                for t, b, c, v in RECORD.iter_unpack(view)
+                if b == board_id and c == channel_id]
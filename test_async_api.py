@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import time
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ASYNCIO SÜRÜCÜ TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: async_api sürücüsünün pty emülatörleri üzerinden bloklamasız
+#           okuma/yazma ve eşzamanlı sorgu davranışını test eder.
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from async_api import AsyncHomeAutomationSystemConnection, poll_boards
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from transport import MemoryTransport, PtyTransport
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "pty sadece Linux'ta")
+class TestAsyncDriver(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            import serial  # noqa: F401
+        except ImportError:
+            self.skipTest("pyserial yüklü değil")
+        self.ac_emu = AirConditionerBoardEmulator(latency=0.02)
+        self.cur_emu = CurtainBoardEmulator(latency=0.02)
+        self.ac = AirConditionerSystemConnection("pty://ac", transport=PtyTransport(self.ac_emu))
+        self.cur = CurtainControlSystemConnection("pty://curtain", transport=PtyTransport(self.cur_emu))
+        self.ac.autoCalibrate = self.cur.autoCalibrate = False
+        # Tek byte'lık sorgular: toplu okuma turu zaten tek cevaba indirir
+        self.ac.autoDetectBulk = self.cur.autoDetectBulk = False
+        self.ac.supportsBulk = self.cur.supportsBulk = False
+        self.drivers = [AsyncHomeAutomationSystemConnection(self.ac), AsyncHomeAutomationSystemConnection(self.cur)]
+        for d in self.drivers:
+            self.assertTrue(d.open())
+
+    def tearDown(self):
+        for d in getattr(self, "drivers", []):
+            d.close()
+
+    def test_01_concurrent_poll(self):
+        """İki kartın turu, toplam değil en yavaş kart kadar sürmeli."""
+        # Kart başına süre = sorgu byte'ı x byte gecikmesi (2 kart x 5 byte x 20 ms)
+        turns = [len(d.board.POLL_SEQUENCE) * emu.latency
+                 for d, emu in zip(self.drivers, (self.ac_emu, self.cur_emu))]
+        started = time.perf_counter()
+        asyncio.run(poll_boards(self.drivers))
+        elapsed = time.perf_counter() - started
+        self.assertEqual(self.ac.ambientTemperature, 22.5)
+        self.assertEqual(self.cur.outdoorPress, 1013)
+        # Sıralı: toplam (0.2 sn); eşzamanlı: en yavaş kart (0.1 sn). Sınır ikisinin ortası.
+        self.assertLess(elapsed, (max(turns) + sum(turns)) / 2)
+
+    def test_02_deadline(self):
+        """Cevap vermeyen kart, komut son tarihi dolunca bırakılır."""
+        self.ac_emu.drop_rate = 1.0
+        started = time.perf_counter()
+        asyncio.run(self.drivers[0].update())
+        self.assertLess(time.perf_counter() - started, 0.2)
+        self.assertEqual(self.ac.fanSpeed, 0)
+
+    def test_03_send(self):
+        asyncio.run(self.drivers[0].send(self.ac._encode_desired_temp(26.5)))
+        self.assertEqual((self.ac_emu.desired_temp_int, self.ac_emu.desired_temp_dec), (26, 5))
+
+
+class TestAsyncDriverMemory(unittest.TestCase):
+
+    def test_01_memory_fallback(self):
+        """fd'si olmayan taşımada senkron sorgu yürütücüde çalışır."""
+        ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(AirConditionerBoardEmulator()))
+        driver = AsyncHomeAutomationSystemConnection(ac)
+        driver.open()
+        asyncio.run(driver.update())
+        self.assertEqual(ac.fanSpeed, 15)
+
+    def test_02_set_marks_field_fresh(self):
+        cur = CurtainControlSystemConnection("mem://curtain", transport=MemoryTransport(CurtainBoardEmulator()))
+        driver = AsyncHomeAutomationSystemConnection(cur)
+        driver.open()
+        for value in (40.0, 40.0):  # Aynı değer de damgayı yeniler
+            before = cur.fieldTimestamps.get("curtainStatus")
+            asyncio.run(driver.set("curtainStatus", value))
+            self.assertNotEqual(cur.fieldTimestamps["curtainStatus"], before)
+        self.assertFalse(cur.state.isStale("curtainStatus"))
+        self.assertEqual(cur.state.curtainStatus, 40.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
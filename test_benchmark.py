@@ -0,0 +1,101 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PERFORMANS ÖLÇÜM PAKETİ TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Ölçüm paketinin kısa bir koşusunu (bellek içi ve pty), sonuç
+#           dosyası biçimini ve karşılaştırma modunun gerileme tespitini test eder.
+# ==============================================================================
+
+import benchmark
+
+NAMES = {"ac.update", "curtain.update", "ac.setDesiredTemp", "curtain.setCurtainStatus", "queue.submit_set",
+         "scheduler.poll"}
+
+
+def fake_result(**metrics):
+    result = {"n": 100, "errors": 0, "p50_ms": 1.0, "p99_ms": 2.0, "mean_ms": 1.1, "cpu_ms": 0.5,
+              "ops_per_sec": 1000.0}
+    result.update(metrics)
+    return {"version": benchmark.RESULT_VERSION, "meta": {"transport": "pty", "count": 100},
+            "results": {"ac.update": result}}
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def check_suite(self, data, strict=True):
+        """strict=False: sadece sonuçların varlığı (yüke duyarlı pty koşusu)."""
+        self.assertEqual(set(data["results"]), NAMES)
+        self.assertEqual(set(data["meta"]["boards"]), {"ac", "curtain"})
+        if not strict:
+            for name, result in data["results"].items():
+                self.assertGreater(result["n"], 0, name)
+            return
+        for name, result in data["results"].items():
+            self.assertEqual(result["errors"], 0, name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreater(result["ops_per_sec"], 0)
+        self.assertIsNone(data["results"]["queue.submit_set"]["cpu_ms"])
+        sched = data["results"]["scheduler.poll"]
+        self.assertEqual(sched["boards"], 6)
+        self.assertGreaterEqual(sched["min_polls"], 1)
+        self.assertGreaterEqual(sched["threads_added"], 1)
+
+    def test_01_memory_run(self):
+        self.check_suite(benchmark.run_suite("mem", count=20, warmup=2, repeat=2,
+                                                sched_boards=6, sched_duration=0.5))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "pty sadece Linux'ta")
+    def test_02_pty_run(self):
+        # Yük altında pty gecikmesi uzar: kısa koşu, geniş bekleme süresi ve
+        # sadece sonuçların üretildiği kontrol edilir (hız / hata sayısı değil).
+        with mock.patch.object(benchmark, "DRAIN_TIMEOUT", 30.0):
+            self.check_suite(benchmark.run_suite("pty", count=5, warmup=1, repeat=1,
+                                                    sched_boards=6, sched_duration=1.0), strict=False)
+
+    def test_03_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(benchmark.percentile(samples, 0.50), 50)
+        self.assertEqual(benchmark.percentile(samples, 0.99), 99)
+        self.assertEqual(benchmark.percentile([7], 0.99), 7)
+
+    def test_04_compare_flags_regressions(self):
+        base = fake_result()
+        rows, regressions = benchmark.compare(base, fake_result(p99_ms=2.1, ops_per_sec=1200.0))
+        self.assertEqual(regressions, [])  # %5 yavaşlama eşiğin altında, hız artışı iyileşme
+        _, regressions = benchmark.compare(base, fake_result(p50_ms=1.5, ops_per_sec=800.0))
+        self.assertEqual({(r[0], r[1]) for r in regressions}, {("ac.update", "p50_ms"), ("ac.update", "ops_per_sec")})
+        _, regressions = benchmark.compare(base, fake_result(p50_ms=1.5), threshold=0.6)
+        self.assertEqual(regressions, [])
+
+    def test_05_cli_exit_codes(self):
+        base, same, slow = (os.path.join(self.dir, n) for n in ("a.json", "b.json", "c.json"))
+        benchmark.save(fake_result(), base)
+        benchmark.save(fake_result(), same)
+        benchmark.save(fake_result(mean_ms=2.0), slow)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(benchmark.main(["compare", base, same]), 0)
+            self.assertEqual(benchmark.main(["compare", base, slow]), 1)
+            out = os.path.join(self.dir, "run.json")
+            self.assertEqual(benchmark.main(["run", "--transport", "mem", "--count", "5", "--warmup", "1",
+                                             "--repeat", "1", "--boards", "4", "--duration", "0.3",
+                                             "--out", out]), 0)
+        self.assertEqual(set(benchmark.load(out)["results"]), NAMES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KART KAYDI TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: config.BOARDS tanımlarının doğrulanmasını, boş listede eski iki
+#           kartlı düzene dönülmesini ve çok kartlı bir hub'ın tek servis
+#           thread'iyle bağlanmasını test eder.
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from board_registry import BoardSpec, load_registry, open_boards
+from hub_service import HubService
+import config as cfg
+
+
+class TestBoardRegistry(unittest.TestCase):
+
+    def test_01_legacy_default(self):
+        with mock.patch.object(cfg, "BOARDS", []):
+            specs = load_registry()
+        self.assertEqual([(s.name, s.kind, s.port) for s in specs],
+                         [("ac", "ac", cfg.AC_BOARD_PORT), ("curtain", "curtain", cfg.CURTAIN_BOARD_PORT)])
+
+    def test_02_entries(self):
+        specs = load_registry([
+            {"name": "salon", "type": "ac", "port": "COM3", "baud": 19200, "poll_interval": 1},
+            {"type": "curtain", "port": "COM4"},
+        ])
+        self.assertEqual(specs[0], BoardSpec("salon", "ac", "COM3", 19200, 1.0))
+        self.assertEqual(specs[1].name, "curtain")  # Ad yazılmazsa tip adı
+        self.assertIsInstance(specs[0].create(), AirConditionerSystemConnection)
+        self.assertIsInstance(specs[1].create(), CurtainControlSystemConnection)
+
+    def test_03_invalid_entries(self):
+        bad = [
+            [{"type": "fan", "port": "COM1"}],
+            [{"type": "ac", "port": "COM1", "speed": 9600}],
+            [{"type": "ac"}],
+            [{"type": "ac", "port": "COM1", "baud": 1200}],
+            [{"type": "ac", "port": "COM1", "poll_interval": 0}],
+            [{"name": "x", "type": "ac", "port": "COM1"}, {"name": "x", "type": "curtain", "port": "COM2"}],
+        ]
+        for entries in bad:
+            with self.assertRaises(ValueError, msg=entries):
+                load_registry(entries)
+
+    def test_04_hub_with_many_boards(self):
+        telemetry_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, telemetry_dir, ignore_errors=True)
+        registry = load_registry(
+            [{"name": f"ac{i}", "type": "ac", "port": f"mem://ac/{i}", "poll_interval": 0.1} for i in range(3)]
+            + [{"name": f"cur{i}", "type": "curtain", "port": f"mem://curtain/{i}"} for i in range(3)])
+        hub = HubService(telemetry_dir=os.path.join(telemetry_dir, "telemetry"), isolated=False,
+                         registry=registry)
+        try:
+            self.assertEqual(hub.primary_name("curtain"), "cur0")
+            self.assertIs(hub.ac_api, hub.boards["ac0"])
+            status = hub.connect()
+            self.assertEqual(status, {spec.name: True for spec in registry})
+            self.assertEqual(len(hub.io_service.scheduler.arbiters), 6)
+            self.assertEqual(hub.port("ac1").poll_interval, 0.1)
+            self.assertEqual({link["state"] for link in hub.link_states().values()}, {"online"})
+        finally:
+            hub.stop()
+
+    def test_05_open_timeout(self):
+        """Asılı kalan port diğerlerini bekletmez; geç açılırsa kapatılır."""
+        release, closed = threading.Event(), threading.Event()
+        opens = []
+
+        class HangingBoard:
+            def open(self):
+                opens.append(self)
+                release.wait()
+                return True
+
+            def close(self):
+                closed.set()
+
+        fast = AirConditionerSystemConnection("mem://ac")
+        started = time.monotonic()
+        self.assertEqual(open_boards({"ac": fast, "hung": HangingBoard()}, timeout=0.2),
+                         {"ac": True, "hung": False})
+        self.assertLess(time.monotonic() - started, 1.0)
+        fast.close()
+        # Asılı açılış sürerken tekrar bağlanılırsa kart ikinci kez açılmaz
+        hung = HangingBoard()
+        self.assertEqual(open_boards({"hung": hung}, timeout=0.05), {"hung": False})
+        self.assertEqual(open_boards({"hung": hung}, timeout=0.05), {"hung": False})
+        self.assertEqual(opens.count(hung), 1)
+        release.set()
+        self.assertTrue(closed.wait(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
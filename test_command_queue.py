@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KOMUT KUYRUĞU TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Seri port hakeminin (command_queue) öncelik sırasını ve
+#           Future sonuçlarını bellek içi emülatör üzerinden; ortak sorgu
+#           zamanlayıcısının faz dağıtımını, slot ızgarasını ve çok kartta
+#           tek thread ile adil sorgulamasını test eder.
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from command_queue import SerialIOService, PollScheduler, PRIORITY_POLL, BLOCKING_IO_WORKERS, backoff_delay
+import command_queue
+from transport import MemoryTransport
+
+
+class TestPortArbiter(unittest.TestCase):
+
+    def setUp(self):
+        self.emu = AirConditionerBoardEmulator()
+        self.ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(self.emu))
+        self.ac.open()
+        self.service = SerialIOService(poll_interval=0.05)
+        self.port = self.service.attach(self.ac)
+
+    def tearDown(self):
+        self.service.stop()
+        self.ac.close()
+
+    def test_01_set_future(self):
+        self.port.submit_set("desiredTemperature", 28.5).result(timeout=1)
+        self.assertEqual((self.emu.desired_temp_int, self.emu.desired_temp_dec), (28, 5))
+        self.assertEqual(self.ac.getDesiredTemp(), 28.5)
+
+    def test_02_background_poll(self):
+        self.emu.read_sensor(31)
+        time.sleep(0.2)
+        self.assertEqual(self.ac.getAmbientTemp(), 31.5)
+
+    def test_03_set_preempts_poll(self):
+        """Aynı anda kuyrukta bekleyen ayar komutu, sorgulardan önce işlenir."""
+        order = []
+
+        async def record(name):
+            order.append(name)
+
+        block = self.port.submit(lambda d: self._sleep(0.05))  # İşçiyi kısa süre meşgul et
+        polls = [self.port.submit(lambda d: record("poll"), PRIORITY_POLL) for _ in range(3)]
+        setf = self.port.submit(lambda d: record("set"))
+        for f in [block, setf] + polls:
+            f.result(timeout=1)
+        self.assertEqual(order[0], "set")
+
+    def test_04_coalesce_burst(self):
+        """Kuyrukta bekleyen ayarlar tek yazmaya iner; son değer kazanır."""
+        self.port.submit(lambda d: self._sleep(0.05))
+        futures = [self.port.submit_set("desiredTemperature", 20 + i) for i in range(10)]
+        futures[-1].result(timeout=1)
+        self.assertEqual(self.emu.desired_temp_int, 29)
+        stats = self.port.coalescer.stats()
+        self.assertEqual((stats["written"], stats["coalesced"]), (1, 9))
+
+    def test_05_noop_write_dropped(self):
+        """Kartta zaten aynı değer varsa byte gönderilmez."""
+        self.port.submit_set("desiredTemperature", 26.5).result(timeout=1)
+        self.port.submit_set("desiredTemperature", 26.5).result(timeout=1)
+        stats = self.port.coalescer.stats()
+        self.assertEqual((stats["written"], stats["noops"], stats["saved"]), (1, 1, 1))
+
+    def test_06_cancelled_setpoint_releases_field(self):
+        """Kuyrukta iptal edilen ayar, alanın sonraki ayarlarını kilitlemez."""
+        self.port.submit(lambda d: self._sleep(0.05))
+        cancelled = self.port.submit_set("desiredTemperature", 21.0)
+        self.assertTrue(cancelled.cancel())
+        time.sleep(0.1)  # İşçi iptal edilen işi atlasın
+        self.port.submit_set("desiredTemperature", 24.5).result(timeout=1)
+        self.assertEqual((self.emu.desired_temp_int, self.emu.desired_temp_dec), (24, 5))
+
+    @staticmethod
+    async def _sleep(seconds):
+        await asyncio.sleep(seconds)
+
+
+class TestLinkSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in (("RECONNECT_BASE", 0.4), ("RECONNECT_MAX", 0.4)):
+            patcher = mock.patch.object(command_queue, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.emu = AirConditionerBoardEmulator()
+        self.ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(self.emu, timeout=0.02))
+        self.ac.open()
+        self.service = SerialIOService(poll_interval=0.02)
+        self.port = self.service.attach(self.ac)
+
+    def tearDown(self):
+        self.service.stop()
+        self.ac.close()
+
+    def wait_for(self, condition, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, self.port.link_status())
+            time.sleep(0.005)
+
+    def test_01_backoff_bounds(self):
+        low, high = SimpleNamespace(random=lambda: 0.0), SimpleNamespace(random=lambda: 1.0)
+        self.assertEqual(backoff_delay(0, low, base=0.5, cap=30), 0.25)
+        self.assertEqual(backoff_delay(0, high, base=0.5, cap=30), 0.5)
+        self.assertEqual(backoff_delay(3, high, base=0.5, cap=30), 4.0)
+        self.assertEqual(backoff_delay(100, low, base=0.5, cap=30), 15.0)  # Tavan sınırı
+        self.assertEqual(backoff_delay(100, high, base=0.5, cap=30), 30.0)
+
+    def test_02_dead_link_reconnects(self):
+        self.wait_for(lambda: self.ac.lastPollOk)
+        self.assertEqual(self.port.link_status()["state"], command_queue.LINK_ONLINE)
+
+        self.emu.drop_rate = 1.0  # Kart susar (kablo çekildi)
+        self.wait_for(lambda: self.port.link_status()["state"] == command_queue.LINK_DOWN)
+        status = self.port.link_status()
+        self.assertGreaterEqual(status["failures"], command_queue.DEAD_AFTER_FAILURES)
+        self.assertLessEqual(status["retry_in"], 0.4)
+        # Hat kopukken ayar komutu beklemeden reddedilir (kuyrukta birikmez)
+        with self.assertRaises(ConnectionError):
+            self.port.submit_set("desiredTemperature", 27.0).result(timeout=1)
+
+        self.emu.drop_rate = 0.0  # Kart geri geldi
+        self.wait_for(lambda: self.port.link_status()["state"] == command_queue.LINK_ONLINE)
+        self.assertGreaterEqual(self.port.link_status()["reconnects"], 1)
+        self.port.submit_set("desiredTemperature", 27.0).result(timeout=1)
+        self.assertEqual(self.emu.desired_temp_int, 27)
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    @staticmethod
+    def fake_arbiter(interval):
+        return SimpleNamespace(poll_interval=interval, poll_phase=0.0)
+
+    def test_01_phases_spread(self):
+        scheduler = PollScheduler()
+        arbiters = [self.fake_arbiter(1.0) for _ in range(4)]
+        other = self.fake_arbiter(0.5)
+        for arbiter in arbiters + [other]:
+            scheduler.add(arbiter, 100.0)
+        self.assertEqual([a.poll_phase for a in arbiters], [0.0, 0.25, 0.5, 0.75])
+        self.assertEqual(other.poll_phase, 0.0)  # Farklı aralık kendi grubunda
+        scheduler.remove(arbiters[0])
+        self.assertEqual([round(a.poll_phase, 3) for a in arbiters[1:]], [0.0, 0.333, 0.667])
+        self.assertEqual(len(scheduler.arbiters), 4)
+
+    def test_02_next_slot_grid(self):
+        scheduler = PollScheduler()
+        first, second = self.fake_arbiter(1.0), self.fake_arbiter(1.0)
+        scheduler.add(first, 100.0)
+        scheduler.add(second, 100.3)  # Epoch ilk eklemede sabitlenir
+        self.assertEqual(scheduler.next_slot(second, 100.1), 100.5)
+        self.assertEqual(scheduler.next_slot(second, 100.5), 101.5)
+        # Geciken kart kaçırdığı slotları telafi etmez, sıradakine geçer
+        self.assertEqual(scheduler.next_slot(second, 103.9), 104.5)
+        self.assertEqual(scheduler.next_slot(first, 103.9), 104.0)
+
+    def test_03_many_boards_one_thread(self):
+        """Kart sayısı artınca thread sayısı artmaz; her kart eşit sayıda tur alır."""
+        boards = []
+        for i in range(20):
+            if i % 2:
+                board = CurtainControlSystemConnection(f"mem://c{i}", transport=MemoryTransport(CurtainBoardEmulator()))
+            else:
+                board = AirConditionerSystemConnection(f"mem://a{i}", transport=MemoryTransport(AirConditionerBoardEmulator()))
+            self.assertTrue(board.open())
+            boards.append(board)
+        threads = threading.active_count()
+        service = SerialIOService(poll_interval=0.1)
+        try:
+            for board in boards:
+                service.attach(board)
+            time.sleep(0.6)
+            self.assertLessEqual(threading.active_count() - threads, 1 + BLOCKING_IO_WORKERS)
+            stats = service.schedule_stats()
+        finally:
+            service.stop()
+            for board in boards:
+                board.close()
+        self.assertEqual(stats["boards"], 20)
+        self.assertGreaterEqual(stats["min_polls"], 3)
+        self.assertLessEqual(stats["max_polls"] - stats["min_polls"], 2)
+        self.assertEqual(stats["jitter"]["count"], stats["polls"])
+        self.assertEqual(service.scheduler.arbiters, [])  # stop() hakemleri ızgaradan çıkarır
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - EKRANSIZ SERVİS TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Servis çekirdeğinin (hub_service) bellek içi emülatörlerle
+#           sorgu + telemetri yaptığını, daemon'un Tk yüklemeden çalıştığını
+#           ve durdurma sinyaliyle temiz kapandığını test eder.
+# ==============================================================================
+
+import daemon
+import logger
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from hub_service import HubService
+from transport import MemoryTransport
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.dir)  # logs/ klasörü geçici klasörde oluşsun
+
+    def tearDown(self):
+        logger.shutdown()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def make_hub(self):
+        return HubService(telemetry_dir=os.path.join(self.dir, "telemetry"), transports={
+            "ac": MemoryTransport(AirConditionerBoardEmulator(), timeout=0.05),
+            "curtain": MemoryTransport(CurtainBoardEmulator(), timeout=0.05),
+        })
+
+    def test_01_no_gui_toolkit_imported(self):
+        code = "import daemon, sys; print(any(m in sys.modules for m in ('tkinter', 'customtkinter')))"
+        out = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+    def test_02_hub_polls_and_records(self):
+        hub = self.make_hub()
+        hub.start()
+        self.assertEqual(hub.connect(), {"ac": True, "curtain": True})
+        self.assertTrue(hub.port("curtain").request_poll().result(timeout=2))
+        rows = hub.telemetry.query("curtain", "outdoorPress", 0, float("inf"))
+        self.assertEqual(rows[-1][1], 1013.0)
+        hub.stop()
+        self.assertEqual(hub.ports, {})
+        self.assertFalse(hub.ac_api.serial_port.is_open)
+
+    def test_03_run_until_stopped(self):
+        hub = self.make_hub()
+        hub.serve("127.0.0.1", 0)  # Varsayılan port yerine boş bir port
+        stop = threading.Event()
+        threading.Timer(0.3, stop.set).start()
+        self.assertEqual(daemon.run(hub=hub, stop=stop), 0)
+        self.assertEqual(hub.ports, {})
+        with open(os.path.join("logs", logger.LOG_FILE), encoding="utf-8") as f:
+            self.assertIn("soğuk başlangıç", f.read())
+
+    @unittest.skipIf(sys.platform == "win32", "os.kill(SIGTERM) Windows'ta süreci sonlandırır")
+    def test_04_signal_sets_stop(self):
+        stop = threading.Event()
+        previous = signal.getsignal(signal.SIGTERM)
+        try:
+            self.assertIn("SIGTERM", daemon.install_signal_handlers(stop))
+            os.kill(os.getpid(), signal.SIGTERM)
+            self.assertTrue(stop.wait(1))
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+import importlib.util
+import sys
+import time
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - EMÜLATÖR VE API TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: PICSimLab olmadan, bellek içi ve pty emülatörleri üzerinden
+#           API katmanının komut setini ve veri birleştirmesini test eder.
+# ==============================================================================
+
+from automation_api import (
+    AirConditionerSystemConnection, CurtainControlSystemConnection, CMD_AC_GET_FAN_SPEED,
+    encode_frame, decode_frame, AirConditionerState, BAUD_RATES,
+)
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from transport import MemoryTransport, PtyTransport
+
+
+class TestBoardEmulator(unittest.TestCase):
+    """Emülatörün ISR davranışı (Board1_Klima.asm ile aynı olmalı)."""
+
+    def test_01_query_commands(self):
+        emu = AirConditionerBoardEmulator()
+        self.assertEqual(emu.feed(bytes([0x04, 0x03, 0x02, 0x01, 0x05])), bytes([22, 5, 25, 0, 15]))
+
+    def test_02_set_headers(self):
+        emu = AirConditionerBoardEmulator()
+        emu.feed(bytes([0b11011010, 0b10000111]))  # Tam: 26, Ondalık: 7
+        self.assertEqual((emu.desired_temp_int, emu.desired_temp_dec), (26, 7))
+
+    def test_03_unknown_byte_ignored(self):
+        emu = AirConditionerBoardEmulator()
+        self.assertEqual(emu.feed(bytes([0x00, 0x3F])), b"")
+
+    def test_04_read_sensor_zero_guard(self):
+        emu = AirConditionerBoardEmulator()
+        emu.step(adc_value=0)
+        self.assertEqual(emu.ambient_temp_int, 1)
+        self.assertTrue(emu.heater_on)
+
+    def test_05_drop_rate(self):
+        emu = AirConditionerBoardEmulator(drop_rate=1.0)
+        self.assertEqual(emu.feed(bytes([CMD_AC_GET_FAN_SPEED])), b"")
+        self.assertEqual(emu.dropped_count, 1)
+
+
+class TestApiWithMemoryTransport(unittest.TestCase):
+    """API sınıflarının bellek içi emülatör ile uçtan uca çalışması."""
+
+    def make_ac(self, **emu_kwargs):
+        emu = AirConditionerBoardEmulator(**emu_kwargs)
+        ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(emu, timeout=0.05))
+        self.assertTrue(ac.open())
+        return ac, emu
+
+    def test_01_ac_update(self):
+        for pipelined in (True, False):
+            ac, _ = self.make_ac()
+            ac.pipelined = pipelined
+            ac.update()
+            self.assertEqual((ac.ambientTemperature, ac.desiredTemperature, ac.fanSpeed), (22.5, 25.0, 15))
+
+    def test_02_set_desired_temp(self):
+        ac, emu = self.make_ac()
+        ac.setDesiredTemp(27.5)
+        self.assertEqual((emu.desired_temp_int, emu.desired_temp_dec), (27, 5))
+        ac.update()
+        self.assertEqual(ac.desiredTemperature, 27.5)
+
+    def test_03_latency(self):
+        ac, _ = self.make_ac(latency=0.001)
+        ac.update()
+        self.assertEqual(ac.fanSpeed, 15)
+
+    def test_04_curtain_update(self):
+        emu = CurtainBoardEmulator()
+        cur = CurtainControlSystemConnection("mem://curtain", transport=MemoryTransport(emu, timeout=0.05))
+        cur.open()
+        cur.update()
+        self.assertEqual((cur.outdoorTemp, cur.outdoorPress, cur.lightIntensity), (18.0, 1013, 450))
+        self.assertTrue(cur.isStale("curtainStatus"))  # Hiç yazılmadı
+        cur.setCurtainStatus(40)
+        self.assertEqual(emu.desired_int, 40)
+        self.assertFalse(cur.state.isStale("curtainStatus"))  # Sorgulanmaz; yazmayla tazelenir
+
+    def test_05_missing_reply_keeps_last_value(self):
+        """Cevap gelmezse alanlar sıfırlanmaz, bayat (stale) işaretlenir."""
+        ac, emu = self.make_ac()
+        self.assertTrue(ac.update())
+        self.assertFalse(ac.isStale("fanSpeed"))
+        emu.drop_rate = 1.0
+        self.assertFalse(ac.update())
+        self.assertEqual(ac.fanSpeed, 15)
+        self.assertTrue(ac.isStale("fanSpeed", maxAge=0.0))
+        self.assertIsNotNone(ac.getFieldAge("fanSpeed"))
+
+    def test_06_poll_deadline(self):
+        """Cevap vermeyen kart update()'i toplam son tarihten uzun bekletmez."""
+        emu = AirConditionerBoardEmulator(drop_rate=1.0)
+        for pipelined in (True, False):
+            ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(emu))
+            ac.autoCalibrate = False
+            ac.open()
+            ac.pipelined = pipelined
+            ac.pollDeadline = 0.1
+            started = time.monotonic()
+            self.assertFalse(ac.update())
+            self.assertLess(time.monotonic() - started, 0.2)
+            self.assertTrue(ac.isStale("ambientTemperature"))
+
+    def test_07_calibrate_pacing(self):
+        """Taşma yapmayan kartta bekleme sıfırlanır, yavaş ISR'da yeterli aralık seçilir."""
+        ac, _ = self.make_ac()
+        self.assertEqual(ac.bytePacing, 0.0)
+        ac, emu = self.make_ac(overrun_interval=0.003)
+        self.assertEqual(ac.calibratedPacing, 0.005)
+        emu.overrun_count = 0
+        self.assertTrue(ac.update())
+        ac.setDesiredTemp(24.5)
+        self.assertEqual(emu.overrun_count, 0)
+        self.assertEqual((emu.desired_temp_int, emu.desired_temp_dec), (24, 5))
+
+    def test_08_pacing_backoff(self):
+        """Açılıştan sonra cevaplar kaçmaya başlarsa aralık otomatik uzar."""
+        ac, emu = self.make_ac(bulk=False)  # Byte'lar arası aralık tur içinde de önemli olsun
+        ac.pollDeadline = 0.05
+        emu.overrun_interval = 0.003
+        for _ in range(5):
+            ac.update()
+        self.assertGreater(ac.pacingBackoffs, 0)
+        self.assertTrue(ac.update())
+
+    def test_09_port_scheme(self):
+        ac = AirConditionerSystemConnection("mem://ac")
+        self.assertTrue(ac.open())
+        ac.update()
+        self.assertEqual(ac.fanSpeed, 15)
+        self.assertTrue(ac.close())
+
+    def test_10_bulk_frame(self):
+        """Yeni firmware'de tek istek byte'ı ile tüm alanlar okunur."""
+        ac, emu = self.make_ac()
+        self.assertTrue(ac.supportsBulk)
+        emu.read_sensor(30)
+        emu.rx_count = 0
+        self.assertTrue(ac.update())
+        self.assertEqual((ac.ambientTemperature, ac.desiredTemperature, ac.fanSpeed), (30.5, 25.0, 15))
+        self.assertEqual(emu.rx_count, 1)
+
+    def test_11_bulk_fallback(self):
+        """0x06'yı tanımayan eski firmware'de tek tek sorguya dönülür."""
+        ac, emu = self.make_ac(bulk=False)
+        self.assertFalse(ac.supportsBulk)
+        self.assertTrue(ac.update())
+        self.assertEqual(ac.fanSpeed, 15)
+
+    def test_12_bulk_frame_corrupt(self):
+        """Sağlama toplamı tutmayan veya eksik çerçeve hiçbir alanı güncellemez."""
+        frame = encode_frame([22, 5, 25, 0, 15])
+        self.assertEqual(decode_frame(frame, 5), [22, 5, 25, 0, 15])
+        self.assertIsNone(decode_frame(frame[:-1] + bytes([frame[-1] ^ 1]), 5))
+        self.assertIsNone(decode_frame(frame[:-2], 5))
+        ac, emu = self.make_ac(seed=1)
+        self.assertTrue(ac.update())
+        ac.pollDeadline = 0.05
+        emu.drop_rate = 0.3
+        emu.read_sensor(40)
+        for _ in range(10):
+            ac.update()
+            self.assertIn(ac.ambientTemperature, (22.5, 40.5))
+
+    def test_13_read_timeout_set_once(self):
+        """Aynı son tarihli turlarda port zaman aşımı (termios çağrısı) tekrar ayarlanmaz."""
+        class CountingTransport(MemoryTransport):
+            sets = 0
+
+            @property
+            def timeout(self):
+                return self._timeout
+
+            @timeout.setter
+            def timeout(self, value):
+                CountingTransport.sets += 1
+                self._timeout = value
+
+        ac = AirConditionerSystemConnection("mem://ac", transport=CountingTransport(AirConditionerBoardEmulator()))
+        self.assertTrue(ac.open())
+        ac.update()
+        CountingTransport.sets = 0
+        for _ in range(20):
+            self.assertTrue(ac.update())
+        self.assertEqual(CountingTransport.sets, 0)
+
+
+class TestBaudNegotiation(unittest.TestCase):
+    """Hız pazarlığı: 9600'de başla, ortak en yüksek hıza geç, doğrula."""
+
+    def make_ac(self, baud_rate=115200, **emu_kwargs):
+        emu = AirConditionerBoardEmulator(**emu_kwargs)
+        ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(emu, timeout=0.05),
+                                            baud_rate=baud_rate)
+        self.assertTrue(ac.open())
+        return ac, emu
+
+    def test_01_highest_common_rate(self):
+        ac, emu = self.make_ac()
+        self.assertEqual((ac.baudRate, emu.baudrate, ac.serial_port.baudrate), (115200, 115200, 115200))
+        self.assertEqual(emu.framing_error_count, 0)
+        self.assertTrue(ac.update())
+        self.assertAlmostEqual(ac.pollWireTime * 115200, 9 * 10)
+
+    def test_02_limits(self):
+        ac, emu = self.make_ac(baud_rate=38400)  # config.py sınırı
+        self.assertEqual((ac.baudRate, emu.baudrate), (38400, 38400))
+        ac, emu = self.make_ac(bauds=(9600, 19200, 57600))  # Kartın sınırı
+        self.assertEqual((ac.baudRate, emu.baudrate), (57600, 57600))
+        ac, emu = self.make_ac(baud_rate=9600)  # Pazarlık yok
+        self.assertEqual(emu.baud_switches, 0)
+
+    def test_03_legacy_firmware(self):
+        ac, emu = self.make_ac(bauds=())
+        self.assertEqual((ac.baudRate, emu.baudrate, ac.supportedBauds), (9600, 9600, (9600,)))
+        self.assertTrue(ac.update())
+
+    def test_04_framing_error_recovery(self):
+        """Hat uyuşmazsa kart FERR ile 9600'e döner; PC de dönünce haberleşme sürer."""
+        ac, emu = self.make_ac()
+        ac.serial_port.baudrate = 9600
+        self.assertFalse(ac.update())
+        self.assertGreater(emu.framing_error_count, 0)
+        self.assertEqual(emu.baudrate, 9600)
+        ac.baudRate = 9600
+        self.assertTrue(ac.update())
+
+    def test_05_reopen_board_left_at_high_rate(self):
+        """Hub yeniden başlarken kart önceki hızda kalmıştır; pazarlık yine en yüksek hıza ulaşır."""
+        ac, emu = self.make_ac()
+        ac.close()
+        again = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(emu, timeout=0.05),
+                                               baud_rate=115200)
+        started = time.monotonic()
+        self.assertTrue(again.open())
+        self.assertLess(time.monotonic() - started, again.pollDeadline)  # Soru zaman aşımı beklenmedi
+        self.assertEqual((again.baudRate, again.supportedBauds), (115200, BAUD_RATES))
+        self.assertTrue(again.update())
+
+
+class TestBoardState(unittest.TestCase):
+    """Her tur sonunda yayınlanan değişmez durum kaydı."""
+
+    def setUp(self):
+        self.emu = AirConditionerBoardEmulator()
+        self.ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(self.emu, timeout=0.05))
+        self.ac.open()
+
+    def test_01_published_per_poll(self):
+        before = self.ac.state
+        self.assertIsInstance(before, AirConditionerState)
+        self.assertTrue(self.ac.update())
+        state = self.ac.state
+        self.assertGreater(state.seq, before.seq)
+        self.assertEqual((state.ambientTemperature, state.desiredTemperature, state.fanSpeed), (22.5, 25.0, 15))
+        self.assertTrue(state.lastPollOk)
+        self.assertFalse(state.isStale("ambientTemperature"))
+        self.assertTrue(before.isStale("ambientTemperature"))  # Eski kayıt eski kalır
+
+    def test_02_immutable_and_compact(self):
+        state = self.ac.state
+        with self.assertRaises(AttributeError):
+            state.fanSpeed = 99
+        self.assertFalse(hasattr(state, "__dict__"))
+
+    def test_03_old_reference_is_consistent(self):
+        self.ac.update()
+        held = self.ac.state
+        self.emu.read_sensor(31)
+        self.ac.update()
+        self.assertEqual(held.ambientTemperature, 22.5)  # Tutulan kayıt yarıda değişmez
+        self.assertEqual(self.ac.getAmbientTemp(), self.ac.state.ambientTemperature)
+        self.assertNotEqual(self.ac.state.ambientTemperature, 22.5)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "pty sadece Linux'ta")
+class TestApiWithPtyTransport(unittest.TestCase):
+    """Gerçek pyserial kod yolunun pty çifti üzerinden testi."""
+
+    @unittest.skipUnless(importlib.util.find_spec("serial"), "pyserial yüklü değil")
+    def test_01_ac_update(self):
+        emu = AirConditionerBoardEmulator()
+        ac = AirConditionerSystemConnection("pty://ac", transport=PtyTransport(emu))
+        self.assertTrue(ac.open())
+        try:
+            ac.update()
+            self.assertEqual(ac.ambientTemperature, 22.5)
+            emu.read_sensor(30)
+            ac.update()
+            self.assertEqual(ac.ambientTemperature, 30.5)
+            self.assertGreaterEqual(emu.rx_count, 10)
+        finally:
+            ac.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
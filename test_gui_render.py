@@ -0,0 +1,167 @@
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ARAYÜZ ÇİZİM YARDIMCILARI TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Ekran (display) gerektirmeden, sahte widget'larla RenderCache'in
+#           sadece değişen değerleri çizdiğini ve UpdateQueue'nun olayları
+#           birleştirip arayüzü tek kez uyandırdığını, LogRing'in satırları
+#           toplu yazıp kapasite ve hız sınırını koruduğunu test eder.
+# ==============================================================================
+
+from automation_api import CurtainControlSystemConnection
+from board_emulator import CurtainBoardEmulator
+from gui_render import LogRing, RenderCache, UpdateQueue, format_link_state, format_link_stats, link_error_count
+from link_stats import LinkStats
+from transport import MemoryTransport
+
+
+class FakeWidget:
+    """configure / set çağrılarını kaydeden sahte Tk widget'ı."""
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **options):
+        self.calls.append(options)
+
+    def set(self, value):
+        self.calls.append(value)
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def test_01_skip_unchanged(self):
+        render = RenderCache()
+        label = FakeWidget()
+        self.assertTrue(render.configure(label, text="22.50", text_color="white"))
+        self.assertFalse(render.configure(label, text="22.50", text_color="white"))
+        self.assertEqual(render.stats()["applied"], 1)
+        self.assertEqual(render.stats()["skipped"], 1)
+
+    def test_02_only_changed_options_sent(self):
+        render = RenderCache()
+        label = FakeWidget()
+        render.configure(label, text="22.50", text_color="white")
+        render.configure(label, text="22.60", text_color="white")
+        self.assertEqual(label.calls[-1], {"text": "22.60"})
+
+    def test_03_set_and_forget(self):
+        render = RenderCache()
+        bar = FakeWidget()
+        render.set(bar, 0.5)
+        render.set(bar, 0.5)
+        self.assertEqual(bar.calls, [0.5])
+        render.forget(bar)
+        render.set(bar, 0.5)
+        self.assertEqual(bar.calls, [0.5, 0.5])
+
+
+class TestUpdateQueue(unittest.TestCase):
+
+    def test_01_coalesce_single_wakeup(self):
+        wakes = []
+        queue = UpdateQueue(lambda: wakes.append(1))
+        queue.publish("ac", {"fanSpeed"})
+        queue.publish("ac", {"desiredTemperature"})
+        queue.publish("curtain", {"outdoorTemp"})
+        self.assertEqual(len(wakes), 1)
+        self.assertEqual(queue.drain(), {"ac": {"fanSpeed", "desiredTemperature"},
+                                         "curtain": {"outdoorTemp"}})
+        queue.publish("ac", {"fanSpeed"})  # Boşaltıldıktan sonra tekrar uyandırır
+        self.assertEqual(len(wakes), 2)
+
+    def test_02_failed_wake_rearms(self):
+        def closed():
+            raise RuntimeError("main thread is not in main loop")
+        queue = UpdateQueue(closed)
+        queue.publish("ac", {"fanSpeed"})
+        queue.publish("ac", {"fanSpeed"})
+        self.assertEqual(queue.wakeups, 2)
+
+    def test_03_board_publishes_only_changes(self):
+        cur = CurtainControlSystemConnection("mem://curtain",
+                                             transport=MemoryTransport(CurtainBoardEmulator(), timeout=0.05))
+        events = []
+        cur.listeners.append(lambda board, fields: events.append(set(fields)))
+        cur.open()
+        cur.update()
+        self.assertEqual(len(events), 1)
+        self.assertIn("outdoorPress", events[0])
+        cur.update()  # Emülatör değerleri değişmedi: olay yok
+        self.assertEqual(len(events), 1)
+
+
+class TestLogRing(unittest.TestCase):
+
+    def test_01_batched_single_wakeup(self):
+        wakes = []
+        ring = LogRing(lambda: wakes.append(1))
+        ring.add("a", "info")
+        ring.add("b", "info")
+        ring.add("c", "error")
+        self.assertEqual(len(wakes), 1)
+        chunks, trim = ring.take()
+        self.assertEqual(chunks, [("a\nb\n", "info"), ("c\n", "error")])
+        self.assertEqual(trim, 0)
+        self.assertEqual(ring.take(), ([], 0))
+
+    def test_02_bulk_trim(self):
+        ring = LogRing(lambda: None, capacity=10, slack=5, rate_limit=1000)
+        trims = []
+        for i in range(40):
+            ring.add(f"satır {i}")
+            trims.append(ring.take()[1])
+        self.assertEqual([t for t in trims if t], [6, 6, 6, 6, 6])  # Her 6 satırda bir toplu silme
+        self.assertLessEqual(ring.lines, 15)
+
+    def test_03_rate_limit_summary(self):
+        now = [0.0]
+        ring = LogRing(lambda: None, rate_limit=5, clock=lambda: now[0])
+        accepted = [ring.add(f"m{i}") for i in range(20)]
+        self.assertEqual(accepted.count(True), 5)
+        chunks, _ = ring.take()
+        self.assertEqual(chunks[-1][1], "error")
+        self.assertIn("15 mesaj", chunks[-1][0])
+        now[0] = 1.5  # Yeni pencere
+        self.assertTrue(ring.add("sonra"))
+        self.assertEqual(ring.take()[0], [("sonra\n", "info")])
+
+    def test_04_pending_bounded(self):
+        ring = LogRing(lambda: None, capacity=10, rate_limit=1000)
+        for i in range(100):
+            ring.add(f"m{i}")
+        chunks, _ = ring.take()
+        self.assertEqual(chunks[0][0].split("\n")[0], "m90")  # Kutuya sığmayacaklar hiç tutulmaz
+
+
+
+class TestLinkStatsFormat(unittest.TestCase):
+
+    def test_01_summary(self):
+        self.assertEqual(format_link_stats(None), "sayaçlar kapalı")
+        stats = LinkStats()
+        stats.wrote(2500)
+        stats.received(8, b"x" * 8)
+        stats.received(8, b"")
+        for _ in range(3):
+            stats.round_trip((4, 3, 2), 0.0015)
+        stats.round_trip((6,), 0.0004)
+        lines = format_link_stats(stats.snapshot()).splitlines()
+        self.assertEqual(lines[0], "rtt 1.50/1.50 ms [0x04+2]")  # En sık istek; kova sınırı en uzun süreyi aşmaz
+        self.assertEqual(lines[1], "tx 2.5 kB  rx 8 B")
+        self.assertEqual(lines[2], "t/o 1  kısa 0  hata 0")
+        self.assertEqual(link_error_count(stats.snapshot()), 1)
+        self.assertEqual(link_error_count(None), 0)
+
+    def test_02_link_state(self):
+        self.assertEqual(format_link_state({"state": "online", "failures": 0}), ("ACTIVE", "success"))
+        self.assertEqual(format_link_state({"state": "reconnecting"}), ("RECONNECTING", "warning"))
+        self.assertEqual(format_link_state({"state": "down", "retry_in": 3.6}), ("RETRY 4s", "danger"))
+        self.assertEqual(format_link_state({"state": "down", "retry_in": None}), ("DOWN", "danger"))
+        self.assertEqual(format_link_state({"state": "offline"}, connecting=True), ("CONNECTING", "warning"))
+        self.assertEqual(format_link_state(None), ("OFFLINE", "danger"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import http.client
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - HTTP API TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Yerel HTTP API'yi bellek içi emülatörlerle test eder: önbellekten
+#           durum okuma (seri hatta byte eklemeden), long-poll, SSE akışı ve
+#           komut kuyruğundan geçen ayar komutları.
+# ==============================================================================
+
+import http_api
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from hub_service import HubService
+from transport import MemoryTransport
+
+
+class TestHttpApi(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.ac_emu = AirConditionerBoardEmulator()
+        self.cur_emu = CurtainBoardEmulator()
+        self.hub = HubService(telemetry_dir=self.dir, transports={
+            "ac": MemoryTransport(self.ac_emu, timeout=0.05),
+            "curtain": MemoryTransport(self.cur_emu, timeout=0.05),
+        })
+        self.hub.start()
+        self.host, self.port = self.hub.serve("127.0.0.1", 0).address
+
+    def tearDown(self):
+        self.hub.stop()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def request(self, method, path, body=None, headers=None, conn=None):
+        conn = conn or http.client.HTTPConnection(self.host, self.port, timeout=5)
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.getheader("ETag"), response.read()
+
+    def test_01_reads_do_not_touch_serial(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)  # Keep-alive: tek bağlantı
+        for _ in range(300):
+            status, etag, body = self.request("GET", "/state", conn=conn)
+            self.assertEqual(status, 200)
+        state = json.loads(body)
+        self.assertEqual(set(state["boards"]), {"ac", "curtain"})
+        self.assertIn("desiredTemperature", state["boards"]["ac"])
+        self.assertEqual(self.ac_emu.rx_count + self.cur_emu.rx_count, 0)
+        self.assertEqual(self.request("GET", "/state", headers={"If-None-Match": etag})[0], 304)
+
+    def test_02_long_poll_wakes_on_change(self):
+        version = json.loads(self.request("GET", "/state")[2])["version"]
+        threading.Timer(0.1, self.hub.snapshot.rebuild).start()
+        started = time.monotonic()
+        status, _, body = self.request("GET", f"/state?since={version}&timeout=5")
+        self.assertEqual(status, 200)
+        self.assertGreater(json.loads(body)["version"], version)
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_03_sse_stream(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        conn.request("GET", "/events")
+        response = conn.getresponse()
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        first = response.readline()  # Bağlanınca son durum hemen gelir
+        self.assertTrue(first.startswith(b"id: "))
+        response.readline()
+        response.readline()
+        self.hub.snapshot.rebuild()
+        self.assertTrue(response.readline().startswith(b"id: "))
+        data = response.readline()
+        self.assertIn(b'"boards"', data)
+        conn.close()
+
+    def test_04_setpoint_through_command_queue(self):
+        self.assertEqual(self.request("POST", "/boards/ac/desiredTemperature", b'{"value": 28.5}')[0], 503)
+        self.hub.connect()
+        status, _, body = self.request("POST", "/boards/ac/desiredTemperature", b'{"value": 28.5}')
+        self.assertEqual(status, 200, body)
+        self.assertEqual((self.ac_emu.desired_temp_int, self.ac_emu.desired_temp_dec), (28, 5))
+        state = json.loads(self.request("GET", "/state")[2])
+        self.assertEqual(state["boards"]["ac"]["desiredTemperature"], 28.5)
+
+    def test_05_rejects_bad_commands(self):
+        self.assertEqual(self.request("POST", "/boards/ac/fanSpeed", b'{"value": 1}')[0], 404)
+        self.assertEqual(self.request("POST", "/boards/ac/desiredTemperature", b'{"value": 99}')[0], 400)
+        self.assertEqual(self.request("POST", "/boards/ac/desiredTemperature", b'nope')[0], 400)
+        self.assertEqual(self.request("GET", "/nowhere")[0], 404)
+        for length in ("-1", "abc", str(http_api.MAX_BODY_BYTES + 1)):
+            status = self.request("POST", "/boards/ac/desiredTemperature", headers={"Content-Length": length})[0]
+            self.assertEqual(status, 400, length)
+
+    def test_06_diagnostics(self):
+        self.hub.connect()
+        self.hub.port("ac").request_poll().result(2)
+        status, _, body = self.request("GET", "/diagnostics")
+        self.assertEqual(status, 200)
+        stats = json.loads(body)
+        self.assertEqual(set(stats), {"ac", "curtain"})
+        self.assertGreater(stats["ac"]["bytes_in"], 0)
+        self.assertGreaterEqual(stats["ac"]["round_trips"]["0x06"]["count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from multiprocessing import shared_memory
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - AYRI SÜREÇTE G/Ç TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Paylaşılan bellekteki durum yuvasının (seqlock) okuma / yazma
+#           davranışını ve G/Ç sürecinin bellek içi emülatörlerle (mem://)
+#           sorgu, ayar komutu ve temiz kapanışını test eder.
+# ==============================================================================
+
+import logger
+from board_registry import BoardSpec
+from hub_service import HubService
+from io_worker import SEQLOCK, IOWorker, SharedState, _layout
+from telemetry_store import TelemetryStore
+
+SPECS = [
+    BoardSpec("ac", "ac", "mem://ac", 9600, 0.05),
+    BoardSpec("curtain", "curtain", "mem://curtain", 9600, 0.05),
+]
+
+
+class TestSharedState(unittest.TestCase):
+
+    def test_01_round_trip_and_cache(self):
+        layout, size = _layout(SPECS)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            name, board, offset, record = layout[0]
+            writer = SharedState(shm.buf, offset, board.STATE_CLASS, record)
+            reader = SharedState(shm.buf, offset, board.STATE_CLASS, record)
+            board.stateSinks.append(writer.write)
+            board.setDesiredTemp(27.5)
+
+            state = reader.read()
+            self.assertEqual(state.desiredTemperature, 27.5)
+            self.assertEqual(state.asdict(), board.state.asdict())
+            self.assertIs(reader.read(), state)  # Sayaç değişmedi: aynı nesne
+            with self.assertRaises(AttributeError):
+                state.desiredTemperature = 1.0
+
+            board.setDesiredTemp(22.0)
+            self.assertIsNot(reader.read(), state)
+            self.assertEqual(reader.read().desiredTemperature, 22.0)
+            self.assertEqual(reader.retries, 0)
+
+            # Diğer kartın yuvası etkilenmez
+            _, other, other_offset, other_record = layout[1]
+            other_reader = SharedState(shm.buf, other_offset, other.STATE_CLASS, other_record)
+            other_reader.read()
+            writer.close()
+            reader.close()
+            other_reader.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_02_writer_died_mid_write(self):
+        """Sayaç tek kalırsa okuma asılı kalmaz; son tutarlı kayıt döner."""
+        layout, size = _layout(SPECS)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            name, board, offset, record = layout[0]
+            writer = SharedState(shm.buf, offset, board.STATE_CLASS, record)
+            reader = SharedState(shm.buf, offset, board.STATE_CLASS, record)
+            board.stateSinks.append(writer.write)
+            board.setDesiredTemp(27.5)
+            state = reader.read()
+            SEQLOCK.pack_into(shm.buf, offset, 3)  # Yazar yazma ortasında öldü
+            started = time.monotonic()
+            self.assertIs(reader.read(), state)
+            self.assertLess(time.monotonic() - started, 0.5)
+            self.assertEqual(reader.stalls, 1)
+            reader.close(final_read=False)
+            self.assertIs(reader.read(), state)
+            writer.close(final_read=False)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class TestIOWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.dir)  # G/Ç sürecinin logs/ klasörü geçici klasörde oluşsun
+
+    def tearDown(self):
+        logger.shutdown()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_01_poll_set_and_stop(self):
+        worker = IOWorker(SPECS, os.path.join(self.dir, "telemetry"), TelemetryStore)
+        changed = threading.Event()
+        worker.boards["ac"].listeners.append(lambda board, fields: changed.set())
+        worker.start()
+        try:
+            self.assertEqual(worker.connect(), {"ac": True, "curtain": True})
+            self.assertTrue(changed.wait(10))
+            ac = worker.boards["ac"]
+            self.assertTrue(ac.lastPollOk)
+            self.assertGreater(ac.state.seq, 0)
+
+            worker.port("ac").submit_set("desiredTemperature", 28.5).result(5)
+            self.assertEqual(ac.state.desiredTemperature, 28.5)
+            self.assertEqual(ac.snapshot()["desiredTemperature"], 28.5)
+            with self.assertRaises(RuntimeError):
+                worker.port("nowhere").request_poll().result(5)
+            self.assertIsNone(worker.boards["ac"].getLinkStats())  # Sayaçlar kapalı
+        finally:
+            worker.stop()
+        self.assertFalse(worker.process.is_alive())
+        self.assertEqual(worker.boards["ac"].state.desiredTemperature, 28.5)  # Son kayıt okunabilir
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=worker.shm.name)
+        self.assertTrue(os.listdir(os.path.join(self.dir, "telemetry")))
+
+    def test_02_hub_service_isolated(self):
+        hub = HubService(telemetry_dir=os.path.join(self.dir, "telemetry"), isolated=True,
+                         ports={"ac": "mem://ac", "curtain": "mem://curtain"})
+        self.assertIsNone(hub.port("ac"))
+        hub.start()
+        try:
+            self.assertEqual(hub.connect(), {"ac": True, "curtain": True})
+            hub.port("curtain").submit_set("curtainStatus", 40).result(5)
+            self.assertEqual(hub.curtain_api.state.curtainStatus, 40)
+            # Sayaçlar ve hat durumu G/Ç sürecinden gönderilir (PUSH_INTERVAL); okuma beklemez
+            started = time.monotonic()
+            self.assertEqual(hub.link_states()["ac"]["state"], "online")
+            self.assertLess(time.monotonic() - started, 0.05)
+            deadline = time.monotonic() + 5
+            while not (hub.diagnostics()["curtain"] or {}).get("bytes_out") and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertGreater(hub.diagnostics()["curtain"]["bytes_out"], 0)  # config.LINK_STATS_ENABLED
+        finally:
+            hub.stop()
+        with self.assertRaises(ValueError):
+            HubService(isolated=True, transports={"ac": object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import sys
+import time
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - HAT İSTATİSTİKLERİ TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Gidiş-dönüş histogramını ve kartın hat sayaçlarının (byte,
+#           zaman aşımı, eksik okuma, yazma hatası, bozuk çerçeve) senkron ve
+#           asyncio yollarında doğru arttığını emülatörlerle test eder.
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from async_api import AsyncHomeAutomationSystemConnection
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from link_stats import LatencyHistogram, LinkStats, command_label
+from transport import MemoryTransport, PtyTransport
+
+
+class BrokenWriteTransport(MemoryTransport):
+    """Yazma sırasında hata veren taşıma (kopmuş USB dönüştürücü gibi)."""
+    fail = False
+
+    def write(self, data):
+        if self.fail:
+            raise OSError("port kayboldu")
+        return super().write(data)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_01_percentiles(self):
+        h = LatencyHistogram()
+        self.assertIsNone(h.percentile(0.5))
+        for _ in range(98):
+            h.add(0.0004)  # 0.5 ms kovası
+        h.add(0.03)
+        h.add(3.0)  # Taşma kovası
+        snap = h.snapshot()
+        self.assertEqual(snap["count"], 100)
+        self.assertEqual(snap["p50_ms"], 0.5)
+        self.assertEqual(snap["p99_ms"], 50.0)
+        self.assertEqual(snap["max_ms"], 3000.0)
+        self.assertEqual(sum(snap["buckets"]), 100)
+        self.assertEqual(snap["buckets"][-1], 1)
+
+    def test_02_counters(self):
+        stats = LinkStats()
+        stats.received(5, b"12345")
+        stats.received(5, b"12")
+        stats.received(5, b"")
+        stats.write_failed(OSError("x"))
+        snap = stats.snapshot()
+        self.assertEqual((snap["bytes_in"], snap["short_reads"], snap["timeouts"]), (7, 1, 1))
+        self.assertEqual(snap["write_errors"], 1)
+        self.assertIn("yazma", snap["last_error"])
+        self.assertEqual(command_label((4, 3)), "0x04 0x03")
+
+
+class TestBoardLinkStats(unittest.TestCase):
+
+    def make_ac(self, **emu_args):
+        self.emu = AirConditionerBoardEmulator(**emu_args)
+        self.transport = BrokenWriteTransport(self.emu, timeout=0.05)
+        ac = AirConditionerSystemConnection("mem://ac", transport=self.transport)
+        ac.pollDeadline = 0.05
+        return ac
+
+    def test_01_disabled_by_default(self):
+        ac = self.make_ac()
+        self.assertTrue(ac.open())
+        self.assertTrue(ac.update())
+        self.assertIsNone(ac.linkStats)
+        self.assertIsNone(ac.getLinkStats())
+
+    def test_02_bulk_poll_and_set(self):
+        ac = self.make_ac()
+        ac.enableLinkStats()
+        self.assertTrue(ac.open())
+        self.assertEqual(ac.getLinkStats()["bytes_out"], 0)  # Açılış denemeleri sayılmaz
+        for _ in range(3):
+            self.assertTrue(ac.update())
+        ac.setDesiredTemp(26.5)
+        stats = ac.getLinkStats()
+        self.assertEqual(stats["bytes_out"], 3 + 2)
+        self.assertEqual(stats["bytes_in"], 3 * ac.bulkFrameLength)
+        self.assertEqual(stats["round_trips"]["0x06"]["count"], 3)
+        self.assertEqual(stats["timeouts"] + stats["short_reads"] + stats["write_errors"], 0)
+
+    def test_03_pipelined_timeouts_and_write_errors(self):
+        ac = self.make_ac(bulk=False)
+        ac.enableLinkStats()
+        self.assertTrue(ac.open())
+        self.assertTrue(ac.update())
+        self.assertEqual(ac.getLinkStats()["round_trips"][command_label(ac.POLL_SEQUENCE)]["count"], 1)
+
+        self.emu.drop_rate = 1.0
+        self.assertFalse(ac.update())
+        self.assertEqual(ac.getLinkStats()["timeouts"], 1)
+
+        self.transport.fail = True
+        self.assertFalse(ac.update())
+        ac.setDesiredTemp(20.0)  # Hata yutulur ama sayılır (2 ayar byte'ı)
+        stats = ac.getLinkStats()
+        self.assertEqual(stats["write_errors"], 3)
+        self.assertIn("port kayboldu", stats["last_error"])
+        self.assertEqual(stats["round_trips"][command_label(ac.POLL_SEQUENCE)]["count"], 1)
+
+    def test_04_bad_frame(self):
+        ac = self.make_ac()
+        ac.enableLinkStats()
+        self.assertTrue(ac.open())
+        ac._decode_bulk(b"\x00" * ac.bulkFrameLength)
+        self.assertEqual(ac.getLinkStats()["bad_frames"], 1)
+
+    def test_05_disable(self):
+        ac = self.make_ac()
+        stats = ac.enableLinkStats()
+        self.assertIs(ac.enableLinkStats(), stats)  # Tekrar açmak sıfırlamaz
+        self.assertIsNone(ac.enableLinkStats(False))
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "pty sadece Linux'ta")
+class TestAsyncLinkStats(unittest.TestCase):
+
+    def test_01_exchange_counts(self):
+        emu = CurtainBoardEmulator()
+        cur = CurtainControlSystemConnection("pty://curtain", transport=PtyTransport(emu))
+        cur.autoCalibrate = False
+        cur.enableLinkStats()
+        driver = AsyncHomeAutomationSystemConnection(cur)
+        self.assertTrue(driver.open())
+        try:
+            self.assertTrue(asyncio.run(driver.update()))
+            asyncio.run(driver.send(cur._encode_curtain_status(40)))
+            stats = cur.getLinkStats()
+            self.assertEqual(stats["bytes_in"], len(cur.POLL_SEQUENCE))
+            self.assertEqual(stats["bytes_out"], len(cur.POLL_SEQUENCE) + 1)
+            self.assertEqual(stats["round_trips"][command_label(cur.POLL_SEQUENCE)]["count"], 1)
+
+            emu.drop_rate = 1.0
+            started = time.perf_counter()
+            self.assertFalse(asyncio.run(driver.update()))
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertEqual(cur.getLinkStats()["timeouts"], 1)
+        finally:
+            driver.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
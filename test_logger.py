@@ -0,0 +1,79 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - LOGLAMA ALTYAPISI TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Kuyruklu log hattının kayıtları arka plan thread'inde toplu
+#           yazdığını, kapanışta bekleyenleri kaybetmediğini ve dosya
+#           döndürmenin (rotation) çalıştığını geçici bir klasörde test eder.
+# ==============================================================================
+
+import logger
+from logger import LogPipeline
+
+
+class TestLogPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.pipeline = LogPipeline(logger._build_handlers(self.dir)[:1])  # Sadece dosya
+        self.log = logging.getLogger(f"test.{self.id()}")
+        self.log.setLevel(logging.DEBUG)
+        self.log.propagate = False
+        self.log.addHandler(self.pipeline.handler)
+
+    def tearDown(self):
+        self.log.removeHandler(self.pipeline.handler)
+        self.pipeline.stop()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def lines(self, name=logger.LOG_FILE):
+        with open(os.path.join(self.dir, name), encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_01_hot_path_does_no_io(self):
+        # Thread başlamadan kayıtlar sadece kuyrukta bekler
+        self.log.info("ilk %d", 1)
+        self.assertEqual(self.lines(), [])
+        self.pipeline.start()
+        self.pipeline.flush(timeout=2)
+        self.assertTrue(self.lines()[0].endswith("ilk 1"))
+
+    def test_02_batched_writes(self):
+        for i in range(1000):
+            self.log.debug("kayıt %d", i)
+        self.pipeline.start()
+        self.pipeline.flush(timeout=2)
+        self.assertEqual(self.pipeline.written, 1000)
+        self.assertLessEqual(self.pipeline.batches, 1000 // logger.LOG_BATCH + 1)
+        self.assertTrue(self.lines()[-1].endswith("kayıt 999"))
+
+    def test_03_stop_drains_queue(self):
+        self.pipeline.start()
+        threads = [threading.Thread(target=lambda: [self.log.info("x") for _ in range(200)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.pipeline.stop()
+        self.assertEqual(len(self.lines()), 800)
+
+    def test_04_rotation_in_background(self):
+        handler = self.pipeline.handlers[0]
+        handler.maxBytes = 2000
+        self.pipeline.start()
+        for i in range(100):
+            self.log.info("döndürme %d", i)
+        self.pipeline.stop()
+        self.assertTrue(os.path.exists(os.path.join(self.dir, logger.LOG_FILE + ".1")))
+        self.assertTrue(self.lines()[-1].endswith("döndürme 99"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PORT KEŞFİ TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Emülatörlü pty portlarının parmak iziyle tanınmasını, cevap
+#           vermeyen portlar arasında paralel aramayı, önbelleğin sonraki
+#           açılışta yoklamayı atlatmasını ve hub'ın "auto" portlu kartları
+#           bulup ilk ölçümü bir saniyenin altında almasını test eder.
+# ==============================================================================
+
+from board_emulator import AirConditionerBoardEmulator, CurtainBoardEmulator
+from board_registry import BoardSpec
+from hub_service import HubService
+from port_discovery import AUTO_PORT, PortDiscovery, candidate_ports, fingerprint, _is_raw_pty
+from transport import EmulatorPty
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "pty sadece Linux'ta")
+class TestPortDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        import tty
+        self.dir = tempfile.mkdtemp()
+        self.cache = os.path.join(self.dir, "ports.json")
+        self.ptys = [EmulatorPty(AirConditionerBoardEmulator()), EmulatorPty(CurtainBoardEmulator())]
+        self.ac_port, self.cur_port = (p.start() for p in self.ptys)
+        # Cevap vermeyen (ham moddaki) portlar: karşı ucunda kimse yok
+        self.silent = []
+        self.fds = []
+        for _ in range(8):
+            master, slave = os.openpty()
+            tty.setraw(slave)
+            self.fds += [master, slave]
+            self.silent.append(os.ttyname(slave))
+        self.candidates = self.silent[:4] + [self.cur_port] + self.silent[4:] + [self.ac_port]
+
+    def tearDown(self):
+        for p in self.ptys:
+            p.stop()
+        for fd in self.fds:
+            os.close(fd)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_01_fingerprint(self):
+        self.assertEqual(fingerprint(self.ac_port), "ac")
+        self.assertEqual(fingerprint(self.cur_port), "curtain")
+        self.assertIsNone(fingerprint(self.silent[0]))
+        self.assertIsNone(fingerprint(os.path.join(self.dir, "ttyYOK")))
+
+    def test_02_candidates(self):
+        for name in ("ttyUSB10", "ttyUSB2", "ttyACM0"):
+            open(os.path.join(self.dir, name), "w").close()
+        ports = candidate_ports([os.path.join(self.dir, "ttyUSB*"), os.path.join(self.dir, "ttyACM*")])
+        self.assertEqual([os.path.basename(p) for p in ports], ["ttyACM0", "ttyUSB2", "ttyUSB10"])
+        # Kanonik moddaki pty (açık bir terminal gibi) yoklanmaz
+        master, slave = os.openpty()
+        try:
+            self.assertFalse(_is_raw_pty(os.ttyname(slave)))
+            self.assertTrue(_is_raw_pty(self.silent[0]))
+        finally:
+            os.close(master)
+            os.close(slave)
+
+    def test_03_parallel_scan_and_cache(self):
+        discovery = PortDiscovery(self.cache, candidates=self.candidates)
+        started = time.perf_counter()
+        found = discovery.scan()
+        elapsed = time.perf_counter() - started
+        self.assertEqual(found, {self.cur_port: "curtain", self.ac_port: "ac"})
+        self.assertEqual(discovery.probed, len(self.candidates))
+        self.assertLess(elapsed, 0.5)  # Sessiz portlar sırayla değil, aynı anda beklenir
+
+        # Sonraki açılış: gereken kartlar önbellekte, hiç yoklama yok
+        again = PortDiscovery(self.cache, candidates=self.candidates)
+        self.assertEqual(again.scan({"ac": 1, "curtain": 1}), found)
+        self.assertEqual(again.probed, 0)
+        # Düğümü değişen port (numarası başka pty'ye geçmiş gibi) yeniden yoklanır
+        os.chmod(self.ac_port, os.stat(self.ac_port).st_mode & 0o777)
+        reused = PortDiscovery(self.cache, candidates=self.candidates)
+        self.assertEqual(reused.scan({"ac": 1, "curtain": 1}), found)
+        self.assertGreater(reused.probed, 0)
+        # Yeni ctime önbelleğe yazıldı: sonraki açılış yine yoklamasız
+        again = PortDiscovery(self.cache, candidates=self.candidates)
+        self.assertEqual(again.scan({"ac": 1, "curtain": 1}), found)
+        self.assertEqual(again.probed, 0)
+        # Önbellekten silinen port yeniden yoklanır
+        again.forget(self.ac_port)
+        self.assertEqual(PortDiscovery(self.cache, candidates=self.candidates).scan({"ac": 1})[self.ac_port], "ac")
+
+    def test_04_assign(self):
+        specs = [BoardSpec("ac", "ac", AUTO_PORT, 9600, 0.5),
+                 BoardSpec("curtain", "curtain", "/dev/ttyUSB_YOK", 9600, 0.5),
+                 BoardSpec("ac2", "ac", AUTO_PORT, 9600, 0.5),
+                 BoardSpec("mem", "curtain", "mem://curtain", 9600, 0.5)]
+        out = PortDiscovery(candidates=self.candidates).assign(specs)
+        self.assertEqual([s.port for s in out], [self.ac_port, self.cur_port, AUTO_PORT, "mem://curtain"])
+
+    def test_05_hub_cold_start(self):
+        """Aday portlar arasından kartları bulup ilk ölçüme kadar: bir saniyenin altında."""
+        started = time.perf_counter()
+        hub = HubService(telemetry_dir=os.path.join(self.dir, "telemetry"), isolated=False,
+                         registry=[BoardSpec("ac", "ac", AUTO_PORT, 115200, 0.5),
+                                   BoardSpec("curtain", "curtain", AUTO_PORT, 9600, 0.5)],
+                         discovery=PortDiscovery(self.cache, candidates=self.candidates))
+        try:
+            self.assertEqual([s.port for s in hub.specs], [self.ac_port, self.cur_port])
+            self.assertEqual(hub.connect(), {"ac": True, "curtain": True})
+            deadline = time.monotonic() + 2
+            while not (hub.ac_api.lastPollOk and hub.curtain_api.lastPollOk) and time.monotonic() < deadline:
+                time.sleep(0.005)
+            elapsed = time.perf_counter() - started
+        finally:
+            hub.stop()
+        self.assertTrue(hub.ac_api.lastPollOk and hub.curtain_api.lastPollOk)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
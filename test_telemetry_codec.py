@@ -0,0 +1,135 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SIKIŞTIRILMIŞ TELEMETRİ TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Delta + varint blok kodlayıcısının kayıpsız geri dönüşünü,
+#           blok atlamalı aralık sorgusunu ve sıkıştırılmış deponun yeniden
+#           açılışta (yarım blok dahil) veriyi korumasını test eder.
+# ==============================================================================
+
+from telemetry_codec import (
+    BLOCK_MAX_AGE, BLOCK_SAMPLES, BlockEncoder, CompressedTelemetryStore, decode_block,
+    get_varint, put_varint, unzigzag, zigzag,
+)
+from telemetry_store import HEADER, RECORD, TelemetryStore
+
+
+class TestCodec(unittest.TestCase):
+
+    def test_01_zigzag_varint(self):
+        for n in (0, -1, 1, -64, 63, 2 ** 40, -(2 ** 40)):
+            self.assertEqual(unzigzag(zigzag(n)), n)
+            out = bytearray()
+            put_varint(out, zigzag(n))
+            self.assertEqual(get_varint(out, 0), (zigzag(n), len(out)))
+
+    def test_02_block_round_trip(self):
+        rng = random.Random(3)
+        encoder = BlockEncoder(1, 2)
+        tick, value = 170000000000, 225
+        expected = []
+        for _ in range(500):
+            tick += rng.choice([50, 50, 50, 51, 49, 300])
+            value += rng.choice([0, 0, 0, 1, -1, 40, -1013])
+            expected.append((tick, value))
+            self.assertIsNone(encoder.add(tick, value))
+        block = encoder.finish()
+        times, values = decode_block(block)
+        self.assertEqual(list(zip(times, values)), expected)
+
+    def test_03_steady_signal_is_small(self):
+        encoder = BlockEncoder(0, 0)
+        block = None
+        for i in range(BLOCK_SAMPLES):
+            block = encoder.add(i * 50, 1013)
+        self.assertIsNotNone(block)  # Blok dolunca kendiliğinden kapanır
+        self.assertLess(len(block), 64)  # 1024 örnek, 16 byte'lık ham kayıtta 16 KB
+
+
+class TestCompressedStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_01_query_across_blocks_and_reopen(self):
+        store = CompressedTelemetryStore(self.dir, segment_max_bytes=256)
+        for i in range(3000):
+            store.append("curtain", "outdoorPress", 1013 + (i // 100) / 10, timestamp=1000.0 + i * 0.5)
+            store.append("ac", "fanSpeed", i % 7, timestamp=1000.0 + i * 0.5)
+        rows = store.query("curtain", "outdoorPress", 1500.0, 1501.0)  # Bitmemiş blok dahil
+        self.assertEqual(rows, [(1500.0, 1014.0), (1500.5, 1014.0)])
+        self.assertGreater(len(store.segments), 1)
+        store.close()
+
+        store = CompressedTelemetryStore(self.dir)
+        rows = store.query("ac", "fanSpeed", 1000.0, 1010.0)
+        self.assertEqual([v for _, v in rows], [i % 7 for i in range(20)])
+        self.assertEqual(len(store.query("curtain", "outdoorPress", 0, float("inf"))), 3000)
+        store.close()
+
+    def test_02_retire(self):
+        store = CompressedTelemetryStore(self.dir, segment_max_age=10.0, retain_max_age=30.0)
+        store.append("ac", "fanSpeed", 1, timestamp=1000.0)
+        store.append("ac", "fanSpeed", 2, timestamp=2000.0)
+        self.assertEqual(store.query("ac", "fanSpeed", 0.0, 1500.0), [])
+        self.assertEqual(store.query("ac", "fanSpeed", 1500.0, 2500.0), [(2000.0, 2.0)])
+        store.close()
+
+    def test_03_blocks_sealed_on_time_budget(self):
+        """Bitmemiş bloklar BLOCK_MAX_AGE içinde diske iner (flush / close olmadan)."""
+        store = CompressedTelemetryStore(self.dir)
+        steps = int(BLOCK_MAX_AGE / 0.5) + 2
+        for i in range(steps):
+            store.append("ac", "fanSpeed", i % 3, timestamp=1000.0 + i * 0.5)
+        self.assertGreater(os.path.getsize(store.segments[-1].path), HEADER.size)
+        reader = CompressedTelemetryStore(self.dir)  # Çökme sonrası açılış gibi
+        # Sınırı aşan örnekle birlikte blok yazıldı; sadece son örnek bellekte
+        self.assertEqual(len(reader.query("ac", "fanSpeed", 0, float("inf"))), steps - 1)
+        reader.close()
+        store.close()
+
+    def test_04_reopen_after_torn_block(self):
+        store = CompressedTelemetryStore(self.dir)
+        for i in range(10):
+            store.append("ac", "fanSpeed", i, timestamp=1000.0 + i)
+        store.close()
+        path = store.segments[-1].path
+        with open(path, "rb") as f:
+            good = len(f.read())
+        with open(path, "ab") as f:
+            f.write(b"\xa5\x5a\x00\x00\x00")  # Yarım blok başlığı
+
+        store = CompressedTelemetryStore(self.dir)
+        self.assertEqual(os.path.getsize(path), good)
+        store.append("ac", "fanSpeed", 42, timestamp=2000.0)
+        store.close()
+        store = CompressedTelemetryStore(self.dir)
+        self.assertEqual([v for _, v in store.query("ac", "fanSpeed", 0, float("inf"))], list(range(10)) + [42])
+        store.close()
+
+    def test_05_scan_matches_raw_store(self):
+        raw = TelemetryStore(os.path.join(self.dir, "raw"))
+        packed = CompressedTelemetryStore(os.path.join(self.dir, "packed"))
+        for i in range(200):
+            for store in (raw, packed):
+                store.append("curtain", "outdoorTemp", 20 + i / 10, timestamp=1000.0 + i)
+                store.append("ac", "fanSpeed", i % 5, timestamp=1000.0 + i)
+        expected = [record for view in raw.scan(1050.0, 1150.0) for record in RECORD.iter_unpack(view)]
+        got = [record for view in packed.scan(1050.0, 1150.0) for record in RECORD.iter_unpack(view)]
+        self.assertEqual(len(got), 200)
+        self.assertEqual(sorted(got), sorted(expected))
+        raw.close()
+        packed.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
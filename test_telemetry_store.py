@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - TELEMETRİ DEPOSU TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Segment dosyalarına ekleme, zaman aralığı sorgusu, segment
+#           devri (rollover), eski segmentlerin silinmesi ve yeniden açılışta
+#           verinin korunmasını geçici bir klasörde test eder.
+# ==============================================================================
+
+from automation_api import CurtainControlSystemConnection
+from board_emulator import CurtainBoardEmulator
+from telemetry_store import RECORD, HEADER, TelemetryStore
+from transport import MemoryTransport
+
+
+class TestTelemetryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_01_range_query(self):
+        store = TelemetryStore(self.dir)
+        for i in range(100):
+            store.append("curtain", "outdoorTemp", 10.0 + i, timestamp=1000.0 + i)
+            store.append("ac", "ambientTemperature", 20.0, timestamp=1000.0 + i)
+        rows = store.query("curtain", "outdoorTemp", 1010.0, 1013.0)
+        self.assertEqual(rows, [(1010.0, 20.0), (1011.0, 21.0), (1012.0, 22.0)])
+        self.assertEqual(store.query("curtain", "unknown", 0, 2000), [])
+        views = store.scan(1050.0, 1051.0)
+        self.assertIsInstance(views[0], memoryview)
+        self.assertEqual(len(views[0]), 2 * RECORD.size)  # İki kartın birer kaydı
+        store.close()
+
+    def test_02_rollover_and_reopen(self):
+        store = TelemetryStore(self.dir, segment_max_bytes=HEADER.size + 10 * RECORD.size)
+        for i in range(35):
+            store.append("ac", "fanSpeed", i, timestamp=float(i))
+        self.assertEqual(len(store.segments), 4)
+        store.close()
+
+        store = TelemetryStore(self.dir)
+        rows = store.query("ac", "fanSpeed", 8.0, 12.0)  # Segment sınırını aşan aralık
+        self.assertEqual([v for _, v in rows], [8, 9, 10, 11])
+        store.append("ac", "fanSpeed", 99, timestamp=100.0)
+        self.assertEqual(store.query("ac", "fanSpeed", 34.0, 1000.0), [(34.0, 34.0), (100.0, 99.0)])
+        store.close()
+
+    def test_02a_reopen_after_torn_record(self):
+        """Kayıt ortasında çökme: yarım kayıt atılır, yeni kayıtlar hizalı kalır."""
+        store = TelemetryStore(self.dir)
+        for i in range(5):
+            store.append("ac", "fanSpeed", i, timestamp=float(i))
+        store.close()
+        path = store.segments[-1].path
+        with open(path, "ab") as f:
+            f.write(RECORD.pack(5.0, 0, 0, 5)[:7])  # Yarım yazılmış kayıt
+
+        store = TelemetryStore(self.dir)
+        self.assertEqual(os.path.getsize(path), HEADER.size + 5 * RECORD.size)
+        for i in range(6, 9):
+            store.append("ac", "fanSpeed", i, timestamp=float(i))
+        self.assertEqual(store.query("ac", "fanSpeed", 0.0, 100.0),
+                         [(float(i), float(i)) for i in (0, 1, 2, 3, 4, 6, 7, 8)])
+        self.assertEqual(store.query("ac", "fanSpeed", 6.0, 8.0), [(6.0, 6.0), (7.0, 7.0)])
+        store.close()
+
+    def test_03_retire_by_size_and_age(self):
+        store = TelemetryStore(self.dir, segment_max_bytes=HEADER.size + 10 * RECORD.size,
+                               retain_max_bytes=3 * (HEADER.size + 10 * RECORD.size))
+        for i in range(100):
+            store.append("ac", "fanSpeed", i, timestamp=float(i))
+        self.assertLessEqual(len(store.segments), 4)
+        self.assertEqual(store.query("ac", "fanSpeed", 0.0, 50.0), [])
+        store.close()
+
+        store = TelemetryStore(self.dir, segment_max_age=10.0, retain_max_age=30.0)
+        store.append("ac", "fanSpeed", 1, timestamp=1000.0)
+        store.append("ac", "fanSpeed", 2, timestamp=2000.0)
+        self.assertEqual(store.query("ac", "fanSpeed", 0.0, 1500.0), [])
+        self.assertEqual(len(os.listdir(self.dir)), 2)  # Tek segment + katalog
+        store.close()
+
+    def test_04_clock_going_back_keeps_order(self):
+        store = TelemetryStore(self.dir)
+        store.append("ac", "fanSpeed", 1, timestamp=10.0)
+        store.append("ac", "fanSpeed", 2, timestamp=5.0)
+        self.assertEqual(store.query("ac", "fanSpeed", 10.0, 11.0), [(10.0, 1.0), (10.0, 2.0)])
+        store.close()
+
+    def test_05_board_recorder(self):
+        store = TelemetryStore(self.dir)
+        cur = CurtainControlSystemConnection("mem://curtain",
+                                             transport=MemoryTransport(CurtainBoardEmulator(), timeout=0.05))
+        cur.recorders.append(store.recorder("curtain"))
+        cur.open()
+        cur.update()
+        rows = store.query("curtain", "outdoorPress", 0, float("inf"))
+        self.assertEqual([v for _, v in rows], [1013.0])
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ZAMAN SERİSİ TESTLERİ
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Halka tamponun ekleme, sarma (wrap) ve kopyasız pencere
+#           davranışını; kartların geçmişe yazmasını test eder.
+# ==============================================================================
+
+from automation_api import AirConditionerSystemConnection
+from board_emulator import AirConditionerBoardEmulator
+from timeseries import History, RingBuffer
+from transport import MemoryTransport
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_01_append_and_latest(self):
+        buf = RingBuffer(4)
+        self.assertIsNone(buf.latest())
+        self.assertEqual(buf.segments(), [])
+        buf.append(1.0, 22.5)
+        self.assertEqual(buf.latest(), (1.0, 22.5))
+        self.assertEqual(len(buf), 1)
+
+    def test_02_wrap_is_bounded(self):
+        buf = RingBuffer(4)
+        for i in range(10):
+            buf.append(float(i), i)
+        self.assertEqual(len(buf), 4)
+        self.assertEqual(buf.count, 10)
+        times, values = buf.window()
+        self.assertEqual(list(times), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(list(values), [6, 7, 8, 9])
+        self.assertEqual(list(buf.window(2)[1]), [8, 9])
+
+    def test_03_segments_are_views(self):
+        buf = RingBuffer(4)
+        for i in range(6):
+            buf.append(float(i), i)
+        segments = buf.segments()
+        self.assertEqual(len(segments), 2)  # Sarma noktasında iki parça
+        self.assertIsInstance(segments[0][0], memoryview)
+        buf.values[0] = 99  # Görünüm, tamponun kendisini gösterir
+        self.assertEqual(segments[1][1][0], 99)
+
+    def test_04a_grows_up_to_capacity(self):
+        buf = RingBuffer(10000)
+        self.assertLess(len(buf.times), 10000)  # Kapasitenin hepsi baştan ayrılmaz
+        for i in range(10005):
+            buf.append(float(i), i)
+        self.assertEqual(len(buf.times), 10000)
+        self.assertEqual(len(buf), 10000)
+        times, values = buf.window(3)
+        self.assertEqual(list(times), [10002.0, 10003.0, 10004.0])
+        self.assertEqual(buf.window()[0][0], 5.0)
+
+    def test_04_since(self):
+        buf = RingBuffer(8)
+        for i in range(12):
+            buf.append(float(i), i)
+        values = [v for _, part in buf.since(9.5) for v in part]
+        self.assertEqual(values, [10, 11])
+        self.assertEqual(buf.since(100.0), [])
+
+    def test_05_trend(self):
+        history = History(capacity=4)
+        self.assertEqual(history.trend("x"), 0)
+        history.record("x", 1.0, 20.0)
+        history.record("x", 2.0, 21.0)
+        self.assertEqual(history.trend("x"), 1)
+        history.record("x", 3.0, 20.5)
+        self.assertEqual(history.trend("x"), -1)
+
+
+class TestBoardHistory(unittest.TestCase):
+
+    def test_01_poll_records_history(self):
+        emu = AirConditionerBoardEmulator()
+        ac = AirConditionerSystemConnection("mem://ac", transport=MemoryTransport(emu, timeout=0.05))
+        ac.history = History(capacity=16)
+        ac.open()
+        ac.update()
+        emu.read_sensor(30)
+        ac.update()
+        self.assertEqual(list(ac.history.get("ambientTemperature").window()[1]), [22.5, 30.5])
+        self.assertEqual(ac.history.trend("ambientTemperature"), 1)
+        emu.drop_rate = 1.0
+        ac.update()  # Cevapsız tur geçmişe yazılmaz
+        self.assertEqual(len(ac.history.get("fanSpeed")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
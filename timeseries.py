@@ -0,0 +1,152 @@
+import threading
+from array import array
+from bisect import bisect_left
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ZAMAN SERİSİ HAFIZASI (RING BUFFER)
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: Her sensör kanalı için sabit kapasiteli halka tampon. Zaman
+#           damgaları ve değerler 'array' içinde tutulur; örnek başına Python
+#           nesnesi oluşmaz. Ekleme O(1) (amortize), son pencere okuması
+#           kopyasızdır (memoryview). Bellek kapasite ile sınırlıdır; tampon
+#           küçük başlar ve doldukça iki katına büyür (çok kartlı hub'da
+#           henüz veri olmayan kapasite için bellek ayrılmaz).
+#           Grafikler, trend okları ve kurallar veriyi buradan okur.
+# ==============================================================================
+
+# 2 Hz örneklemede bir haftalık veri. Kanal başına 12 byte/örnek
+# (zaman: float64, değer: float32) -> ~14.5 MB.
+SAMPLE_RATE_HZ = 2
+DEFAULT_CAPACITY = 7 * 24 * 60 * 60 * SAMPLE_RATE_HZ
+# İlk ayrılan örnek sayısı (2 Hz'de ~34 dk); sonra kapasiteye kadar ikiye katlanır.
+INITIAL_CAPACITY = 4096
+
+
+class RingBuffer:
+    """
+    Tek kanal için (zaman, değer) halka tamponu.
+    Tek yazar (sorgu thread'i), çok okuyucu (arayüz) için tasarlanmıştır:
+    yazar önce örneği yazar, sonra sayacı artırır. Okuyucu sayacın o anki
+    değerine göre pencere alır. Tampon doluyken kapasiteye yakın uzunlukta
+    bir pencere okunurken en eski örnek üzerine yazılabilir.
+
+    Büyüme sırasında diziler kopyalanıp yenileriyle değiştirilir; eski
+    dizilerden alınmış görünümler o ana kadarki örnekleri göstermeye devam eder.
+
+    capacity : Saklanacak en fazla örnek sayısı.
+    typecode : Değer dizisinin tipi ('f': float32, 'd': float64).
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, typecode="f"):
+        if capacity <= 0:
+            raise ValueError("Kapasite pozitif olmalı")
+        self.capacity = capacity
+        size = min(capacity, INITIAL_CAPACITY)
+        self.times = array("d", [0.0]) * size
+        self.values = array(typecode, [0]) * size
+        self.count = 0  # Şimdiye kadar eklenen toplam örnek (taşanlar dahil)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp, value):
+        """O(1) ekleme; tampon doluysa en eski örneğin üzerine yazar."""
+        i = self.count % self.capacity
+        if i >= len(self.times):
+            self._grow()
+        self.times[i] = timestamp
+        self.values[i] = value
+        self.count += 1  # Örnek yazıldıktan SONRA görünür olur
+
+    def _grow(self):
+        """Dizileri iki katına (en fazla kapasiteye) büyütür. Önce kopyalar, sonra değiştirir."""
+        extra = min(self.capacity, 2 * len(self.times)) - len(self.times)
+        times = self.times + array("d", [0.0]) * extra
+        values = self.values + array(self.values.typecode, [0]) * extra
+        self.times, self.values = times, values
+
+    def latest(self):
+        """Son (zaman, değer) çifti. Tampon boşsa None."""
+        count = self.count
+        if not count:
+            return None
+        i = (count - 1) % self.capacity
+        return self.times[i], self.values[i]
+
+    def segments(self, n=None):
+        """
+        Son 'n' örneği (None: hepsi) eskiden yeniye, kopyasız döner.
+        Sonuç (zamanlar, değerler) memoryview çiftlerinden oluşan bir listedir:
+        pencere tamponun sonundan başa sarıyorsa iki parça, değilse tek parça.
+        """
+        count = self.count
+        size = min(count, self.capacity)
+        n = size if n is None else max(0, min(n, size))
+        if not n:
+            return []
+        end = count % self.capacity or self.capacity  # Son örneğin bir sonrası
+        start = end - n
+        times, values = memoryview(self.times), memoryview(self.values)
+        if start >= 0:
+            return [(times[start:end], values[start:end])]
+        start += self.capacity
+        return [(times[start:], values[start:]), (times[:end], values[:end])]
+
+    def since(self, timestamp):
+        """'timestamp' ve sonrasındaki örnekler (segments() biçiminde, ikili arama ile)."""
+        out = []
+        for times, values in self.segments():
+            i = bisect_left(times, timestamp)
+            if i < len(times):
+                out.append((times[i:], values[i:]))
+        return out
+
+    def window(self, n=None):
+        """Son 'n' örneğin kopyası: (zamanlar, değerler) array çifti."""
+        times = array("d")
+        values = array(self.values.typecode)
+        for t, v in self.segments(n):
+            times.frombytes(t.cast("B"))
+            values.frombytes(v.cast("B"))
+        return times, values
+
+
+class History:
+    """
+    Bir kartın tüm kanallarının halka tamponları (kanal adı -> RingBuffer).
+    Kanal, ilk örneği geldiğinde oluşturulur.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._channels = {}
+        self._lock = threading.Lock()  # Sadece kanal oluşturmayı korur
+
+    def record(self, channel, timestamp, value):
+        buf = self._channels.get(channel)
+        if buf is None:
+            with self._lock:
+                buf = self._channels.setdefault(channel, RingBuffer(self.capacity))
+        buf.append(timestamp, value)
+
+    def get(self, channel):
+        """Kanalın tamponu. Henüz örnek gelmediyse None."""
+        return self._channels.get(channel)
+
+    def channels(self):
+        return list(self._channels)
+
+    def latest(self, channel, default=None):
+        buf = self._channels.get(channel)
+        sample = buf.latest() if buf is not None else None
+        return default if sample is None else sample
+
+    def trend(self, channel):
+        """Son iki örneğe göre yön: 1 (artıyor), -1 (azalıyor), 0 (aynı / veri yok)."""
+        buf = self._channels.get(channel)
+        if buf is None:
+            return 0
+        segments = buf.segments(2)
+        values = [v for _, part in segments for v in part]
+        if len(values) < 2 or values[1] == values[0]:
+            return 0
+        return 1 if values[1] > values[0] else -1
@@ -0,0 +1,235 @@
+import os
+import select
+import threading
+import time
+from collections import deque
+
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - TAŞIMA (TRANSPORT) KATMANI
+# YAZAR: Suude Kaynak - 152120211110
+# TARİH: 2025
+# AÇIKLAMA: API katmanının byte gönderip aldığı kanalı soyutlar.
+#           Üç seçenek vardır:
+#             - SerialTransport : Gerçek seri port (pyserial)
+#             - PtyTransport    : Linux pty çifti + arka planda emülatör
+#             - MemoryTransport : Tamamen bellek içi, thread'siz emülatör
+#           Hepsi pyserial'ın kullandığımız alt kümesini taklit eder:
+#           open / close / is_open / write / read / reset_input_buffer
+# ==============================================================================
+
+# Port adı şemaları (config.py içinde de kullanılabilir)
+# Örn: AC_BOARD_PORT = "mem://ac"  veya  CURTAIN_BOARD_PORT = "pty://curtain"
+SCHEME_MEMORY = "mem://"
+SCHEME_PTY = "pty://"
+
+
+class SerialTransport:
+    """Gerçek seri port. pyserial sadece açılış anında yüklenir."""
+    def __init__(self, port, baudrate=9600, timeout=1):
+        self.port = port
+        self._baudrate = baudrate
+        self._timeout = timeout
+        self._serial = None
+
+    def open(self):
+        import serial  # Emülatör ile çalışırken pyserial zorunlu olmasın
+        self._serial = serial.Serial(self.port, self._baudrate, timeout=self._timeout)
+
+    @property
+    def baudrate(self):
+        return self._baudrate
+
+    @baudrate.setter
+    def baudrate(self, value):
+        # Hız pazarlığı (negotiateBaud) açık portun hızını değiştirir
+        self._baudrate = value
+        if self._serial is not None:
+            self._serial.baudrate = value
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        # Son tarihli okumalar (update deadline) her seferinde kalan süreyi yazar
+        if value != self._timeout:
+            self._timeout = value
+            if self._serial is not None:
+                self._serial.timeout = value
+
+    @property
+    def is_open(self):
+        return self._serial is not None and self._serial.is_open
+
+    def close(self):
+        if self._serial is not None:
+            self._serial.close()
+
+    def write(self, data):
+        return self._serial.write(data)
+
+    def read(self, size=1):
+        return self._serial.read(size)
+
+    def reset_input_buffer(self):
+        self._serial.reset_input_buffer()
+
+    def fileno(self):
+        """asyncio sürücüsünün (async_api) doğrudan kullandığı dosya tanımlayıcısı."""
+        return self._serial.fileno()
+
+
+class EmulatorPty:
+    """
+    Bir emülatörü Linux pty çiftinin "PIC" ucunda çalıştırır.
+    Diğer uç (port) normal bir seri cihaz gibi açılabilir: /dev/pts/N
+    """
+    def __init__(self, emulator):
+        self.emulator = emulator
+        self.port = None
+        self._master = None
+        self._slave = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        import pty
+        import tty
+        self._master, slave = pty.openpty()
+        tty.setraw(self._master)
+        tty.setraw(slave)  # Satır düzenleme / echo kapalı (ham byte akışı)
+        self.port = os.ttyname(slave)
+        self._slave = slave
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def _serve(self):
+        while self._running:
+            try:
+                # Kısa select zaman aşımı: stop() çağrısı en geç 0.1 sn'de fark edilir
+                ready, _, _ = select.select([self._master], [], [], 0.1)
+                if not ready:
+                    continue
+                data = os.read(self._master, 256)
+            except (OSError, ValueError):
+                break
+            arrived = time.monotonic()
+            baudrate = self._line_baudrate()
+            for i, b in enumerate(data):
+                # Aynı parçada gelen byte'lar hatta art arda (byte_time arayla) gelmiştir
+                reply = self.emulator.handle_byte(b, arrived + i * self.emulator.byte_time, baudrate)
+                if reply:
+                    if self.emulator.latency:
+                        time.sleep(self.emulator.latency)
+                    try:
+                        os.write(self._master, reply)
+                    except OSError:
+                        return  # stop() fd'yi kapattı
+
+    def _line_baudrate(self):
+        """PC ucunun termios hızı (pyserial'ın ayarladığı). Okunamazsa None."""
+        import termios
+        try:
+            speed = termios.tcgetattr(self._slave)[5]  # ospeed
+        except (termios.error, OSError):
+            return None
+        for rate in (9600, 19200, 38400, 57600, 115200):  # automation_api.BAUD_RATES
+            if getattr(termios, f"B{rate}", None) == speed:
+                return rate
+        return None
+
+    def stop(self):
+        self._running = False
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class PtyTransport(SerialTransport):
+    """Emülatörü pty üzerinden konuşturan, pyserial tabanlı taşıma."""
+    def __init__(self, emulator, baudrate=9600, timeout=1):
+        super().__init__(None, baudrate, timeout)
+        self.emulator = emulator
+        self._pty = EmulatorPty(emulator)
+
+    def open(self):
+        self.port = self._pty.start()
+        super().open()
+
+    def close(self):
+        super().close()
+        self._pty.stop()
+
+
+class MemoryTransport:
+    """
+    Bellek içi taşıma: write() ile gelen byte'lar anında emülatöre verilir,
+    cevaplar emülatörün 'latency' değeri kadar sonra okunabilir hale gelir.
+    Thread veya dosya tanımlayıcısı kullanmaz.
+    """
+    def __init__(self, emulator, baudrate=9600, timeout=1):
+        self.emulator = emulator
+        self.port = f"{SCHEME_MEMORY}{type(emulator).__name__}"
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.is_open = False
+        self._rx = deque()  # (hazır olma zamanı, byte) çiftleri
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+        self._rx.clear()
+
+    def write(self, data):
+        now = time.monotonic()
+        latency = self.emulator.latency
+        for i, b in enumerate(data):
+            for r in self.emulator.handle_byte(b, now + i * self.emulator.byte_time, self.baudrate):
+                # Cevaplar sırayla, her biri bir gecikme sonra hazır olur
+                self._rx.append((now + latency * (i + 1), r))
+        return len(data)
+
+    def read(self, size=1):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        out = bytearray()
+        while len(out) < size:
+            now = time.monotonic()
+            while self._rx and self._rx[0][0] <= now and len(out) < size:
+                out.append(self._rx.popleft()[1])
+            if len(out) >= size:
+                break
+            if not self._rx:
+                # Artık gelecek cevap yok: gerçek port gibi zaman aşımına kadar bekle
+                if deadline is not None and deadline > now:
+                    time.sleep(deadline - now)
+                break
+            ready_at = self._rx[0][0]
+            if deadline is not None and ready_at > deadline:
+                time.sleep(max(0.0, deadline - now))
+                break
+            time.sleep(ready_at - now)
+        return bytes(out)
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+
+
+def make_transport(port, baudrate=9600, timeout=1):
+    """
+    Port adına göre uygun taşıma nesnesini (henüz açılmamış) oluşturur.
+    "mem://ac", "pty://curtain" -> emülatör; diğer her şey -> gerçek seri port.
+    Aynı tipte birden fazla emülatörlü kart için ada ek yazılabilir: "mem://ac/2".
+    """
+    for scheme, cls in ((SCHEME_MEMORY, MemoryTransport), (SCHEME_PTY, PtyTransport)):
+        if port.startswith(scheme):
+            from board_emulator import create_emulator
+            kind = port[len(scheme):].split("/", 1)[0]
+            return cls(create_emulator(kind), baudrate, timeout)
+    return SerialTransport(port, baudrate, timeout)